@@ -0,0 +1 @@
+"""Offline micro-benchmarks for the library hot paths (run with ``python -m benchmarks.run``)."""
@@ -0,0 +1,67 @@
+"""Benchmarks for evaluators, judge output parsing and the evaluation loop."""
+
+from linkedin_ghostwriter.core.config import Config
+from linkedin_ghostwriter.core.ghostwriter import LinkedInGhostwriter
+from linkedin_ghostwriter.evaluations.base import BaseEvaluator
+from linkedin_ghostwriter.evaluations.llm_based import JSONParser
+from linkedin_ghostwriter.evaluations.rule_based import DashCountEvaluator
+
+from .data import sample_post
+
+
+class StubEvaluator(BaseEvaluator):
+    """Evaluator with a fixed verdict, so only the loop itself is measured."""
+
+    def __init__(self, passed: bool):
+        self.passed = passed
+
+    def evaluate(self, post):
+        return {"passed": self.passed, "feedback": "" if self.passed else "Too long.", "evaluator_type": "custom"}
+
+
+class TimeDashCount:
+    params = [1_000, 100_000]
+    param_names = ["chars"]
+
+    def setup(self, size):
+        self.evaluator = DashCountEvaluator()
+        self.post = sample_post(size)
+
+    def time_evaluate(self, size):
+        self.evaluator.evaluate(self.post)
+
+
+class TimeJSONParser:
+    VERDICT = '{"passed": false, "failures": ["jargon"], "phrases": ["synergy", "leverage"], "feedback": "Plain words."}'
+
+    def setup(self):
+        self.parser = JSONParser()
+        self.fenced = f"```json\n{self.VERDICT}\n```"
+        self.malformed = self.VERDICT[:-20]
+
+    def time_parse_clean(self):
+        self.parser.parse(self.VERDICT)
+
+    def time_parse_fenced(self):
+        self.parser.parse(self.fenced)
+
+    def time_parse_malformed(self):
+        self.parser.parse(self.malformed)
+
+
+class TimeRunEvaluations:
+    params = [1, 10]
+    param_names = ["evaluators"]
+
+    def setup(self, evaluators):
+        self.saved_key = Config.OPENAI_API_KEY
+        Config.OPENAI_API_KEY = Config.OPENAI_API_KEY or "benchmark-key"
+        # Every other evaluator fails so the feedback compiler runs too
+        self.ghostwriter = LinkedInGhostwriter([StubEvaluator(i % 2 == 0) for i in range(evaluators)])
+        self.post = sample_post(1_000)
+
+    def time_run_evaluations(self, evaluators):
+        self.ghostwriter.run_evaluations(self.post)
+
+    def teardown(self, evaluators):
+        Config.OPENAI_API_KEY = self.saved_key
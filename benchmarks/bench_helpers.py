@@ -0,0 +1,19 @@
+"""Benchmarks for the text helpers on inputs from 1 KB to 10 MB."""
+
+from linkedin_ghostwriter.utils.helpers import clean_text, format_post_stats
+
+from .data import sample_post
+
+
+class TimeTextHelpers:
+    params = [1_000, 100_000, 1_000_000, 10_000_000]
+    param_names = ["chars"]
+
+    def setup(self, size):
+        self.text = sample_post(size)
+
+    def time_clean_text(self, size):
+        clean_text(self.text)
+
+    def time_format_post_stats(self, size):
+        format_post_stats(self.text)
@@ -0,0 +1,21 @@
+"""Benchmark for package import time in a fresh interpreter."""
+
+import os
+import subprocess
+import sys
+
+from .data import SRC
+
+
+class TimeImport:
+    # Each sample starts a new interpreter; a few are enough
+    repeat = 3
+
+    def _run(self, code):
+        subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": SRC})
+
+    def time_interpreter_startup(self):
+        self._run("pass")
+
+    def time_import_package(self):
+        self._run("import linkedin_ghostwriter")
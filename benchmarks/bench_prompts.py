@@ -0,0 +1,34 @@
+"""Benchmarks for building the generation prompt."""
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from linkedin_ghostwriter.core.config import Config
+from linkedin_ghostwriter.core.ghostwriter import LinkedInGhostwriter
+
+from .data import NOTES
+
+
+class TimePromptAssembly:
+    params = [False, True]
+    param_names = ["feedback"]
+
+    def setup(self, feedback):
+        self.saved = (Config.OPENAI_API_KEY, Config.GENERATION_TIMEOUT)
+        Config.OPENAI_API_KEY = Config.OPENAI_API_KEY or "benchmark-key"
+        # Without a timeout the call skips the deadline event loop, which would dominate the timing
+        Config.GENERATION_TIMEOUT = 0
+        self.ghostwriter = LinkedInGhostwriter()
+        # A model that answers instantly, so generate_post measures prompt assembly and sizing
+        self.ghostwriter.llm = RunnableLambda(lambda messages: AIMessage(content="Draft."))
+        self.feedback = (
+            "Fix these issues in the next draft (most important first):\n"
+            '1. [jargon] Use plain words. Rewrite: "leverage"; "synergy"\n'
+            "2. [dashes] Found 5 dashes; use at most 3. Use commas or periods instead."
+        ) if feedback else ""
+
+    def teardown(self, feedback):
+        Config.OPENAI_API_KEY, Config.GENERATION_TIMEOUT = self.saved
+
+    def time_generate_post(self, feedback):
+        self.ghostwriter.generate_post(NOTES, self.feedback)
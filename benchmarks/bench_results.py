@@ -0,0 +1,63 @@
+"""Benchmarks for bulk EvaluationResult serialization against legacy result dicts."""
+
+import json
+import tracemalloc
+
+from linkedin_ghostwriter.evaluations.result import EvaluationResult, decode_results, encode_results
+
+from .data import legacy_result
+
+
+def _retained_bytes(build):
+    """Bytes still allocated by what build() returns, measured with tracemalloc."""
+    tracemalloc.start()
+    try:
+        kept = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+class TimeEvaluationResults:
+    params = [10_000, 1_000_000]
+    param_names = ["results"]
+    # One encode of a million results takes over a second
+    repeat = 3
+
+    def setup(self, count):
+        self.dicts = [legacy_result(i) for i in range(count)]
+        self.typed = [EvaluationResult.from_dict(result) for result in self.dicts]
+        self.dicts_json = json.dumps(self.dicts, ensure_ascii=False, separators=(",", ":"))
+        self.typed_json = encode_results(self.typed)
+
+    def time_encode_dicts(self, count):
+        json.dumps(self.dicts, ensure_ascii=False, separators=(",", ":"))
+
+    def time_encode_typed(self, count):
+        encode_results(self.typed)
+
+    def time_decode_dicts(self, count):
+        json.loads(self.dicts_json)
+
+    def time_decode_typed(self, count):
+        decode_results(self.typed_json)
+
+    def track_memory_dicts(self, count):
+        return _retained_bytes(lambda: [legacy_result(i) for i in range(count)])
+
+    def track_memory_typed(self, count):
+        return _retained_bytes(lambda: [EvaluationResult.from_dict(legacy_result(i)) for i in range(count)])
+
+    def track_memory_decoded_dicts(self, count):
+        return _retained_bytes(lambda: json.loads(self.dicts_json))
+
+    def track_memory_decoded_typed(self, count):
+        return _retained_bytes(lambda: decode_results(self.typed_json))
+
+    def track_json_bytes_dicts(self, count):
+        return len(self.dicts_json.encode("utf-8"))
+
+    def track_json_bytes_typed(self, count):
+        return len(self.typed_json.encode("utf-8"))
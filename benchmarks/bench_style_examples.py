@@ -0,0 +1,37 @@
+"""Benchmarks for building, loading and querying the style example index."""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from linkedin_ghostwriter.core.style_examples import StyleExampleStore
+
+from .data import synthetic_archive
+
+
+class TimeStyleExamples:
+    params = [10_000]
+    param_names = ["posts"]
+    # Building the index over 10k posts takes about a second
+    repeat = 3
+
+    def setup(self, size):
+        self.posts = synthetic_archive(size)
+        self.store = StyleExampleStore(self.posts)
+        self.directory = tempfile.mkdtemp()
+        self.path = str(Path(self.directory) / "archive.index.json")
+        self.store.save(self.path)
+        self.queries = [" ".join(post.split()[:40]) for post in self.posts[:10]]
+
+    def teardown(self, size):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_build(self, size):
+        StyleExampleStore(self.posts)
+
+    def time_load(self, size):
+        StyleExampleStore.load(self.path)
+
+    def time_retrieve(self, size):
+        for query in self.queries:
+            self.store.retrieve(query, k=3, token_budget=10_000)
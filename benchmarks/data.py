@@ -0,0 +1,45 @@
+"""Deterministic inputs shared by the benchmarks."""
+
+import random
+from functools import lru_cache
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+PARAGRAPH = (
+    "Last week our team shipped a feature we had been planning for months — and it broke on day one. "
+    "We rolled back, wrote a test for the edge case, and shipped again the next morning. "
+    "The lesson? Small releases beat perfect ones. #engineering #lessonslearned\n\n"
+)
+
+
+@lru_cache(maxsize=None)
+def sample_post(size: int) -> str:
+    """Post-like text of exactly size characters."""
+    return (PARAGRAPH * (size // len(PARAGRAPH) + 1))[:size]
+
+
+NOTES = (
+    "Shipped the billing migration. Two incidents, both config. Learned to dry-run migrations "
+    "against a production snapshot first. Team did great under pressure."
+)
+
+
+def synthetic_archive(size, seed=7):
+    """Random posts over a 5000-word vocabulary, for the style example index."""
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(5000)]
+    return [" ".join(rng.choices(vocabulary, k=rng.randint(60, 200))) for _ in range(size)]
+
+
+def legacy_result(i):
+    """Result dict in one of the two shapes evaluators return (rule-based failure, judge pass)."""
+    if i % 2:
+        return {
+            "passed": False, "dash_count": i % 9, "max_allowed": 3, "evaluator_type": "rule_based",
+            "feedback": "Found dashes. Use commas or periods instead.",
+        }
+    return {
+        "passed": True, "failures": [], "phrases": [], "feedback": "Reads like a person.",
+        "evaluator_type": "llm_based", "judge": "LLMJudgeEvaluator",
+    }
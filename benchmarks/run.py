@@ -0,0 +1,206 @@
+"""Run the benchmark suite, store a baseline and compare against it.
+
+Benchmarks follow the asv layout: ``bench_*.py`` modules hold ``Time*``
+classes whose ``time_*`` methods are timed. ``params`` (one list) runs every
+method once per value, passed to ``setup``, ``teardown`` and the method;
+``teardown`` runs once all of an instance's methods are timed, to undo
+global changes made in ``setup``. ``repeat`` overrides the number of timing
+samples. Each result is the best per-call
+time over the samples, which is the least noisy estimate on a busy machine.
+``track_*`` methods are called once and return a size in bytes (memory or
+output size), compared against the baseline like timings.
+
+    python -m benchmarks.run                    # run and print
+    python -m benchmarks.run --save             # write benchmarks/baseline.json
+    python -m benchmarks.run --compare          # exit 1 on a regression over --threshold
+    python -m benchmarks.run --filter TextHelpers --compare --threshold 0.5
+
+Baselines are only comparable on the machine that wrote them; save a fresh
+one before comparing on a different machine.
+"""
+
+import argparse
+import contextlib
+import importlib
+import inspect
+import io
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .data import SRC
+
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+
+# (name, call, timing samples override)
+Benchmark = Tuple[str, Callable[[], Any], Optional[int]]
+
+
+def discover(pattern: str = "") -> Iterator[Benchmark]:
+    """Yield a Benchmark for every benchmark whose name contains pattern, set up and ready to time."""
+    for path in sorted(BENCHMARK_DIR.glob("bench_*.py")):
+        module = importlib.import_module(f"{__package__}.{path.stem}")
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if not class_name.startswith("Time") or cls.__module__ != module.__name__:
+                continue
+            methods = sorted(name for name in dir(cls) if name.startswith(("time_", "track_")))
+            params = getattr(cls, "params", None)
+            label = (getattr(cls, "param_names", None) or ["param"])[0]
+            for param in params if params is not None else [None]:
+                suffix = "" if params is None else f"({label}={param})"
+                names = [f"{path.stem}.{class_name}.{method}{suffix}" for method in methods]
+                selected = [(name, method) for name, method in zip(names, methods) if pattern in name]
+                if not selected:
+                    continue
+                instance = cls()
+                args = () if params is None else (param,)
+                if hasattr(instance, "setup"):
+                    instance.setup(*args)
+                try:
+                    for name, method in selected:
+                        bound = getattr(instance, method)
+                        yield name, (lambda bound=bound, args=args: bound(*args)), getattr(cls, "repeat", None)
+                finally:
+                    if hasattr(instance, "teardown"):
+                        instance.teardown(*args)
+
+
+def measure(call: Callable[[], Any], repeat: int) -> float:
+    """Best seconds per call over repeat samples of at least ~0.2s each."""
+    timer = timeit.Timer(call)
+    # Benchmarks may print progress; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        number, _ = timer.autorange()
+        samples = timer.repeat(repeat, number)
+    return min(samples) / number
+
+
+def run(
+    pattern: str = "",
+    repeat: int = DEFAULT_REPEAT,
+    baseline: Optional[Dict[str, float]] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Dict[str, float]:
+    """
+    Time every matching benchmark, printing results as they come in.
+
+    A benchmark that looks slower than the baseline by more than threshold is
+    measured once more and keeps its better time, so one noisy sample does not
+    fail the comparison.
+    """
+    results = {}
+    for name, call, class_repeat in discover(pattern):
+        if is_tracked(name):
+            results[name] = call()
+        else:
+            results[name] = measure(call, class_repeat or repeat)
+            before = (baseline or {}).get(name)
+            if before and results[name] > before * (1 + threshold):
+                results[name] = min(results[name], measure(call, class_repeat or repeat))
+        print(f"{name:<70} {format_value(name, results[name]):>10}", flush=True)
+    return results
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float = DEFAULT_THRESHOLD
+) -> List[Tuple[str, Optional[float], float, Optional[float], bool]]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        Rows of (name, baseline seconds, current seconds, ratio, regressed); the
+        baseline and ratio are None for benchmarks the baseline does not know
+    """
+    rows = []
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        ratio = seconds / before if before else None
+        rows.append((name, before, seconds, ratio, ratio is not None and ratio > 1 + threshold))
+    return rows
+
+
+def is_tracked(name: str) -> bool:
+    return ".track_" in name
+
+
+def format_value(name: str, value: float) -> str:
+    return format_bytes(value) if is_tracked(name) else format_seconds(value)
+
+
+def format_bytes(size: float) -> str:
+    for unit, scale in (("GB", 1 << 30), ("MB", 1 << 20), ("kB", 1 << 10)):
+        if size >= scale:
+            return f"{size / scale:.1f}{unit}"
+    return f"{size:.0f}B"
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def machine() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timing samples per benchmark")
+    parser.add_argument("--save", nargs="?", const=str(DEFAULT_BASELINE), help="Write results as the baseline")
+    parser.add_argument("--compare", nargs="?", const=str(DEFAULT_BASELINE), help="Compare with a baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown before --compare fails (0.25 = 25%%)",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("machine") != machine():
+            print(f"⚠️ Baseline was recorded on {baseline.get('machine')}; timings may not be comparable")
+
+    results = run(args.filter, args.repeat, baseline and baseline.get("results"), args.threshold)
+
+    if args.save:
+        payload = {"machine": machine(), "results": results}
+        if args.filter and Path(args.save).exists():
+            # Partial runs update the matching entries only
+            with open(args.save, "r", encoding="utf-8") as f:
+                payload["results"] = {**json.load(f).get("results", {}), **results}
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Saved {len(results)} results to {args.save}")
+
+    if baseline is None:
+        return 0
+    rows = compare(results, baseline.get("results", {}), args.threshold)
+    print(f"\n{'benchmark':<70} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, before, seconds, ratio, regressed in rows:
+        before_text = format_value(name, before) if before else "new"
+        ratio_text = f"{ratio:.2f}" if ratio else "-"
+        print(f"{name:<70} {before_text:>10} {format_value(name, seconds):>10} {ratio_text:>7}{'  ❌' if regressed else ''}")
+    regressions = sum(row[-1] for row in rows)
+    if regressions:
+        print(f"\n❌ {regressions} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    print(f"\n✅ No regressions over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,24 +6,37 @@ Subcommands:
 - test-judge   : Test LLM judge (general post quality)
 - test-jargon  : Test LLM judge (corporate jargon detector)
 - dash         : Test rule-based evaluator (dash count)
+- history      : Query the run history store
+- score        : Score a dataset of posts with an LLM judge (batched)
 """
 
 import sys
 import os
 import json
+import time
 from pathlib import Path
 import click
 import traceback
+from datetime import datetime
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from linkedin_ghostwriter import (
     LinkedInGhostwriter,
+    RunHistoryStore,
+    GhostwriterPool,
+    PersonaRegistry,
+    StyleExampleStore,
     DashCountEvaluator,
     LLMJudgeEvaluator,
     CorporateJargonJudgeEvaluator,
+    StyleEvaluator,
+    EvaluationResult,
 )
+from linkedin_ghostwriter.core.config import Config
+from linkedin_ghostwriter.evaluations.result import encode_results
+from linkedin_ghostwriter.utils.tokens import cache_stats, estimator, fit_scale
 
 
 @click.group(context_settings=dict(help_option_names=["-h", "--help"]))
@@ -33,18 +46,26 @@ def cli():
 
 
 @cli.command(name="write", help="Run the interactive ghostwriter workflow (generate + evaluate)")
-def main_workflow():
+@click.option("--pipelined/--sequential", default=None, help="Generate the next draft while slow judges run (overrides Config)")
+@click.option("--deadline", type=float, default=None, help="Seconds for the whole post; returns the best draft when it runs out")
+@click.option("--persona", type=str, default="", help="Write as this persona (a directory in PERSONAS_DIR)")
+def main_workflow(pipelined: bool, deadline: float, persona: str):
     """Run the interactive ghostwriter workflow (generate + evaluate)."""
     click.echo("🚀 LinkedIn Ghostwriter - AI-powered post generation")
     click.echo("=" * 50)
 
+    ghostwriter = None
     try:
-        # Initialize evaluators
-        dash_evaluator = DashCountEvaluator()
-        llm_evaluator = LLMJudgeEvaluator()
+        if persona:
+            ghostwriter = GhostwriterPool(max_size=1).get(persona)
+            click.echo(f"🎭 Persona: {persona}")
+        else:
+            # Initialize evaluators
+            dash_evaluator = DashCountEvaluator()
+            llm_evaluator = LLMJudgeEvaluator()
 
-        # Create ghostwriter
-        ghostwriter = LinkedInGhostwriter([llm_evaluator]) #TODO: add dash_evaluator
+            # Create ghostwriter
+            ghostwriter = LinkedInGhostwriter([llm_evaluator]) #TODO: add dash_evaluator
 
         click.echo("✅ Ghostwriter initialized successfully!")
         click.echo("\nEnter your raw notes (press Enter twice to finish):")
@@ -68,7 +89,9 @@ def main_workflow():
         click.echo("\n🔄 Generating post with evaluation...")
 
         # Generate post
-        final_post, iterations, passed = ghostwriter.generate_with_evaluation(raw_notes)
+        final_post, iterations, passed = ghostwriter.generate_with_evaluation(
+            raw_notes, pipelined=pipelined, deadline=deadline
+        )
 
         click.echo(f"\n📝 Generated Post (Iteration {iterations}):")
         click.echo("-" * 50)
@@ -80,6 +103,19 @@ def main_workflow():
         else:
             click.echo("⚠️ Some evaluations failed, but max iterations reached.")
 
+        for judge, stats in ghostwriter.cascade_report().items():
+            click.echo(
+                f"🪜 {judge}: escalated {stats['escalations']}/{stats['calls']} "
+                f"({stats['escalation_rate']:.0%}) cascade verdicts"
+            )
+
+        cache = cache_stats.report()
+        if cache["cached_tokens"]:
+            click.echo(
+                f"♻️ Prompt cache: {cache['cached_tokens']}/{cache['input_tokens']} input tokens "
+                f"({cache['hit_rate']:.0%}) read from the provider cache"
+            )
+
         # Ask if user wants to save
         if click.confirm("\n💾 Save this post to a file?", default=False):
             filename = click.prompt("📁 Enter filename", default="linkedin_post.txt")
@@ -98,6 +134,10 @@ def main_workflow():
         traceback.print_exc()
         click.echo(f"\n❌ Error: {e}")
         sys.exit(1)
+    finally:
+        # Commit the queued history writes even when the run failed or was interrupted
+        if ghostwriter is not None and ghostwriter.history is not None:
+            ghostwriter.history.close()
 
 
 def _prompt_multiline(title: str) -> str:
@@ -133,15 +173,21 @@ def _load_text(text: str, file: str, *, interactive_title: str = "Enter text (pr
 @click.option("--file", type=str, default="", help="Path to file with post text (LLM judge)")
 @click.option("--model", type=str, default=None, help="LLM model name (overrides env/Config)")
 @click.option("--temperature", type=float, default=0.0, help="LLM temperature")
+@click.option("--cascade/--no-cascade", default=None, help="Ask the cheap cascade model first (overrides Config)")
+@click.option("--voting/--no-voting", default=None, help="Majority vote over several samples (overrides Config)")
 @click.option("--pretty", is_flag=True, help="Pretty-print JSON output")
-def test_judge_cmd(text: str, file: str, model: str, temperature: float, pretty: bool):
+def test_judge_cmd(text: str, file: str, model: str, temperature: float, cascade: bool, voting: bool, pretty: bool):
     """Test the general LLM judge with custom text or file input."""
     try:
         click.echo("🔎 LLM Judge (general) — evaluating post...")
         content = _load_text(text, file, interactive_title="Enter post text for LLM judge (Enter twice to finish):")
-        evaluator = LLMJudgeEvaluator(model=model, temperature=temperature)
+        evaluator = LLMJudgeEvaluator(model=model, temperature=temperature, cascade=cascade, voting=voting)
         result = evaluator.evaluate(content)
         click.echo(json.dumps(result, indent=2 if pretty else None, ensure_ascii=False))
+        if evaluator.cascade:
+            click.echo(f"🪜 Cascade: {json.dumps(evaluator.cascade_stats)}")
+        if evaluator.voting:
+            click.echo(f"🗳️ Voting: {json.dumps(evaluator.vote_stats)}")
     except Exception as e:
         raise click.ClickException(str(e))
 
@@ -151,15 +197,21 @@ def test_judge_cmd(text: str, file: str, model: str, temperature: float, pretty:
 @click.option("--file", type=str, default="", help="Path to file with post text (corporate jargon judge)")
 @click.option("--model", type=str, default=None, help="LLM model name (overrides env/Config)")
 @click.option("--temperature", type=float, default=0.0, help="LLM temperature")
+@click.option("--cascade/--no-cascade", default=None, help="Ask the cheap cascade model first (overrides Config)")
+@click.option("--voting/--no-voting", default=None, help="Majority vote over several samples (overrides Config)")
 @click.option("--pretty", is_flag=True, help="Pretty-print JSON output")
-def test_jargon_cmd(text: str, file: str, model: str, temperature: float, pretty: bool):
+def test_jargon_cmd(text: str, file: str, model: str, temperature: float, cascade: bool, voting: bool, pretty: bool):
     """Test the corporate jargon LLM judge with custom text or file input."""
     try:
         click.echo("🔎 LLM Judge (corporate jargon) — evaluating post...")
         content = _load_text(text, file, interactive_title="Enter post text for corporate jargon judge (Enter twice to finish):")
-        evaluator = CorporateJargonJudgeEvaluator(model=model, temperature=temperature)
+        evaluator = CorporateJargonJudgeEvaluator(model=model, temperature=temperature, cascade=cascade, voting=voting)
         result = evaluator.evaluate(content)
         click.echo(json.dumps(result, indent=2 if pretty else None, ensure_ascii=False))
+        if evaluator.cascade:
+            click.echo(f"🪜 Cascade: {json.dumps(evaluator.cascade_stats)}")
+        if evaluator.voting:
+            click.echo(f"🗳️ Voting: {json.dumps(evaluator.vote_stats)}")
     except Exception as e:
         raise click.ClickException(str(e))
 
@@ -181,5 +233,180 @@ def dash_cmd(text: str, file: str, max_dashes: int, pretty: bool):
         raise click.ClickException(str(e))
 
 
+JUDGES = {
+    "general": LLMJudgeEvaluator,
+    "jargon": CorporateJargonJudgeEvaluator,
+    "style": StyleEvaluator,
+}
+
+
+@cli.command(name="score", help="Score a dataset of posts with an LLM judge (batched)")
+@click.option("--file", "file_", type=str, required=True, help="JSON file: list of post strings or objects with a 'post' field")
+@click.option("--judge", type=click.Choice(sorted(JUDGES)), default="general", help="Judge to score with")
+@click.option("--model", type=str, default=None, help="LLM model name (overrides env/Config)")
+@click.option("--token-budget", type=int, default=None, help="Estimated tokens per batched request")
+@click.option("--max-posts", type=int, default=None, help="Maximum posts per batched request")
+@click.option("--bulk", is_flag=True, help="Submit as an asynchronous bulk job (cheaper, slower; for nightly scoring)")
+@click.option("--poll-interval", type=float, default=60.0, help="Seconds between bulk job status checks")
+@click.option("--rows", is_flag=True, help="Write compact positional rows (decode with decode_results) instead of one object per post")
+@click.option("--pretty", is_flag=True, help="Pretty-print JSON output")
+def score_cmd(
+    file_: str, judge: str, model: str, token_budget: int, max_posts: int, bulk: bool, poll_interval: float, rows: bool, pretty: bool
+):
+    """Score every post in a dataset, packing several posts into each judge call."""
+    try:
+        path = Path(file_)
+        if not path.exists():
+            raise click.ClickException(f"File not found: {file_}")
+        dataset = json.loads(path.read_text(encoding="utf-8"))
+        posts = [item["post"] if isinstance(item, dict) else item for item in dataset]
+        ids = [item.get("id", i) if isinstance(item, dict) else i for i, item in enumerate(dataset)]
+
+        evaluator = JUDGES[judge](model=model)
+        if bulk:
+            handle = evaluator.submit_bulk(posts, token_budget=token_budget, max_posts=max_posts)
+            click.echo(f"⏳ Submitted bulk job {handle['job_id']}", err=True)
+            results = evaluator.poll_bulk(handle, posts)
+            while results is None:
+                time.sleep(poll_interval)
+                results = evaluator.poll_bulk(handle, posts)
+        else:
+            results = evaluator.evaluate_batch(posts, token_budget=token_budget, max_posts=max_posts)
+        results = [EvaluationResult.from_dict(result) for result in results]
+        if rows:
+            click.echo(encode_results(results, ids=ids))
+        else:
+            output = [{"id": post_id, **result} for post_id, result in zip(ids, results)]
+            click.echo(json.dumps(output, indent=2 if pretty else None, ensure_ascii=False, default=str))
+        stats = evaluator.batch_stats
+        click.echo(
+            f"📦 {len(posts)} posts, {stats['requests']} batched requests, {stats['fallbacks']} single-post fallbacks",
+            err=True,
+        )
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command(name="style-index", help="Build the style example index over a post archive")
+@click.option("--archive", type=str, default=None, help="JSON archive of past posts (defaults to STYLE_ARCHIVE_PATH)")
+@click.option("--index", "index_path", type=str, default=None, help="Index path (defaults to STYLE_INDEX_PATH or <archive>.index.json)")
+@click.option("--query", type=str, default="", help="Show the examples retrieved for these notes")
+def style_index_cmd(archive: str, index_path: str, query: str):
+    """Build (or refresh) the persisted style example index and optionally preview retrieval."""
+    try:
+        archive = archive or Config.STYLE_ARCHIVE_PATH
+        if not archive or not Path(archive).exists():
+            raise click.ClickException("No archive found (use --archive or set STYLE_ARCHIVE_PATH).")
+        index_path = index_path or Config.STYLE_INDEX_PATH or f"{archive}.index.json"
+        started = time.perf_counter()
+        store = StyleExampleStore.from_archive(archive)
+        store.save(index_path)
+        click.echo(f"📚 Indexed {len(store)} posts in {time.perf_counter() - started:.2f}s -> {index_path}")
+        if query:
+            for example in store.retrieve(query):
+                click.echo("-" * 50)
+                click.echo(example)
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command(name="tokens", help="Estimate prompt tokens offline, or calibrate the estimate")
+@click.option("--text", type=str, default="", help="Text to estimate")
+@click.option("--file", type=str, default="", help="Path to file with text to estimate")
+@click.option("--calibrate", is_flag=True, help="Fit the estimate to token counts recorded in the run history")
+@click.option("--db", type=str, default=None, help="History database path (defaults to HISTORY_DB_PATH)")
+def tokens_cmd(text: str, file: str, calibrate: bool, db: str):
+    """Estimate tokens offline, or fit TOKEN_ESTIMATE_SCALE to recorded usage."""
+    try:
+        if calibrate:
+            path = db or Config.HISTORY_DB_PATH
+            if not path or not Path(path).exists():
+                raise click.ClickException("No history database found (use --db or set HISTORY_DB_PATH).")
+            with RunHistoryStore(path) as store:
+                samples = store.token_samples()
+            if not samples:
+                raise click.ClickException("No drafts with recorded token usage yet.")
+            scale, before, after = fit_scale(samples)
+            click.echo(f"📏 {len(samples)} drafts: mean error {before:.1%} unscaled, {after:.1%} with scale {scale:.3f}")
+            click.echo(f"Set TOKEN_ESTIMATE_SCALE={scale:.3f} in your .env to use it.")
+            return
+        content = _load_text(text, file, interactive_title="Enter text to estimate (Enter twice to finish):")
+        tokens = estimator.estimate(content)
+        click.echo(f"📏 ~{tokens} tokens ({len(content)} characters, scale {estimator.scale:.3f})")
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command(name="personas", help="List personas, optionally building each to measure construction cost")
+@click.option("--dir", "directory", type=str, default=None, help="Persona directory (defaults to PERSONAS_DIR)")
+@click.option("--warm", is_flag=True, help="Build every persona once and report the pool stats")
+def personas_cmd(directory: str, warm: bool):
+    """List persona definitions and optionally warm a pool with them."""
+    try:
+        registry = PersonaRegistry(directory)
+        names = registry.names()
+        if not names:
+            raise click.ClickException(f"No personas found in {registry.directory}")
+        for name in names:
+            persona = registry.get(name)
+            evaluators = ", ".join(spec["type"] for spec in persona.evaluators) or "none"
+            click.echo(f"🎭 {name}: {len(persona.examples)} examples, evaluators: {evaluators}")
+        if warm:
+            pool = GhostwriterPool(registry, max_size=len(names))
+            for name in names:
+                pool.get(name)
+            click.echo(json.dumps(pool.report()))
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+def _parse_date(value: str) -> float:
+    """Parse a YYYY-MM-DD (or ISO) date into a unix timestamp."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise click.BadParameter(f"Invalid date: {value} (expected YYYY-MM-DD)")
+
+
+@cli.command(name="history", help="Query the run history store")
+@click.option("--db", type=str, default=None, help="History database path (defaults to HISTORY_DB_PATH)")
+@click.option("--notes-hash", type=str, default="", help="Filter by notes hash (prefix allowed)")
+@click.option("--judge", type=str, default="", help="Show verdicts of this judge (e.g. LLMJudgeEvaluator)")
+@click.option("--since", type=str, default="", help="Only entries on or after this date (YYYY-MM-DD)")
+@click.option("--until", type=str, default="", help="Only entries before this date (YYYY-MM-DD)")
+@click.option("--costs", is_flag=True, help="Summarise which judges cost the most iterations (all filters apply)")
+@click.option("--limit", type=int, default=20, help="Maximum number of rows")
+@click.option("--pretty", is_flag=True, help="Pretty-print JSON output")
+def history_cmd(db: str, notes_hash: str, judge: str, since: str, until: str, costs: bool, limit: int, pretty: bool):
+    """Query runs, verdicts or per-judge costs from the run history store."""
+    try:
+        path = db or Config.HISTORY_DB_PATH
+        if not path or not Path(path).exists():
+            raise click.ClickException("No history database found (use --db or set HISTORY_DB_PATH).")
+        since_ts = _parse_date(since) if since else None
+        until_ts = _parse_date(until) if until else None
+
+        with RunHistoryStore(path, read_only=True) as store:
+            if costs:
+                rows = store.judge_costs(judge=judge, notes_hash=notes_hash, since=since_ts, until=until_ts)
+            elif judge:
+                rows = store.query_verdicts(judge=judge, notes_hash=notes_hash, since=since_ts, until=until_ts, limit=limit)
+            else:
+                rows = store.query_runs(notes_hash=notes_hash, since=since_ts, until=until_ts, limit=limit)
+        click.echo(json.dumps(rows, indent=2 if pretty else None, ensure_ascii=False))
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
 if __name__ == "__main__":
     cli()
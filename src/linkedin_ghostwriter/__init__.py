@@ -3,7 +3,12 @@ LinkedIn Ghostwriter - AI-powered LinkedIn post generation with evaluation-drive
 """
 
 from .core.ghostwriter import LinkedInGhostwriter
-from .evaluations.rule_based import DashCountEvaluator
+from .core.history import RunHistoryStore
+from .core.personas import GhostwriterPool, Persona, PersonaRegistry
+from .core.style_examples import StyleExampleStore
+from .evaluations.result import EvaluationResult
+from .backends import get_backend
+from .evaluations.rule_based import DashCountEvaluator, JargonLexiconEvaluator
 from .evaluations.llm_based import LLMJudgeEvaluator, CorporateJargonJudgeEvaluator, StyleEvaluator
 
 __version__ = "0.1.0"
@@ -11,8 +16,16 @@ __author__ = "Your Name"
 
 __all__ = [
     "LinkedInGhostwriter",
+    "RunHistoryStore",
+    "GhostwriterPool",
+    "Persona",
+    "PersonaRegistry",
+    "StyleExampleStore",
+    "get_backend",
     "DashCountEvaluator", 
+    "JargonLexiconEvaluator",
     "LLMJudgeEvaluator",
     "CorporateJargonJudgeEvaluator",
     "StyleEvaluator",
+    "EvaluationResult",
 ]
@@ -0,0 +1,29 @@
+"""Pluggable LLM backends for LinkedIn Ghostwriter."""
+
+from typing import Any, Dict, Optional, Type
+
+from .base import LLMBackend
+from .chat_model import ChatModelBackend, OpenAIBackend
+from .stub import StubBackend
+from ..core.config import Config
+
+BACKENDS: Dict[str, Type[LLMBackend]] = {
+    "openai": OpenAIBackend,
+    "stub": StubBackend,
+}
+
+
+def get_backend(
+    model: Optional[str] = None,
+    temperature: float = 0,
+    name: Optional[str] = None,
+    **kwargs: Any,
+) -> LLMBackend:
+    """Create the backend selected by name (defaults to Config.LLM_BACKEND)."""
+    name = (name or Config.LLM_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}' (available: {', '.join(sorted(BACKENDS))})")
+    return BACKENDS[name](model=model, temperature=temperature, **kwargs)
+
+
+__all__ = ["LLMBackend", "ChatModelBackend", "OpenAIBackend", "StubBackend", "BACKENDS", "get_backend"]
@@ -0,0 +1,67 @@
+"""Base class for pluggable LLM backends."""
+
+import uuid
+from abc import abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import Runnable, RunnableConfig
+
+
+def to_messages(prompt: Any) -> List[BaseMessage]:
+    """Normalize a prompt value, string or message list into chat messages."""
+    if hasattr(prompt, "to_messages"):
+        return prompt.to_messages()
+    if isinstance(prompt, str):
+        return [HumanMessage(content=prompt)]
+    return list(prompt)
+
+
+class LLMBackend(Runnable):
+    """
+    Abstract chat backend.
+    
+    Backends are LangChain runnables, so prompts compose with them as usual
+    (``prompt | backend``) and ``invoke``/``ainvoke``/``batch`` work out of the
+    box. On top of that every backend offers ``stream`` and asynchronous bulk
+    jobs (``submit_batch``/``poll_batch``) for non-interactive workloads.
+    """
+    
+    model_name: str = ""
+    
+    @abstractmethod
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AIMessage:
+        """Answer one prompt."""
+    
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[AIMessage]:
+        """Stream the answer to one prompt (default: a single chunk)."""
+        yield self.invoke(input, config, **kwargs)
+    
+    def submit_batch(self, prompts: Sequence[Any]) -> str:
+        """
+        Submit prompts as one bulk job and return its id.
+        
+        The default runs the prompts right away with batch(); backends with a
+        provider-side bulk endpoint override this.
+        """
+        job_id = f"local-{uuid.uuid4().hex}"
+        self._local_jobs()[job_id] = self.batch(list(prompts))
+        return job_id
+    
+    def poll_batch(self, job_id: str) -> Optional[List[Optional[AIMessage]]]:
+        """
+        Check a bulk job.
+        
+        Returns:
+            None while the job is running, otherwise one message per submitted
+            prompt (None for prompts the provider did not answer)
+        """
+        try:
+            return self._local_jobs().pop(job_id)
+        except KeyError:
+            raise KeyError(f"Unknown batch job: {job_id}")
+    
+    def _local_jobs(self) -> Dict[str, List[AIMessage]]:
+        if not hasattr(self, "_jobs"):
+            self._jobs: Dict[str, List[AIMessage]] = {}
+        return self._jobs
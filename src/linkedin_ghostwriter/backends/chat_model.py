@@ -0,0 +1,117 @@
+"""Backends that wrap LangChain chat models (OpenAI and OpenAI-compatible servers)."""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_openai import ChatOpenAI
+
+from .base import LLMBackend, to_messages
+from ..core.config import Config
+
+
+class ChatModelBackend(LLMBackend):
+    """Backend delegating to any LangChain chat model."""
+    
+    def __init__(self, chat_model: BaseChatModel):
+        self.chat_model = chat_model
+        self.model_name = getattr(chat_model, "model_name", None) or type(chat_model).__name__
+    
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AIMessage:
+        return self.chat_model.invoke(input, config, **kwargs)
+    
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AIMessage:
+        return await self.chat_model.ainvoke(input, config, **kwargs)
+    
+    def batch(self, inputs: List[Any], config: Any = None, **kwargs: Any) -> List[AIMessage]:
+        return self.chat_model.batch(inputs, config, **kwargs)
+    
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[AIMessage]:
+        yield from self.chat_model.stream(input, config, **kwargs)
+
+
+_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+def _message_to_dict(message: BaseMessage) -> Dict[str, str]:
+    return {"role": _ROLES.get(message.type, "user"), "content": message.content}
+
+
+class OpenAIBackend(ChatModelBackend):
+    """
+    OpenAI chat completions backend.
+    
+    Set OPENAI_BASE_URL to point it at a local OpenAI-compatible server.
+    Bulk jobs go through the OpenAI Batch API (cheaper, answered within
+    Config.BATCH_COMPLETION_WINDOW).
+    """
+    
+    def __init__(self, model: Optional[str] = None, temperature: float = 0, **kwargs: Any):
+        self.temperature = temperature
+        options = {"api_key": Config.OPENAI_API_KEY, **kwargs}
+        if Config.OPENAI_BASE_URL:
+            options.setdefault("base_url", Config.OPENAI_BASE_URL)
+        super().__init__(ChatOpenAI(model=model or Config.OPENAI_MODEL, temperature=temperature, **options))
+    
+    @property
+    def client(self):
+        """Raw OpenAI client used for file uploads and batch jobs."""
+        return self.chat_model.root_client
+    
+    def submit_batch(self, prompts: Sequence[Any]) -> str:
+        lines = []
+        for i, prompt in enumerate(prompts):
+            body = {
+                "model": self.model_name,
+                "temperature": self.temperature,
+                "messages": [_message_to_dict(m) for m in to_messages(prompt)],
+            }
+            lines.append(json.dumps({
+                "custom_id": f"request-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }))
+        upload = self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        job = self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window=Config.BATCH_COMPLETION_WINDOW,
+            metadata={"size": str(len(lines))},
+        )
+        return job.id
+    
+    def poll_batch(self, job_id: str) -> Optional[List[Optional[AIMessage]]]:
+        job = self.client.batches.retrieve(job_id)
+        if job.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"Batch job {job_id} ended with status {job.status}")
+        if job.status != "completed":
+            return None
+        
+        size = int((job.metadata or {}).get("size", job.request_counts.total))
+        messages: List[Optional[AIMessage]] = [None] * size
+        if job.output_file_id:
+            for line in self.client.files.content(job.output_file_id).text.splitlines():
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                body = response["body"]
+                usage = body.get("usage") or {}
+                messages[int(record["custom_id"].rsplit("-", 1)[1])] = AIMessage(
+                    content=body["choices"][0]["message"]["content"] or "",
+                    usage_metadata={
+                        "input_tokens": usage.get("prompt_tokens", 0),
+                        "output_tokens": usage.get("completion_tokens", 0),
+                        "total_tokens": usage.get("total_tokens", 0),
+                        "input_token_details": {
+                            "cache_read": (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0),
+                        },
+                    },
+                )
+        return messages
@@ -0,0 +1,60 @@
+"""Deterministic local stub backend (no network, no API key)."""
+
+import hashlib
+import json
+import re
+from typing import Any, List, Optional
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
+
+from .base import LLMBackend, to_messages
+from ..utils.tokens import TokenEstimator, count_tokens
+
+
+class StubBackend(LLMBackend):
+    """
+    Backend that answers locally and deterministically.
+    
+    With ``responses`` it cycles through them. Otherwise judge prompts get a
+    passing JSON verdict (one per post for batch prompts) and any other prompt
+    gets a short text derived from a hash of the prompt. Useful for offline
+    runs, demos and tests.
+    """
+    
+    def __init__(self, model: Optional[str] = None, temperature: float = 0, responses: Optional[List[str]] = None):
+        self.model_name = f"stub:{model or 'default'}"
+        self.temperature = temperature
+        self.responses = list(responses or [])
+        self.calls = 0
+    
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AIMessage:
+        messages = to_messages(input)
+        prompt = "\n".join(str(m.content) for m in messages)
+        if self.responses:
+            content = self.responses[self.calls % len(self.responses)]
+        else:
+            content = self._answer(prompt)
+        self.calls += 1
+        # Counted like a provider whose tokenizer is the uncalibrated estimate
+        input_tokens = TokenEstimator.estimate_raw_messages(messages)
+        output_tokens = count_tokens(content)
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+    
+    @staticmethod
+    def _answer(prompt: str) -> str:
+        verdict = {"passed": True, "feedback": "Stub verdict.", "failures": [], "phrases": [], "suggestions": []}
+        post_ids = re.findall(r'<post id="([^"]+)">', prompt)
+        if post_ids:
+            return json.dumps([{"id": post_id, **verdict} for post_id in post_ids])
+        if "Return strict JSON" in prompt:
+            return json.dumps({**verdict, "confidence": 1.0})
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        return f"Stub response {digest}."
@@ -12,17 +12,94 @@ class Config:
     # OpenAI Configuration
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o")
+    # Point the OpenAI backend at a local OpenAI-compatible server
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")
+    
+    # LLM Backend: "openai" or "stub" (deterministic, offline, no API key needed)
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "openai")
+    BATCH_COMPLETION_WINDOW: str = "24h"
     
     # Generation Settings
     DEFAULT_TEMPERATURE: float = 0.7
     MAX_ITERATIONS: int = 5
+    # Compiled feedback appended to the generation prompt is cut to this many tokens
+    FEEDBACK_TOKEN_BUDGET: int = 250
+    # Start the next draft from partial feedback while slow judges are still running
+    PIPELINED_GENERATION: bool = False
+    
+    # Deadlines (seconds, 0 disables)
+    GENERATION_TIMEOUT: float = 60.0
+    JUDGE_TIMEOUT: float = 30.0
+    # Whole generate_with_evaluation budget; the best draft so far is returned when it runs out
+    POST_DEADLINE: float = 0.0
+    
+    # Token Budgets (offline estimates, 0 disables)
+    MAX_PROMPT_TOKENS: int = 12000
+    # Input plus output tokens for a whole generate_with_evaluation run
+    POST_TOKEN_BUDGET: int = int(os.getenv("POST_TOKEN_BUDGET", "0"))
+    # Multiplier for the offline estimate; refined online and by `tokens --calibrate`
+    TOKEN_ESTIMATE_SCALE: float = float(os.getenv("TOKEN_ESTIMATE_SCALE", "1.0"))
+    
+    # Hedged judge requests: fire a duplicate once a call is slower than this latency percentile
+    JUDGE_HEDGING_ENABLED: bool = os.getenv("JUDGE_HEDGING_ENABLED", "false").lower() == "true"
+    JUDGE_HEDGE_PERCENTILE: float = 0.95
+    JUDGE_HEDGE_MIN_SAMPLES: int = 20
+    
+    # Notes Preprocessing (map-reduce condensing of long raw notes)
+    # Notes up to NOTES_CONDENSE_THRESHOLD characters pass through unchanged (0 disables)
+    NOTES_CONDENSE_THRESHOLD: int = 6000
+    NOTES_CHUNK_SIZE: int = 3000
+    NOTES_BRIEF_MAX_WORDS: int = 300
+    NOTES_BRIEF_CACHE_SIZE: int = 128
+    PREPROCESS_MODEL: str = os.getenv("PREPROCESS_MODEL", "gpt-4o-mini")
+    PREPROCESS_MAX_CONCURRENCY: int = 8
+    
+    # Style Examples (few-shot posts retrieved from a personal archive)
+    STYLE_ARCHIVE_PATH: str = os.getenv("STYLE_ARCHIVE_PATH", "")
+    STYLE_INDEX_PATH: str = os.getenv("STYLE_INDEX_PATH", "")
+    STYLE_EXAMPLES_K: int = 3
+    STYLE_EXAMPLES_TOKEN_BUDGET: int = 600
+    
+    # Personas (per-author prompts and evaluators, kept warm in a bounded pool)
+    PERSONAS_DIR: str = os.getenv("PERSONAS_DIR", "personas")
+    PERSONA_POOL_SIZE: int = int(os.getenv("PERSONA_POOL_SIZE", "32"))
+    # Parsed persona definitions kept in memory (least recently used are dropped)
+    PERSONA_CACHE_SIZE: int = int(os.getenv("PERSONA_CACHE_SIZE", "1024"))
     
     # Evaluation Settings
     MAX_DASHES_ALLOWED: int = 3
+    # Repair rule-based failures (dashes, lexicon jargon) locally instead of regenerating
+    AUTO_FIX_ENABLED: bool = os.getenv("AUTO_FIX_ENABLED", "true").lower() == "true"
+    
+    # Judge Cascade Settings
+    # A cheap model answers first with a confidence score; the strong model
+    # (OPENAI_MODEL) is only called when confidence is low, or when a
+    # high-stakes judge gets a "passed" verdict.
+    JUDGE_CASCADE_ENABLED: bool = os.getenv("JUDGE_CASCADE_ENABLED", "false").lower() == "true"
+    JUDGE_CASCADE_MODEL: str = os.getenv("JUDGE_CASCADE_MODEL", "gpt-4o-mini")
+    JUDGE_CASCADE_MIN_CONFIDENCE: float = 0.8
+    
+    # Judge Voting (self-consistency: majority of concurrent samples, stop once decided)
+    JUDGE_VOTING_ENABLED: bool = os.getenv("JUDGE_VOTING_ENABLED", "false").lower() == "true"
+    JUDGE_VOTE_MAX_SAMPLES: int = 3
+    JUDGE_VOTE_TEMPERATURE: float = 0.7
+    
+    # Batch Judging (several posts per judge request, for offline scoring)
+    JUDGE_BATCH_TOKEN_BUDGET: int = 8000
+    JUDGE_BATCH_MAX_POSTS: int = 20
+    JUDGE_BATCH_OUTPUT_TOKENS_PER_POST: int = 150
+    JUDGE_BATCH_MAX_CONCURRENCY: int = 4
+    
+    # Run History Settings (empty path disables the store)
+    HISTORY_DB_PATH: str = os.getenv("HISTORY_DB_PATH", "")
+    HISTORY_BATCH_SIZE: int = 100
+    HISTORY_FLUSH_INTERVAL: float = 0.5
     
     @classmethod
     def validate(cls) -> bool:
         """Validate that required configuration is present."""
+        if cls.LLM_BACKEND == "stub":
+            return True
         if not cls.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY environment variable is required")
         return True
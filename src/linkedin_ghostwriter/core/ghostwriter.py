@@ -1,24 +1,77 @@
 """Core LinkedIn Ghostwriter functionality."""
 
-from typing import List, Tuple, Optional
-from langchain_openai import ChatOpenAI
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Tuple, Optional
 from langchain.prompts import ChatPromptTemplate
 
+from ..backends import get_backend
 from ..core.config import Config
+from ..core.history import RunHistoryStore
+from ..core.preprocess import NotesPreprocessor
+from ..core.style_examples import StyleExampleStore
 from ..evaluations.base import BaseEvaluator
-from ..prompts.templates import get_base_prompt
+from ..evaluations.feedback import FailedEvaluation, FeedbackCompiler
+from ..evaluations.result import EvaluationResult
+from ..prompts.templates import FEEDBACK_TEMPLATE, get_generation_prompt, get_system_prompt
+from ..utils.deadlines import DeadlineExceeded, StageTimeout, call_with_deadline, deadline_scope, stage_timeout, time_left
+from ..utils.tokens import TokenBudgetExceeded, check_call, estimator, record_call, token_budget_scope
+
+logger = logging.getLogger(__name__)
 
 
 class LinkedInGhostwriter:
     """Main class for LinkedIn post generation with evaluation-driven development."""
     
-    def __init__(self, evaluators: Optional[List[BaseEvaluator]] = None):
-        """Initialize the ghostwriter with optional evaluators."""
+    def __init__(
+        self,
+        evaluators: Optional[List[BaseEvaluator]] = None,
+        history: Optional[RunHistoryStore] = None,
+        preprocessor: Optional[NotesPreprocessor] = None,
+        style_examples: Optional[StyleExampleStore] = None,
+        instructions: Optional[str] = None,
+        examples: Optional[List[str]] = None,
+        default_style_archive: bool = True
+    ):
+        """
+        Initialize the ghostwriter with optional evaluators.
+        
+        Args:
+            evaluators: Evaluators every draft must pass
+            history: Store that records drafts and verdicts (defaults to one at
+                Config.HISTORY_DB_PATH when that is set)
+            preprocessor: Condenses long raw notes into a brief before generation
+            style_examples: Archive index that supplies few-shot examples matching
+                the notes (defaults to one over Config.STYLE_ARCHIVE_PATH when that is set)
+            instructions: Voice and style instructions replacing the built-in ones
+            examples: Fixed example posts for the static system prefix (defaults to
+                the built-in example); retrieved archive examples are added after it
+            default_style_archive: Fall back to Config.STYLE_ARCHIVE_PATH when no
+                style_examples are given (off for personas, which have their own archives)
+        """
         Config.validate()
         
-        self.llm = ChatOpenAI(**Config.get_openai_config())
+        self.llm = get_backend(Config.OPENAI_MODEL, Config.DEFAULT_TEMPERATURE)
         self.evaluators = evaluators or []
-        self.base_prompt = get_base_prompt()
+        # Static per writer, so every generation request starts with the same cacheable prefix
+        self.system_prompt = get_system_prompt(examples, instructions)
+        self.base_prompt = get_generation_prompt(self.system_prompt)
+        if history is None and Config.HISTORY_DB_PATH:
+            history = RunHistoryStore()
+        self.history = history
+        self.preprocessor = preprocessor or NotesPreprocessor(history=history)
+        self.feedback_compiler = FeedbackCompiler()
+        if style_examples is None and default_style_archive and Config.STYLE_ARCHIVE_PATH:
+            style_examples = StyleExampleStore.open()
+        self.style_examples = style_examples
+        self._prompt_cache: Tuple[Optional[str], ChatPromptTemplate] = (None, self.base_prompt)
+        self._local = threading.local()
+        # Pooled writers serve several threads at once
+        self._stats_lock = threading.Lock()
+        self.fix_stats = {"attempts": 0, "resolved": 0}
         
     def add_evaluator(self, evaluator: BaseEvaluator) -> None:
         """Add an evaluator to the list."""
@@ -26,50 +79,303 @@ class LinkedInGhostwriter:
     
     def generate_post(self, raw_notes: str, feedback: str = "") -> str:
         """Generate a LinkedIn post from raw notes with optional feedback."""
-        prompt_text = self.base_prompt
+        prompt = self.prompt_for(raw_notes)
+        raw_notes, feedback = self.fit_prompt(prompt, raw_notes, feedback)
+        inputs = {"raw_notes": raw_notes}
         if feedback:
-            prompt_text += f"\n\nFeedback from previous attempt:\n{feedback}"
+            # After the notes, so a retry shares the first attempt's prefix
+            prompt = prompt + FEEDBACK_TEMPLATE
+            inputs["feedback"] = feedback
             
-        prompt = ChatPromptTemplate.from_template(prompt_text)
-        chain = prompt | self.llm
-        result = chain.invoke({"raw_notes": raw_notes})
+        messages = prompt.format_messages(**inputs)
+        raw_estimate = estimator.estimate_raw_messages(messages)
+        prompt_tokens = int(raw_estimate * estimator.scale + 0.5)
+        check_call(prompt_tokens)
+        logger.debug("Draft prompt: ~%d tokens", prompt_tokens)
+        
+        result, _ = call_with_deadline(self.llm, messages, stage_timeout(Config.GENERATION_TIMEOUT))
+        self._local.usage = result.usage_metadata or {}
+        record_call(raw_estimate, self._local.usage)
         return result.content
     
+    def fit_prompt(self, prompt: ChatPromptTemplate, raw_notes: str, feedback: str = "") -> Tuple[str, str]:
+        """
+        Trim feedback, then notes, so the generation prompt fits Config.MAX_PROMPT_TOKENS.
+        
+        Returns:
+            Tuple of (raw_notes, feedback), unchanged when they already fit
+        """
+        limit = Config.MAX_PROMPT_TOKENS
+        if not limit:
+            return raw_notes, feedback
+        # Template, feedback message and chat overhead
+        available = limit - estimator.estimate_messages(prompt.format_messages(raw_notes="")) - 16
+        notes_tokens = estimator.estimate(raw_notes)
+        if notes_tokens + estimator.estimate(feedback) <= available:
+            return raw_notes, feedback
+        feedback = estimator.trim(feedback, available - notes_tokens) if feedback else ""
+        raw_notes = estimator.trim(raw_notes, available - estimator.estimate(feedback))
+        if not raw_notes:
+            raise TokenBudgetExceeded(f"The prompt template alone does not fit in {limit} tokens")
+        return raw_notes, feedback
+    
+    def prompt_for(self, raw_notes: str) -> ChatPromptTemplate:
+        """Base prompt plus the archive posts most relevant to these notes as style examples."""
+        if self.style_examples is None:
+            return self.base_prompt
+        notes, prompt = self._prompt_cache
+        if notes != raw_notes:
+            # Every iteration of a run reuses the same notes, so retrieve once per run
+            examples = self.style_examples.retrieve(raw_notes)
+            # Retrieved examples vary with the notes, so they follow the static system prefix
+            prompt = get_generation_prompt(self.system_prompt, examples) if examples else self.base_prompt
+            self._prompt_cache = (raw_notes, prompt)
+        return prompt
+    
     def run_evaluations(self, post: str) -> Tuple[bool, str]:
         """Run all evaluations on a post and return results."""
         if not self.evaluators:
             return True, "No evaluators configured"
-            
-        feedback_list = []
-        passed_all = True
+        passed, failed = self._evaluate_draft(post)
+        return passed, self.feedback_compiler.compile(failed)
+    
+    def _evaluate_draft(
+        self,
+        post: str,
+        run_id: Optional[str] = None,
+        iteration: int = 0,
+        evaluators: Optional[List[BaseEvaluator]] = None
+    ) -> Tuple[bool, List[FailedEvaluation]]:
+        """Run all (or the given) evaluations on a draft, recording verdicts when a run is active."""
+        failed = []
         
-        for evaluator in self.evaluators:
-            result = evaluator.evaluate(post)
-            if not result.get("passed", False):
-                passed_all = False
-                details = ", ".join(f"{k}={v}" for k, v in result.items() if k != "passed")
-                feedback_list.append(f"{evaluator.__class__.__name__} failed: {details}")
+        for evaluator in self.evaluators if evaluators is None else evaluators:
+            result = self._timed_evaluate(evaluator, post, run_id, iteration)
+            if not result.get("passed", False) and not self._abstained(evaluator, result):
+                failed.append((evaluator, result))
         
-        return passed_all, "\n".join(feedback_list)
+        return not failed, failed
+    
+    @staticmethod
+    def _abstained(evaluator: BaseEvaluator, result: EvaluationResult) -> bool:
+        """
+        Whether a judge timed out (after its retry) while the post deadline still has time.
+        
+        Such a judge abstains: its timeout says nothing about the draft and
+        leaves no feedback, so failing the draft would only force a blind redraft.
+        """
+        if not result.get("timed_out", False):
+            return False
+        left = time_left()
+        if left is not None and left <= 0:
+            return False
+        logger.warning("%s timed out and abstains on this draft", evaluator)
+        return True
+    
+    def _fix_draft(
+        self,
+        post: str,
+        evaluators: List[BaseEvaluator],
+        run_id: Optional[str] = None,
+        iteration: int = 0
+    ) -> Tuple[str, List[FailedEvaluation]]:
+        """
+        Run rule-based evaluators, repairing their failures locally where they can.
+        
+        A repaired draft is re-checked only by the evaluator that repaired it.
+        For a repaired failure only the re-check is recorded, marked ``fixed``,
+        so history does not count it as a failure that forced a regeneration.
+        
+        Returns:
+            Tuple of (draft with the successful fixes applied, failures left)
+        """
+        failed = []
+        for evaluator in evaluators:
+            result = self._timed_evaluate(evaluator, post)
+            fixed = None
+            if not result.get("passed", False) and Config.AUTO_FIX_ENABLED:
+                fixed = evaluator.fix(post)
+            if fixed is not None:
+                recheck = self._timed_evaluate(evaluator, fixed)
+                resolved = recheck.get("passed", False)
+                with self._stats_lock:
+                    self.fix_stats["attempts"] += 1
+                    self.fix_stats["resolved"] += int(resolved)
+                if resolved:
+                    logger.info("Fixed locally: %s", evaluator)
+                    recheck["fixed"] = True
+                    recheck.timing += result.timing
+                    self._record_verdict(run_id, iteration, evaluator, recheck)
+                    post = fixed
+                    continue
+            self._record_verdict(run_id, iteration, evaluator, result)
+            if not result.get("passed", False):
+                failed.append((evaluator, result))
+        return post, failed
+    
+    def _timed_generate(self, raw_notes: str, feedback: str) -> Tuple[str, float, Dict[str, Any]]:
+        """Generate a draft and return it with its latency and token usage."""
+        self._local.usage = {}
+        started = time.perf_counter()
+        try:
+            post = self.generate_post(raw_notes, feedback)
+        except StageTimeout:
+            # One slow response should not end the run; a second one in a row does
+            logger.warning("Generation timed out after %ss, retrying once", Config.GENERATION_TIMEOUT)
+            try:
+                post = self.generate_post(raw_notes, feedback)
+            except StageTimeout as e:
+                raise StageTimeout(f"Generation timed out twice (GENERATION_TIMEOUT={Config.GENERATION_TIMEOUT}s)") from e
+        return post, time.perf_counter() - started, self._local.usage
+    
+    def _timed_evaluate(
+        self,
+        evaluator: BaseEvaluator,
+        post: str,
+        run_id: Optional[str] = None,
+        iteration: int = 0
+    ) -> EvaluationResult:
+        """Run one evaluator and record its verdict (when a run is active), latency and token usage."""
+        started = time.perf_counter()
+        result = EvaluationResult.from_dict(evaluator.evaluate(post))
+        result.timing = time.perf_counter() - started
+        self._record_verdict(run_id, iteration, evaluator, result)
+        return result
+    
+    def _record_verdict(
+        self, run_id: Optional[str], iteration: int, evaluator: BaseEvaluator, result: EvaluationResult
+    ) -> None:
+        """Record a timed verdict if a run is active."""
+        if self.history is not None and run_id is not None:
+            self.history.record_verdict(
+                run_id,
+                iteration,
+                str(evaluator),
+                result,
+                seconds=result.timing,
+                usage=getattr(evaluator, "last_usage", None),
+            )
+    
+    def _record_draft(
+        self,
+        run_id: Optional[str],
+        iteration: int,
+        draft: Tuple[str, float, Dict[str, Any]],
+        feedback: str
+    ) -> str:
+        """Record a timed draft (if a run is active) and return the post text."""
+        post, seconds, usage = draft
+        if self.history is not None and run_id is not None:
+            self.history.record_draft(run_id, iteration, post, feedback, seconds, usage)
+        return post
+    
+    @staticmethod
+    def _track_best(progress: Dict[str, Any], post: str, failures: int, iterations: int) -> None:
+        """Remember the draft with the fewest failed evaluations (latest wins ties)."""
+        progress["iterations"] = iterations
+        if progress["post"] is None or failures <= progress["failures"]:
+            progress["post"], progress["failures"] = post, failures
+    
+    @staticmethod
+    def _submit(executor: ThreadPoolExecutor, fn, *args) -> Future:
+        """Submit work to a thread, carrying over the current deadline scope."""
+        return executor.submit(contextvars.copy_context().run, fn, *args)
+    
+    def _start_run(self, raw_notes: str) -> Optional[str]:
+        """Open a run in the history store, if one is configured."""
+        if self.history is None:
+            return None
+        return self.history.start_run(raw_notes, model=self.llm.model_name)
+    
+    def _finish_run(
+        self, run_id: Optional[str], post: str, iterations: int, passed: bool, started: float
+    ) -> Tuple[str, int, bool]:
+        """Record the run outcome and return the generate_with_evaluation result."""
+        if self.history is not None and run_id is not None:
+            self.history.finish_run(run_id, post, iterations, passed, time.perf_counter() - started)
+        return post, iterations, passed
+    
+    def cascade_report(self) -> Dict[str, Dict[str, Any]]:
+        """Get escalation statistics for every judge running in cascade mode."""
+        report = {}
+        for evaluator in self.evaluators:
+            stats = getattr(evaluator, "cascade_stats", None)
+            if stats and stats["calls"]:
+                report[str(evaluator)] = {**stats, "escalation_rate": evaluator.escalation_rate}
+        return report
     
     def generate_with_evaluation(
         self, 
         raw_notes: str, 
-        max_iterations: Optional[int] = None
+        max_iterations: Optional[int] = None,
+        pipelined: Optional[bool] = None,
+        deadline: Optional[float] = None
     ) -> Tuple[str, int, bool]:
         """
         Generate a post with iterative evaluation and improvement.
         
+        Args:
+            raw_notes: Notes to turn into a post
+            max_iterations: Maximum number of drafts (defaults to Config.MAX_ITERATIONS)
+            pipelined: Overlap generation of the next draft with slow judges
+                (defaults to Config.PIPELINED_GENERATION)
+            deadline: Seconds for the whole post (defaults to Config.POST_DEADLINE,
+                0 = no limit). When it runs out, the draft with the fewest failed
+                evaluations so far is returned. Config.POST_TOKEN_BUDGET bounds
+                the run's tokens the same way. A generation that runs past
+                Config.GENERATION_TIMEOUT is retried once; a second timeout ends
+                the run the same way, reported as a generation timeout.
+        
+        Failures that a rule-based evaluator can fix locally (Config.AUTO_FIX_ENABLED)
+        are repaired in place instead of costing another generation.
+        
         Returns:
             Tuple of (final_post, iterations_used, evaluation_passed)
         """
         max_iterations = max_iterations or Config.MAX_ITERATIONS
+        pipelined = Config.PIPELINED_GENERATION if pipelined is None else pipelined
+        deadline = Config.POST_DEADLINE if deadline is None else deadline
+        started = time.perf_counter()
+        run_id = self._start_run(raw_notes)
+        progress: Dict[str, Any] = {"post": None, "failures": 0, "iterations": 0}
+        
+        try:
+            with deadline_scope(deadline), token_budget_scope(Config.POST_TOKEN_BUDGET):
+                # Long notes are condensed once and the brief is reused for every iteration
+                raw_notes = self.preprocessor.prepare(raw_notes)
+                generate = self._generate_pipelined if pipelined else self._generate_sequential
+                post, iterations, passed = generate(raw_notes, max_iterations, run_id, progress)
+        except (DeadlineExceeded, TokenBudgetExceeded) as e:
+            if progress["post"] is None:
+                raise
+            if isinstance(e, StageTimeout):
+                print(f"⏱️ {e}, returning the best draft so far.")
+            elif isinstance(e, DeadlineExceeded):
+                print("⏱️ Post deadline reached, returning the best draft so far.")
+            else:
+                print(f"🪙 Token budget reached ({e}), returning the best draft so far.")
+            return self._finish_run(run_id, progress["post"], progress["iterations"], False, started)
+        
+        return self._finish_run(run_id, post, iterations, passed, started)
+    
+    def _generate_sequential(
+        self, raw_notes: str, max_iterations: int, run_id: Optional[str], progress: Dict[str, Any]
+    ) -> Tuple[str, int, bool]:
+        """Generate and evaluate drafts strictly one after the other."""
+        fast = [e for e in self.evaluators if e.evaluator_type == "rule_based"]
+        slow = [e for e in self.evaluators if e.evaluator_type != "rule_based"]
         iteration = 0
         feedback = ""
         
         while iteration < max_iterations:
-            post = self.generate_post(raw_notes, feedback)
-            passed, feedback = self.run_evaluations(post)
+            post, seconds, usage = self._timed_generate(raw_notes, feedback)
+            # Judges see the draft after local fixes; only what cannot be fixed is regenerated
+            post, failed = self._fix_draft(post, fast, run_id, iteration)
+            self._record_draft(run_id, iteration, (post, seconds, usage), feedback)
+            failed += self._evaluate_draft(post, run_id, iteration, slow)[1]
+            passed = not failed
+            self._track_best(progress, post, len(failed), iteration + 1)
+            feedback = self.feedback_compiler.compile(failed)
             
             if passed:
                 return post, iteration + 1, True
@@ -80,3 +386,73 @@ class LinkedInGhostwriter:
         
         # Return the last generated post even if it didn't pass all evaluations
         return post, max_iterations, False
+
+    def _generate_pipelined(
+        self, raw_notes: str, max_iterations: int, run_id: Optional[str], progress: Dict[str, Any]
+    ) -> Tuple[str, int, bool]:
+        """
+        Pipelined variant of generate_with_evaluation.
+        
+        Rule-based evaluators run inline, with their local fixes applied; the
+        remaining judges then run concurrently on the fixed draft.
+        As soon as there is feedback to act on (failures the rule-based evaluators
+        could not fix, or else the first failing judge) the next draft is generated
+        speculatively from it while the other judges finish. No draft is started
+        without feedback, since the current draft may still pass. If it does, the
+        speculative draft is cancelled (or discarded if its request is already in flight).
+        """
+        fast = [e for e in self.evaluators if e.evaluator_type == "rule_based"]
+        slow = [e for e in self.evaluators if e.evaluator_type != "rule_based"]
+        
+        executor = ThreadPoolExecutor(max_workers=len(slow) + 2)
+        try:
+            draft: Future = self._submit(executor, self._timed_generate, raw_notes, "")
+            draft_feedback = ""
+            
+            for iteration in range(max_iterations):
+                post, seconds, usage = draft.result()
+                has_next = iteration + 1 < max_iterations
+                # Rule-based checks and their local fixes are cheap, so judges wait for the fixed draft
+                post, failed = self._fix_draft(post, fast, run_id, iteration)
+                self._record_draft(run_id, iteration, (post, seconds, usage), draft_feedback)
+                pending = {
+                    self._submit(executor, self._timed_evaluate, e, post, run_id, iteration): e for e in slow
+                }
+                
+                speculative, speculative_feedback = None, ""
+                if has_next and failed:
+                    speculative_feedback = self.feedback_compiler.compile(failed)
+                    if speculative_feedback:
+                        speculative = self._submit(executor, self._timed_generate, raw_notes, speculative_feedback)
+                
+                for future in as_completed(pending):
+                    result = future.result()
+                    if result.get("passed", False) or self._abstained(pending[future], result):
+                        continue
+                    failed.append((pending[future], result))
+                    if has_next and speculative is None:
+                        speculative_feedback = self.feedback_compiler.compile(failed)
+                        if speculative_feedback:
+                            speculative = self._submit(executor, self._timed_generate, raw_notes, speculative_feedback)
+                
+                self._track_best(progress, post, len(failed), iteration + 1)
+                if not failed:
+                    if speculative is not None:
+                        speculative.cancel()
+                    return post, iteration + 1, True
+                
+                feedback = self.feedback_compiler.compile(failed)
+                print(feedback)
+                if speculative is None and has_next:
+                    # Failures without usable feedback still need a new draft
+                    speculative, speculative_feedback = (
+                        self._submit(executor, self._timed_generate, raw_notes, feedback), feedback
+                    )
+                if speculative is not None:
+                    draft, draft_feedback = speculative, speculative_feedback
+        finally:
+            # Do not block on a discarded speculative draft
+            executor.shutdown(wait=False)
+        
+        # Return the last generated post even if it didn't pass all evaluations
+        return post, max_iterations, False
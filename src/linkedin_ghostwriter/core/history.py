@@ -0,0 +1,440 @@
+"""Append-only run history store for LinkedIn Ghostwriter.
+
+Every run, draft and evaluator verdict is appended to a SQLite database in
+WAL mode. Writes are queued and committed in batches by a background thread
+so recording never blocks generation; reads open their own connection and
+can run while the writer is active. Stores opened with ``read_only=True``
+(for queries) run no DDL and start no writer.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from ..core.config import Config
+from ..evaluations.result import EvaluationResult, decode_result, encode_result
+from ..utils.helpers import hash_text
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    notes_hash TEXT NOT NULL,
+    raw_notes TEXT NOT NULL,
+    model TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    iterations INTEGER,
+    passed INTEGER,
+    final_post TEXT,
+    total_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_notes_hash ON runs (notes_hash, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs (created_at);
+
+CREATE TABLE IF NOT EXISTS drafts (
+    run_id TEXT NOT NULL,
+    iteration INTEGER NOT NULL,
+    post TEXT NOT NULL,
+    feedback TEXT NOT NULL,
+    seconds REAL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_drafts_run ON drafts (run_id, iteration);
+
+CREATE TABLE IF NOT EXISTS verdicts (
+    run_id TEXT NOT NULL,
+    iteration INTEGER NOT NULL,
+    judge TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    feedback TEXT,
+    result TEXT NOT NULL,
+    seconds REAL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_verdicts_judge ON verdicts (judge, created_at);
+CREATE INDEX IF NOT EXISTS idx_verdicts_run ON verdicts (run_id, iteration);
+
+CREATE TABLE IF NOT EXISTS cache (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+_INSERT_RUN = (
+    "INSERT INTO runs (run_id, notes_hash, raw_notes, model, created_at) VALUES (?, ?, ?, ?, ?)"
+)
+_FINISH_RUN = (
+    "UPDATE runs SET finished_at = ?, iterations = ?, passed = ?, final_post = ?, total_seconds = ? "
+    "WHERE run_id = ?"
+)
+_INSERT_DRAFT = (
+    "INSERT INTO drafts (run_id, iteration, post, feedback, seconds, input_tokens, output_tokens, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_PUT_CACHE = "INSERT OR REPLACE INTO cache (kind, key, value, created_at) VALUES (?, ?, ?, ?)"
+_INSERT_VERDICT = (
+    "INSERT INTO verdicts (run_id, iteration, judge, passed, feedback, result, seconds, input_tokens, "
+    "output_tokens, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _tokens(usage: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+    """Extract (input, output) token counts from LangChain usage metadata."""
+    usage = usage or {}
+    return int(usage.get("input_tokens", 0) or 0), int(usage.get("output_tokens", 0) or 0)
+
+
+class RunHistoryStore:
+    """SQLite-backed, append-only store of runs, drafts and verdicts."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        read_only: bool = False,
+    ):
+        """
+        Open (or create) the store and start the background writer.
+
+        With read_only=True the database must already exist; it is opened for
+        queries only, without creating tables or starting the writer thread.
+        """
+        self.path = path or Config.HISTORY_DB_PATH
+        if not self.path:
+            raise ValueError("A history database path is required (set HISTORY_DB_PATH)")
+        self.batch_size = batch_size or Config.HISTORY_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.HISTORY_FLUSH_INTERVAL
+        self.read_only = read_only
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = read_only
+        if read_only:
+            return
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="run-history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            conn = sqlite3.connect(f"{Path(self.path).resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+        else:
+            conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writes (queued, never block the caller on disk I/O)
+    # ------------------------------------------------------------------
+
+    def start_run(self, raw_notes: str, model: str = "") -> str:
+        """Register a new run and return its id."""
+        run_id = uuid.uuid4().hex
+        self._enqueue(_INSERT_RUN, (run_id, hash_text(raw_notes), raw_notes, model, time.time()))
+        return run_id
+
+    def record_draft(
+        self,
+        run_id: str,
+        iteration: int,
+        post: str,
+        feedback: str = "",
+        seconds: float = 0.0,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record a generated draft and the feedback it was generated from."""
+        input_tokens, output_tokens = _tokens(usage)
+        self._enqueue(
+            _INSERT_DRAFT,
+            (run_id, iteration, post, feedback, seconds, input_tokens, output_tokens, time.time()),
+        )
+
+    def record_verdict(
+        self,
+        run_id: str,
+        iteration: int,
+        judge: str,
+        result: Mapping[str, Any],
+        seconds: float = 0.0,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record one evaluator verdict for a draft (the full result is stored as an encode_result() row)."""
+        input_tokens, output_tokens = _tokens(usage)
+        result = EvaluationResult.from_dict(result)
+        feedback = result.get("feedback")
+        if feedback is not None and not isinstance(feedback, str):
+            feedback = json.dumps(feedback, ensure_ascii=False)
+        self._enqueue(
+            _INSERT_VERDICT,
+            (
+                run_id,
+                iteration,
+                judge,
+                int(bool(result.get("passed", False))),
+                feedback,
+                encode_result(result),
+                seconds,
+                input_tokens,
+                output_tokens,
+                time.time(),
+            ),
+        )
+
+    def finish_run(self, run_id: str, final_post: str, iterations: int, passed: bool, seconds: float) -> None:
+        """Record the outcome of a run."""
+        self._enqueue(_FINISH_RUN, (time.time(), iterations, int(passed), final_post, seconds, run_id))
+
+    def put_cached(self, kind: str, key: str, value: str) -> None:
+        """Store a derived value (e.g. a notes brief) to warm caches in later sessions."""
+        self._enqueue(_PUT_CACHE, (kind, key, value, time.time()))
+
+    def _enqueue(self, sql: str, params: tuple) -> None:
+        if self.read_only:
+            raise RuntimeError("RunHistoryStore was opened read-only")
+        if self._closed:
+            raise RuntimeError("RunHistoryStore is closed")
+        self._check_writer()
+        self._queue.put((sql, params))
+
+    def _check_writer(self) -> None:
+        if self._writer is not None and not self._writer.is_alive():
+            raise RuntimeError("RunHistoryStore writer thread has stopped")
+
+    def _write_loop(self) -> None:
+        """Drain the queue in batches, committing each batch in one transaction."""
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval
+                while item is not None and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+
+                writes = [entry for entry in batch if entry is not None]
+                try:
+                    if writes:
+                        self._commit(conn, writes)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(writes) < len(batch):
+                    return
+        finally:
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, writes: List[Tuple[str, tuple]]) -> None:
+        """Commit a batch; if it fails, roll it back and retry each write alone so one bad write drops only itself."""
+        try:
+            with conn:
+                for sql, params in writes:
+                    conn.execute(sql, params)
+            return
+        except Exception:
+            if len(writes) == 1:
+                logger.exception("Dropped a run history write")
+                return
+        for write in writes:
+            self._commit(conn, [write])
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed."""
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                # Raise instead of waiting forever on writes nobody will commit
+                self._check_writer()
+                self._queue.all_tasks_done.wait(0.1)
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._closed or self._writer is None:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+    def __enter__(self) -> "RunHistoryStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Indexed queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hash_filter(column: str, notes_hash: str) -> Tuple[str, list]:
+        """Match a full hash or a hex prefix using an index-friendly range."""
+        return f"{column} >= ? AND {column} < ?", [notes_hash, notes_hash + "g"]
+
+    def query_runs(
+        self,
+        notes_hash: str = "",
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Runs, newest first, filtered by notes hash (or prefix) and date range."""
+        clauses, params = [], []
+        if notes_hash:
+            clause, values = self._hash_filter("notes_hash", notes_hash)
+            clauses.append(clause)
+            params += values
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            "SELECT run_id, notes_hash, model, created_at, iterations, passed, final_post, total_seconds "
+            f"FROM runs {where} ORDER BY created_at DESC LIMIT ?"
+        )
+        return self._fetch(sql, params + [limit])
+
+    def query_verdicts(
+        self,
+        judge: str = "",
+        notes_hash: str = "",
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        passed: Optional[bool] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Verdicts, newest first, filtered by judge, notes hash and date range."""
+        clauses, params = [], []
+        if judge:
+            clauses.append("v.judge = ?")
+            params.append(judge)
+        if notes_hash:
+            clause, values = self._hash_filter("r.notes_hash", notes_hash)
+            clauses.append(clause)
+            params += values
+        if since is not None:
+            clauses.append("v.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("v.created_at < ?")
+            params.append(until)
+        if passed is not None:
+            clauses.append("v.passed = ?")
+            params.append(int(passed))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            "SELECT v.run_id, r.notes_hash, v.iteration, v.judge, v.passed, v.feedback, v.seconds, "
+            "v.input_tokens, v.output_tokens, v.created_at "
+            f"FROM verdicts v JOIN runs r ON r.run_id = v.run_id {where} "
+            "ORDER BY v.created_at DESC LIMIT ?"
+        )
+        return self._fetch(sql, params + [limit])
+
+    def verdict_results(self, run_id: str) -> List[EvaluationResult]:
+        """Full evaluator results of a run, in iteration order."""
+        sql = "SELECT result FROM verdicts WHERE run_id = ? ORDER BY iteration, created_at"
+        return [decode_result(row["result"]) for row in self._fetch(sql, [run_id])]
+
+    def query_drafts(self, run_id: str) -> List[Dict[str, Any]]:
+        """All drafts of a run in iteration order."""
+        sql = (
+            "SELECT iteration, post, feedback, seconds, input_tokens, output_tokens, created_at "
+            "FROM drafts WHERE run_id = ? ORDER BY iteration"
+        )
+        return self._fetch(sql, [run_id])
+
+    def get_cached(self, kind: str, key: str) -> Optional[str]:
+        """Look up a value stored with put_cached (pending writes may not be visible yet)."""
+        rows = self._fetch("SELECT value FROM cache WHERE kind = ? AND key = ?", [kind, key])
+        return rows[0]["value"] if rows else None
+
+    def judge_costs(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        judge: str = "",
+        notes_hash: str = "",
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-judge cost summary, most expensive first.
+
+        ``forced_iterations`` counts failed verdicts on drafts that were followed
+        by another draft, i.e. how many regenerations each judge caused.
+        Failures repaired locally are only recorded as their passing re-check
+        (marked ``fixed``), so they never count here. Filters work as in
+        query_verdicts().
+        """
+        clauses, params = [], []
+        if judge:
+            clauses.append("v.judge = ?")
+            params.append(judge)
+        if notes_hash:
+            clause, values = self._hash_filter("r.notes_hash", notes_hash)
+            clauses.append(clause)
+            params += values
+        if since is not None:
+            clauses.append("v.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("v.created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        join = "JOIN runs r ON r.run_id = v.run_id" if notes_hash else ""
+        sql = f"""
+            SELECT v.judge,
+                   COUNT(*) AS verdicts,
+                   SUM(1 - v.passed) AS failures,
+                   SUM(CASE WHEN v.passed = 0 AND EXISTS (
+                           SELECT 1 FROM drafts d
+                           WHERE d.run_id = v.run_id AND d.iteration = v.iteration + 1
+                       ) THEN 1 ELSE 0 END) AS forced_iterations,
+                   AVG(v.seconds) AS avg_seconds,
+                   SUM(v.input_tokens) AS input_tokens,
+                   SUM(v.output_tokens) AS output_tokens
+            FROM verdicts v {join} {where}
+            GROUP BY v.judge
+            ORDER BY forced_iterations DESC, failures DESC
+        """
+        return self._fetch(sql, params)
+
+    def token_samples(self, limit: int = 1000) -> List[Tuple[str, int]]:
+        """Recent (draft text, output tokens reported by the provider) pairs, for calibrating token estimates."""
+        sql = (
+            "SELECT post, output_tokens FROM drafts WHERE output_tokens > 0 "
+            "ORDER BY created_at DESC LIMIT ?"
+        )
+        return [(row["post"], row["output_tokens"]) for row in self._fetch(sql, [limit])]
+
+    def _fetch(self, sql: str, params: list) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
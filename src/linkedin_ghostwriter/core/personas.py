@@ -0,0 +1,248 @@
+"""Personas: per-author ghostwriters loaded from disk and kept in a bounded pool.
+
+Each author gets a directory (``<PERSONAS_DIR>/<name>/``) whose
+``persona.json`` holds their voice instructions, example posts and evaluator
+settings. Longer templates and example lists can live in files next to it
+(``template_file``, or ``examples`` given as a file name):
+
+    {
+        "template": "Write like me: short sentences, dry humour...",
+        "examples": ["A past post...", "Another past post..."],
+        "style_archive": "alice_posts.json",
+        "evaluators": [{"type": "dash", "max_allowed": 1}, {"type": "jargon", "cascade": true}]
+    }
+
+Building a ghostwriter creates LLM clients and evaluators, so instances are
+reused. ``GhostwriterPool`` keeps the most recently used ones warm, evicts
+the least recently used beyond its size cap, and rebuilds a persona when its
+file changes.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..core.config import Config
+from ..core.ghostwriter import LinkedInGhostwriter
+from ..core.history import RunHistoryStore
+from ..core.style_examples import StyleExampleStore
+from ..evaluations.base import BaseEvaluator
+from ..evaluations.llm_based import CorporateJargonJudgeEvaluator, LLMJudgeEvaluator, StyleEvaluator
+from ..evaluations.rule_based import DashCountEvaluator, JargonLexiconEvaluator
+
+PERSONA_FILE = "persona.json"
+
+EVALUATORS = {
+    "dash": DashCountEvaluator,
+    "general": LLMJudgeEvaluator,
+    "jargon": CorporateJargonJudgeEvaluator,
+    "lexicon": JargonLexiconEvaluator,
+    "style": StyleEvaluator,
+}
+
+
+@dataclass
+class Persona:
+    """One author's writing setup, as loaded from a persona file."""
+
+    name: str
+    template: Optional[str] = None
+    examples: List[str] = field(default_factory=list)
+    style_archive: Optional[str] = None
+    evaluators: List[Dict[str, Any]] = field(default_factory=list)
+    # Modification time of the persona file, used to notice edits
+    mtime: float = 0.0
+
+    @classmethod
+    def from_file(cls, path: Path) -> "Persona":
+        """Load a persona.json; relative file references resolve against its directory."""
+        data = json.loads(path.read_text(encoding="utf-8"))
+        template = data.get("template")
+        if data.get("template_file"):
+            template = (path.parent / data["template_file"]).read_text(encoding="utf-8")
+        examples = data.get("examples") or []
+        if isinstance(examples, str):
+            examples = json.loads((path.parent / examples).read_text(encoding="utf-8"))
+        archive = data.get("style_archive")
+        for spec in data.get("evaluators") or []:
+            if spec.get("type") not in EVALUATORS:
+                raise ValueError(f"Unknown evaluator type in {path}: {spec.get('type')}")
+        return cls(
+            name=data.get("name") or path.parent.name,
+            template=template,
+            examples=[item["post"] if isinstance(item, dict) else item for item in examples],
+            style_archive=str(path.parent / archive) if archive else None,
+            evaluators=list(data.get("evaluators") or []),
+            mtime=path.stat().st_mtime,
+        )
+
+    def build_evaluators(self) -> List[BaseEvaluator]:
+        """Instantiate the configured evaluators."""
+        evaluators = []
+        for spec in self.evaluators:
+            options = {key: value for key, value in spec.items() if key != "type"}
+            evaluators.append(EVALUATORS[spec["type"]](**options))
+        return evaluators
+
+
+class PersonaRegistry:
+    """
+    Loads persona definitions from a directory, re-reading files that changed.
+
+    Parsed definitions are cached, least recently used first out beyond
+    max_size, so serving many authors does not grow memory without bound.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_size: Optional[int] = None):
+        self.directory = Path(directory or Config.PERSONAS_DIR)
+        self.max_size = max_size or Config.PERSONA_CACHE_SIZE
+        self._personas: "OrderedDict[str, Persona]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        """Names of all personas in the directory."""
+        if not self.directory.is_dir():
+            return []
+        return sorted(path.parent.name for path in self.directory.glob(f"*/{PERSONA_FILE}"))
+
+    def get(self, name: str) -> Persona:
+        """
+        Current definition of a persona.
+
+        Raises:
+            KeyError: if there is no persona with that name
+        """
+        path = self.directory / name / PERSONA_FILE
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            raise KeyError(f"Unknown persona: {name}")
+        with self._lock:
+            persona = self._personas.get(name)
+            if persona is not None:
+                self._personas.move_to_end(name)
+        if persona is None or persona.mtime != mtime:
+            persona = Persona.from_file(path)
+            with self._lock:
+                self._personas[name] = persona
+                self._personas.move_to_end(name)
+                while len(self._personas) > self.max_size:
+                    self._personas.popitem(last=False)
+        return persona
+
+    def __len__(self) -> int:
+        return len(self._personas)
+
+
+class GhostwriterPool:
+    """
+    Thread-safe LRU pool of warm per-persona ghostwriters.
+
+    Concurrent requests for a persona that is not in the pool wait for a single
+    construction instead of each building their own.
+    """
+
+    def __init__(
+        self,
+        registry: Optional[PersonaRegistry] = None,
+        max_size: Optional[int] = None,
+        history: Optional[RunHistoryStore] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            registry: Persona definitions (defaults to one over Config.PERSONAS_DIR)
+            max_size: Maximum number of warm ghostwriters (defaults to Config.PERSONA_POOL_SIZE)
+            history: Run history store shared by every persona
+        """
+        self.registry = registry if registry is not None else PersonaRegistry()
+        self.max_size = max_size or Config.PERSONA_POOL_SIZE
+        self.history = history
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._building: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "reloads": 0, "build_seconds": 0.0}
+
+    def get(self, name: str) -> LinkedInGhostwriter:
+        """Warm ghostwriter for a persona, built on first use or after its file changed."""
+        persona = self.registry.get(name)
+        with self._lock:
+            entry = self._entries.get(name)
+            # Compare file versions, not objects: the registry may have re-read an unchanged file
+            if entry is not None and entry[0].mtime == persona.mtime:
+                self._entries.move_to_end(name)
+                self.stats["hits"] += 1
+                return entry[1]
+            pending = self._building.get(name)
+            if pending is None:
+                pending = self._building[name] = Future()
+                self.stats["misses"] += 1
+                self.stats["reloads"] += int(entry is not None)
+                builder = True
+            else:
+                self.stats["hits"] += 1
+                builder = False
+
+        if not builder:
+            return pending.result()
+
+        try:
+            started = time.perf_counter()
+            ghostwriter = self._build(persona)
+            seconds = time.perf_counter() - started
+        except BaseException as e:
+            with self._lock:
+                del self._building[name]
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._building[name]
+            self._entries[name] = (persona, ghostwriter)
+            self._entries.move_to_end(name)
+            self.stats["build_seconds"] += seconds
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        pending.set_result(ghostwriter)
+        return ghostwriter
+
+    def _build(self, persona: Persona) -> LinkedInGhostwriter:
+        style_examples = None
+        if persona.style_archive:
+            # Each persona keeps its index next to its own archive, never at Config.STYLE_INDEX_PATH
+            style_examples = StyleExampleStore.open(persona.style_archive, f"{persona.style_archive}.index.json")
+        return LinkedInGhostwriter(
+            persona.build_evaluators(),
+            history=self.history,
+            style_examples=style_examples,
+            instructions=persona.template,
+            examples=persona.examples or None,
+            default_style_archive=False,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def report(self) -> Dict[str, Any]:
+        """Pool size, hit rate and average construction cost."""
+        with self._lock:
+            stats = dict(self.stats)
+            size = len(self._entries)
+        requests = stats["hits"] + stats["misses"]
+        stats.update(
+            size=size,
+            max_size=self.max_size,
+            hit_rate=stats["hits"] / requests if requests else 0.0,
+            avg_build_seconds=stats["build_seconds"] / stats["misses"] if stats["misses"] else 0.0,
+        )
+        return stats
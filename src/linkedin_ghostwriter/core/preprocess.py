@@ -0,0 +1,117 @@
+"""Map-reduce preprocessing of long raw notes.
+
+Raw notes are resent with every generation attempt. When they are long
+(meeting transcripts, pasted documents) they are condensed once into a
+compact brief: the notes are chunked, the chunks are condensed in parallel
+(map) and the partial summaries are merged into one brief (reduce). Briefs
+are cached by notes hash so every iteration, and every later run over the
+same notes, reuses them.
+"""
+
+import contextvars
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from langchain.prompts import ChatPromptTemplate
+
+from ..backends import get_backend
+from ..core.config import Config
+from ..core.history import RunHistoryStore
+from ..prompts.templates import get_notes_map_prompt, get_notes_reduce_prompt
+from ..utils.deadlines import call_with_deadline, stage_timeout
+from ..utils.helpers import hash_text, split_into_chunks
+from ..utils.tokens import check_call, estimator, record_call
+
+
+class NotesPreprocessor:
+    """Condenses long raw notes into a cached brief; short notes pass through."""
+
+    CACHE_KIND = "notes_brief"
+
+    def __init__(
+        self,
+        llm=None,
+        threshold: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        history: Optional[RunHistoryStore] = None,
+    ):
+        """
+        Initialize the preprocessor.
+
+        Args:
+            llm: Backend or chat model used for condensing (defaults to a
+                Config.PREPROCESS_MODEL backend, created on first use)
+            threshold: Notes longer than this many characters are condensed
+                (defaults to Config.NOTES_CONDENSE_THRESHOLD, 0 disables)
+            chunk_size: Maximum characters per map chunk (defaults to Config.NOTES_CHUNK_SIZE)
+            history: Optional run history store used as a persistent brief cache
+        """
+        self._llm = llm
+        self.threshold = Config.NOTES_CONDENSE_THRESHOLD if threshold is None else threshold
+        self.chunk_size = chunk_size or Config.NOTES_CHUNK_SIZE
+        self.history = history
+        self.map_prompt = get_notes_map_prompt()
+        self.reduce_prompt = get_notes_reduce_prompt(Config.NOTES_BRIEF_MAX_WORDS)
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def llm(self):
+        """Backend used for condensing (created lazily, most notes never need it)."""
+        if self._llm is None:
+            self._llm = get_backend(Config.PREPROCESS_MODEL, 0)
+        return self._llm
+
+    def needs_condensing(self, raw_notes: str) -> bool:
+        """Check whether notes are over the pass-through threshold."""
+        return self.threshold > 0 and len(raw_notes) > self.threshold
+
+    def prepare(self, raw_notes: str) -> str:
+        """Return the notes unchanged if short, otherwise their (cached) brief."""
+        if not self.needs_condensing(raw_notes):
+            return raw_notes
+
+        key = hash_text(raw_notes)
+        with self._lock:
+            brief = self._cache.get(key)
+        if brief is None and self.history is not None:
+            brief = self.history.get_cached(self.CACHE_KIND, key)
+        if brief is None:
+            brief = self.condense(raw_notes)
+            if self.history is not None:
+                self.history.put_cached(self.CACHE_KIND, key, brief)
+
+        with self._lock:
+            self._cache[key] = brief
+            self._cache.move_to_end(key)
+            while len(self._cache) > Config.NOTES_BRIEF_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return brief
+
+    def condense(self, raw_notes: str) -> str:
+        """Map-reduce the notes into a brief (no caching)."""
+        chunks = split_into_chunks(raw_notes, self.chunk_size)
+        workers = max(1, min(Config.PREPROCESS_MAX_CONCURRENCY, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Each chunk runs in a copy of the caller's context, so the post deadline applies to it too
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._call, self.map_prompt, {"chunk": chunk, "index": i + 1, "total": len(chunks)},
+                )
+                for i, chunk in enumerate(chunks)
+            ]
+            summaries = [future.result() for future in futures]
+
+        return self._call(self.reduce_prompt, {"summaries": "\n\n".join(summaries)})
+
+    def _call(self, prompt: ChatPromptTemplate, inputs: Dict[str, Any]) -> str:
+        """Run one condensing call within the per-call token limit, the post budget and the deadlines."""
+        messages = prompt.format_messages(**inputs)
+        raw_estimate = estimator.estimate_raw_messages(messages)
+        check_call(int(raw_estimate * estimator.scale + 0.5))
+        result, _ = call_with_deadline(self.llm, messages, stage_timeout(Config.GENERATION_TIMEOUT))
+        record_call(raw_estimate, getattr(result, "usage_metadata", None))
+        return result.content.strip()
@@ -0,0 +1,171 @@
+"""Indexed retrieval of few-shot style examples from a personal post archive.
+
+Putting many past posts into every prompt would match the user's voice but
+multiply input tokens on every iteration. Instead, the archive is indexed
+once with BM25 and persisted next to it; for each set of raw notes only the
+few most relevant past posts that fit a token budget go into the prompt.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..core.config import Config
+from ..utils.helpers import estimate_tokens
+
+# Bumped whenever tokenization or the layout changes, so older indexes are rebuilt
+INDEX_VERSION = 2
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have he her his i if in into is it its me my "
+    "not of on or our she so than that the their them then there they this to was we were what "
+    "when which who will with you your".split()
+)
+
+# Letters and digits of any script, with inner apostrophes ("don't", "l'été")
+_WORD = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords and single characters."""
+    return [w for w in _WORD.findall(text.lower()) if len(w) > 1 and w not in STOPWORDS]
+
+
+class StyleExampleStore:
+    """BM25 index over past posts, used to pick few-shot examples for the prompt."""
+
+    def __init__(self, posts: List[str]):
+        """Build the index over the given posts."""
+        self.posts = list(posts)
+        # term -> [doc ids, term frequencies]; flat int lists keep the JSON file fast to load
+        self.postings: Dict[str, List[List[int]]] = {}
+        self.doc_lengths: List[int] = []
+        for doc, post in enumerate(self.posts):
+            terms = Counter(tokenize(post))
+            self.doc_lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                docs, tfs = self.postings.setdefault(term, [[], []])
+                docs.append(doc)
+                tfs.append(tf)
+        self._prepare()
+
+    def _prepare(self) -> None:
+        """Precompute IDF per term and the length normalisation per document."""
+        count = len(self.posts)
+        average = sum(self.doc_lengths) / count if count else 0.0
+        self.idf = {
+            term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, (docs, _) in self.postings.items()
+        }
+        self._norms = [
+            BM25_K1 * (1 - BM25_B + BM25_B * length / average) if average else BM25_K1
+            for length in self.doc_lengths
+        ]
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Return up to k (post index, BM25 score) pairs, best first."""
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            docs, tfs = self.postings[term]
+            for doc, tf in zip(docs, tfs):
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + self._norms[doc])
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def retrieve(self, query: str, k: Optional[int] = None, token_budget: Optional[int] = None) -> List[str]:
+        """
+        Pick the most relevant past posts for the query within a token budget.
+
+        Args:
+            query: Raw notes (or their brief)
+            k: Maximum number of examples (defaults to Config.STYLE_EXAMPLES_K)
+            token_budget: Estimated tokens for all examples together
+                (defaults to Config.STYLE_EXAMPLES_TOKEN_BUDGET)
+
+        Returns:
+            Example posts, most relevant first; posts that would overflow the
+            budget are skipped in favour of shorter, less relevant ones
+        """
+        k = k or Config.STYLE_EXAMPLES_K
+        budget = token_budget or Config.STYLE_EXAMPLES_TOKEN_BUDGET
+        examples: List[str] = []
+        for doc, _ in self.search(query, k * 4):
+            cost = estimate_tokens(self.posts[doc])
+            if cost <= budget:
+                examples.append(self.posts[doc])
+                budget -= cost
+                if len(examples) == k:
+                    break
+        return examples
+
+    def save(self, path: str) -> None:
+        """Persist the index as JSON."""
+        payload = {
+            "version": INDEX_VERSION,
+            "posts": self.posts,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "StyleExampleStore":
+        """Load an index written by save()."""
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported style index version in {path}")
+        store = cls.__new__(cls)
+        store.posts = payload["posts"]
+        store.doc_lengths = payload["doc_lengths"]
+        store.postings = payload["postings"]
+        store._prepare()
+        return store
+
+    @classmethod
+    def from_archive(cls, archive_path: str) -> "StyleExampleStore":
+        """Build an index from a JSON archive: a list of post strings or objects with a 'post' field."""
+        archive = json.loads(Path(archive_path).read_text(encoding="utf-8"))
+        posts = [item["post"] if isinstance(item, dict) else item for item in archive]
+        return cls([post.strip() for post in posts if post and post.strip()])
+
+    @classmethod
+    def open(cls, archive_path: Optional[str] = None, index_path: Optional[str] = None) -> "StyleExampleStore":
+        """
+        Load the persisted index, building and saving it first if it is missing or stale.
+
+        Args:
+            archive_path: JSON archive of past posts (defaults to Config.STYLE_ARCHIVE_PATH)
+            index_path: Where the index is persisted (defaults to Config.STYLE_INDEX_PATH,
+                or the archive path with an ".index.json" suffix)
+        """
+        archive_path = archive_path or Config.STYLE_ARCHIVE_PATH
+        if not archive_path:
+            raise ValueError("No style archive configured (set STYLE_ARCHIVE_PATH)")
+        index_path = index_path or Config.STYLE_INDEX_PATH or f"{archive_path}.index.json"
+
+        if os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(archive_path):
+            try:
+                return cls.load(index_path)
+            except ValueError:
+                pass  # written by an older version; rebuild it
+        store = cls.from_archive(archive_path)
+        store.save(index_path)
+        return store
@@ -1,12 +1,18 @@
 """Base evaluator class for LinkedIn post evaluations."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 class BaseEvaluator(ABC):
     """Abstract base class for all post evaluators."""
     
+    # "rule_based" evaluators are cheap and run inline; anything else may be slow
+    evaluator_type: str = "custom"
+    
+    # Issue category used in compiled feedback when a result has no "failures" list
+    category: str = ""
+    
     @abstractmethod
     def evaluate(self, post: str) -> Dict[str, Any]:
         """
@@ -20,6 +26,18 @@ class BaseEvaluator(ABC):
         """
         pass
     
+    def fix(self, post: str) -> Optional[str]:
+        """
+        Repair this evaluator's failures without an LLM call.
+        
+        Args:
+            post: A post this evaluator failed
+            
+        Returns:
+            The repaired post, or None if the evaluator has no local fix for it
+        """
+        return None
+    
     def __str__(self) -> str:
         """String representation of the evaluator."""
         return self.__class__.__name__
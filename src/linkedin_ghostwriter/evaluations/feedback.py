@@ -0,0 +1,143 @@
+"""Feedback compiler: turns failed evaluations into a compact instruction block.
+
+Raw evaluator results carry metadata (evaluator type, judge name), long
+suggestion lists and phrases that several judges report at once. Appending
+all of that to the generation prompt makes every retry more expensive
+without making it better. The compiler keeps only what the writer can act
+on, merges duplicates across evaluators, ranks issues by severity and stops
+adding lines once the token budget is used up.
+"""
+
+import re
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .base import BaseEvaluator
+from ..core.config import Config
+from ..utils.helpers import estimate_tokens
+from ..utils.tokens import estimator
+
+
+# Result keys that never help the writer
+METADATA_KEYS = {
+    "passed", "evaluator_type", "judge", "suggestions", "confidence", "timed_out",
+    "id", "failures", "phrases", "feedback", "votes", "agreement", "timing", "over_budget", "fixed",
+}
+
+# Higher is more important; unknown categories get DEFAULT_SEVERITY
+CATEGORY_SEVERITY = {
+    "jargon": 5,
+    "cliche": 5,
+    "dashes": 4,
+    "style": 3,
+    "simplicity": 3,
+    "tone": 2,
+    "storytelling": 2,
+    "authenticity": 2,
+}
+DEFAULT_SEVERITY = 1
+
+MAX_PHRASES_PER_ISSUE = 6
+
+FailedEvaluation = Tuple[BaseEvaluator, Mapping[str, Any]]
+
+
+def _normalize(text: str) -> str:
+    """Comparison key for phrases and sentences (case, quotes and spacing ignored)."""
+    text = text.lower().replace("’", "'").replace("“", '"').replace("”", '"')
+    return re.sub(r"\s+", " ", text.strip(" \"'.,;:!?"))
+
+
+class FeedbackCompiler:
+    """Compiles failed evaluations into a ranked, deduplicated, budgeted instruction block."""
+
+    def __init__(self, token_budget: Optional[int] = None):
+        """Initialize with a token budget (defaults to Config.FEEDBACK_TOKEN_BUDGET)."""
+        self.token_budget = token_budget or Config.FEEDBACK_TOKEN_BUDGET
+
+    def compile(self, failed: Sequence[FailedEvaluation]) -> str:
+        """Render the failed evaluations as feedback for the next generation."""
+        issues = self.collect_issues(failed)
+        if not issues:
+            return ""
+
+        header = "Fix these issues in the next draft (most important first):"
+        lines = [header]
+        used = estimate_tokens(header)
+        for index, issue in enumerate(issues):
+            line = self._render(index + 1, issue)
+            cost = estimate_tokens(line) + 1
+            if used + cost > self.token_budget:
+                if index == 0:
+                    # Always keep the most important issue, cut down to fit
+                    lines.append(estimator.trim(line, self.token_budget - used, marker="..."))
+                    index += 1
+                omitted = len(issues) - index
+                if omitted:
+                    lines.append(f"(+{omitted} less important issue{'s' if omitted > 1 else ''} omitted)")
+                break
+            lines.append(line)
+            used += cost
+        return "\n".join(lines)
+
+    def collect_issues(self, failed: Sequence[FailedEvaluation]) -> List[Dict[str, Any]]:
+        """Group failures by category, merge duplicates and sort by severity."""
+        issues: Dict[str, Dict[str, Any]] = {}
+        seen_phrases = set()
+        seen_notes = set()
+
+        for evaluator, result in failed:
+            if result.get("timed_out"):
+                # Nothing actionable: the judge never answered
+                continue
+            categories = [str(c).lower() for c in result.get("failures") or [] if str(c).strip()]
+            if not categories:
+                categories = [evaluator.category or str(evaluator)]
+
+            for category in categories:
+                issue = issues.setdefault(
+                    category, {"category": category, "phrases": [], "notes": [], "reporters": set()}
+                )
+                issue["reporters"].add(str(evaluator))
+
+            # Phrases and notes cannot be attributed to a single category; attach them to the first
+            primary = issues[categories[0]]
+            for phrase in result.get("phrases") or []:
+                key = _normalize(str(phrase))
+                if key and key not in seen_phrases:
+                    seen_phrases.add(key)
+                    primary["phrases"].append(str(phrase).strip())
+
+            for note in self._notes(result):
+                key = _normalize(note)
+                if key and key not in seen_notes:
+                    seen_notes.add(key)
+                    primary["notes"].append(note)
+
+        for issue in issues.values():
+            issue["severity"] = CATEGORY_SEVERITY.get(issue["category"], DEFAULT_SEVERITY) + len(issue["reporters"])
+        return sorted(issues.values(), key=lambda issue: -issue["severity"])
+
+    @staticmethod
+    def _notes(result: Mapping[str, Any]) -> List[str]:
+        """Feedback sentences, or compact metrics for evaluators without feedback text."""
+        feedback = result.get("feedback")
+        if isinstance(feedback, str) and feedback.strip():
+            return [s.strip() for s in re.split(r"(?<=[.!?])\s+", feedback.strip()) if s.strip()]
+        metrics = [
+            f"{key}={value}"
+            for key, value in result.items()
+            if key not in METADATA_KEYS and isinstance(value, (int, float, str, bool))
+        ]
+        return [", ".join(metrics)] if metrics else []
+
+    @staticmethod
+    def _render(number: int, issue: Dict[str, Any]) -> str:
+        parts = [f"{number}. [{issue['category']}]"]
+        if issue["notes"]:
+            parts.append(" ".join(issue["notes"]))
+        if issue["phrases"]:
+            phrases = issue["phrases"][:MAX_PHRASES_PER_ISSUE]
+            parts.append("Rewrite: " + "; ".join(f'"{p}"' for p in phrases))
+        if len(parts) == 1:
+            parts.append("Check failed.")
+        return " ".join(parts)
@@ -1,13 +1,22 @@
 """LLM-based evaluators for LinkedIn posts."""
 
+import contextvars
 import json
-from typing import Dict, Any, Optional
-from langchain_openai import ChatOpenAI
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import BaseOutputParser
+from langchain_core.runnables import RunnableLambda
 
 from .base import BaseEvaluator
+from ..backends import get_backend
 from ..core.config import Config
+from ..prompts.templates import get_judge_prompt
+from ..utils.deadlines import DeadlineExceeded, LatencyTracker, StageTimeout, call_with_deadline, stage_timeout
+from ..utils.helpers import estimate_tokens
+from ..utils.tokens import cached_tokens, check_call, estimator, record_call
 
 
 class JSONParser(BaseOutputParser):
@@ -33,42 +42,394 @@ class JSONParser(BaseOutputParser):
             return {"passed": False, "feedback": "Failed to parse judge output."}
 
 
+CASCADE_CONFIDENCE_INSTRUCTION = """
+Also include in the same JSON object:
+- confidence: number between 0 and 1 (how sure you are that the passed verdict is correct)
+"""
+
+BATCH_INSTRUCTION = """
+The "post" above actually contains several separate posts, each wrapped in <post id="..."> and </post> tags.
+Evaluate every post independently against the criteria above.
+Return a strict JSON array with exactly one object per post, in the same order. Each object must have:
+- id: the post id from its tag
+- all of the fields listed above for a single post
+"""
+
+
+# Token counts kept in last_usage; the estimate is only present once a prompt was sized,
+# cached_input_tokens only when the provider served part of the prompt from its cache
+USAGE_KEYS = ("input_tokens", "output_tokens", "estimated_input_tokens", "cached_input_tokens")
+
+
 class LLMJudgeBase(BaseEvaluator):
     """Base class for LLM-based judges with overridable prompt templates."""
 
-    def __init__(self, model: Optional[str] = None, temperature: float = 0):
+    evaluator_type = "llm_based"
+
+    # A "passed" verdict from the cascade model is never trusted for high-stakes judges
+    high_stakes: bool = False
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        temperature: float = 0,
+        cascade: Optional[bool] = None,
+        high_stakes: Optional[bool] = None,
+        hedging: Optional[bool] = None,
+        voting: Optional[bool] = None,
+        max_votes: Optional[int] = None,
+    ):
         self.model = model or Config.OPENAI_MODEL
         self.temperature = temperature
-        self.llm = ChatOpenAI(
-            model=self.model,
-            temperature=self.temperature,
-            api_key=Config.OPENAI_API_KEY,
-        )
+        self.llm = get_backend(self.model, self.temperature)
         self.parser = JSONParser()
         self.prompt = self._create_prompt()
 
+        if high_stakes is not None:
+            self.high_stakes = high_stakes
+        self.cascade = Config.JUDGE_CASCADE_ENABLED if cascade is None else cascade
+        self.cascade_model = Config.JUDGE_CASCADE_MODEL
+        self.cascade_llm = None
+        if self.cascade:
+            self.cascade_llm = get_backend(self.cascade_model, self.temperature)
+            self.cascade_prompt = self.prompt + CASCADE_CONFIDENCE_INSTRUCTION
+        self.cascade_stats = {"calls": 0, "escalations": 0, "low_confidence": 0, "high_stakes_pass": 0}
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self.batch_prompt = self.prompt + BATCH_INSTRUCTION
+        self.batch_stats = {"requests": 0, "posts": 0, "fallbacks": 0}
+        self.hedging = Config.JUDGE_HEDGING_ENABLED if hedging is None else hedging
+        self.hedge_stats = {"calls": 0, "hedged": 0, "timeouts": 0}
+        self._latency: Dict[str, LatencyTracker] = {}
+        self.voting = Config.JUDGE_VOTING_ENABLED if voting is None else voting
+        self.max_votes = max_votes or Config.JUDGE_VOTE_MAX_SAMPLES
+        self.vote_llm = None
+        if self.voting:
+            self.vote_llm = get_backend(self.model, Config.JUDGE_VOTE_TEMPERATURE)
+        self.vote_stats = {"evaluations": 0, "samples": 0, "early_stops": 0, "split": 0}
+
     def _create_prompt(self) -> ChatPromptTemplate:
-        """Create and return the ChatPromptTemplate for this judge."""
+        """Create and return the ChatPromptTemplate for this judge (see get_judge_prompt)."""
         raise NotImplementedError
 
+    @property
+    def escalation_rate(self) -> float:
+        """Fraction of cascade calls that were escalated to the strong model."""
+        calls = self.cascade_stats["calls"]
+        return self.cascade_stats["escalations"] / calls if calls else 0.0
+
+    @property
+    def mean_votes(self) -> float:
+        """Average number of samples per voted evaluation."""
+        evaluations = self.vote_stats["evaluations"]
+        return self.vote_stats["samples"] / evaluations if evaluations else 0.0
+
+    @property
+    def last_usage(self) -> Dict[str, int]:
+        """Token usage of the last evaluate() call made from the current thread."""
+        return dict(getattr(self._local, "usage", {}))
+
     def evaluate(self, post: str) -> Dict[str, Any]:
         """Evaluate a post using the configured LLM prompt."""
-        result = (self.prompt | self.llm).invoke({"post": post})
-        evaluation_result = self.parser.parse(result)
-        evaluation_result["evaluator_type"] = "llm_based"
+        self._local.usage = {"input_tokens": 0, "output_tokens": 0}
+        if self.cascade_llm is not None:
+            evaluation_result = self._evaluate_cascade(post)
+        else:
+            evaluation_result = self._decide(post)
+        evaluation_result["evaluator_type"] = self.evaluator_type
         evaluation_result["judge"] = self.__class__.__name__
         return evaluation_result
 
+    def evaluate_batch(
+        self,
+        posts: List[str],
+        token_budget: Optional[int] = None,
+        max_posts: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate many posts, packing several into each judge request.
+        
+        Posts are packed greedily into groups whose estimated prompt plus output
+        size fits the token budget. Each group is sent as one request with
+        id-tagged sections and the judge answers with a JSON array of verdicts.
+        Posts the model skipped or whose verdict is malformed, and every post of
+        a request that failed or timed out, are re-evaluated one at a time with
+        evaluate(). Batch requests always use the strong model.
+        
+        Args:
+            posts: Post texts to evaluate
+            token_budget: Estimated tokens per request (defaults to Config.JUDGE_BATCH_TOKEN_BUDGET)
+            max_posts: Maximum posts per request (defaults to Config.JUDGE_BATCH_MAX_POSTS)
+            
+        Returns:
+            One result dictionary per post, in input order
+        """
+        groups = self._pack_batches(posts, token_budget, max_posts)
+        multi = [group for group in groups if len(group) > 1]
+        responses = RunnableLambda(self._judge_batch).batch(
+            [self._format_batch(posts, group) for group in multi],
+            config={"max_concurrency": Config.JUDGE_BATCH_MAX_CONCURRENCY},
+            return_exceptions=True,
+        )
+        # A failed request counts as unanswered, so its posts take the single-post fallback
+        responses = [None if isinstance(response, Exception) else response for response in responses]
+        return self._collect_batch(posts, multi, responses)
+
+    def _judge_batch(self, text: str) -> Any:
+        """Send one packed batch request, deadline-bound and charged to the per-post token budget."""
+        messages = self.batch_prompt.format_messages(post=text)
+        raw_estimate = estimator.estimate_raw_messages(messages)
+        check_call(int(raw_estimate * estimator.scale + 0.5))
+        result, _ = call_with_deadline(self.llm, messages, stage_timeout(Config.JUDGE_TIMEOUT))
+        record_call(raw_estimate, getattr(result, "usage_metadata", None))
+        return result
+
+    def submit_bulk(
+        self,
+        posts: List[str],
+        token_budget: Optional[int] = None,
+        max_posts: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Submit batch judging as an asynchronous bulk job on the LLM backend.
+        
+        Bulk jobs are cheaper but slow (see Config.BATCH_COMPLETION_WINDOW), so
+        they are meant for nightly scoring, not for the interactive loop.
+        
+        Returns:
+            JSON-serializable job handle to pass to poll_bulk (possibly from
+            another process)
+        """
+        groups = self._pack_batches(posts, token_budget, max_posts)
+        prompts = [self.batch_prompt.invoke({"post": self._format_batch(posts, group)}) for group in groups]
+        return {"job_id": self.llm.submit_batch(prompts), "groups": groups}
+
+    def poll_bulk(self, handle: Dict[str, Any], posts: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """Collect a bulk job's verdicts, or return None while it is still running."""
+        responses = self.llm.poll_batch(handle["job_id"])
+        if responses is None:
+            return None
+        return self._collect_batch(posts, handle["groups"], responses)
+
+    def _collect_batch(
+        self, posts: List[str], groups: List[List[int]], responses: List[Any]
+    ) -> List[Dict[str, Any]]:
+        """Map batch verdicts back to posts, falling back to evaluate() for missing ones."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(posts)
+        with self._stats_lock:
+            self.batch_stats["requests"] += len(groups)
+            self.batch_stats["posts"] += sum(len(group) for group in groups)
+        
+        for group, response in zip(groups, responses):
+            verdicts = self.parser.parse(response) if response is not None else None
+            if not isinstance(verdicts, list):
+                continue
+            for verdict in verdicts:
+                if not isinstance(verdict, dict) or not isinstance(verdict.get("passed"), bool):
+                    continue
+                index = self._batch_index(verdict.pop("id", None), group)
+                if index is not None and results[index] is None:
+                    verdict["evaluator_type"] = self.evaluator_type
+                    verdict["judge"] = self.__class__.__name__
+                    results[index] = verdict
+        
+        batched = {index for group in groups for index in group}
+        for index, result in enumerate(results):
+            if result is None:
+                if index in batched:
+                    with self._stats_lock:
+                        self.batch_stats["fallbacks"] += 1
+                results[index] = self.evaluate(posts[index])
+        return results
+
+    def _pack_batches(
+        self, posts: List[str], token_budget: Optional[int], max_posts: Optional[int]
+    ) -> List[List[int]]:
+        """Greedily group post indices so each request fits the token budget."""
+        token_budget = token_budget or Config.JUDGE_BATCH_TOKEN_BUDGET
+        max_posts = max_posts or Config.JUDGE_BATCH_MAX_POSTS
+        overhead = estimate_tokens(self.batch_prompt.format(post=""))
+        
+        groups: List[List[int]] = []
+        current: List[int] = []
+        used = overhead
+        for index, post in enumerate(posts):
+            cost = estimate_tokens(post) + Config.JUDGE_BATCH_OUTPUT_TOKENS_PER_POST
+            if current and (used + cost > token_budget or len(current) >= max_posts):
+                groups.append(current)
+                current, used = [], overhead
+            current.append(index)
+            used += cost
+        if current:
+            groups.append(current)
+        return groups
+
+    @staticmethod
+    def _format_batch(posts: List[str], group: List[int]) -> str:
+        """Render a group of posts as id-tagged sections."""
+        return "\n\n".join(f'<post id="p{n}">\n{posts[i]}\n</post>' for n, i in enumerate(group, 1))
+
+    @staticmethod
+    def _batch_index(post_id: Any, group: List[int]) -> Optional[int]:
+        """Map a "pN" id from a batch verdict back to the post index."""
+        try:
+            n = int(str(post_id).strip().lstrip("pP"))
+        except ValueError:
+            return None
+        return group[n - 1] if 1 <= n <= len(group) else None
+
+    def latency_tracker(self, llm) -> LatencyTracker:
+        """Rolling latency window for one of this judge's models."""
+        name = getattr(llm, "model_name", None) or type(llm).__name__
+        with self._stats_lock:
+            if name not in self._latency:
+                self._latency[name] = LatencyTracker(min_samples=Config.JUDGE_HEDGE_MIN_SAMPLES)
+            return self._latency[name]
+
+    def _judge(self, llm, prompt: ChatPromptTemplate, post: str) -> Dict[str, Any]:
+        """Run a single judge call (deadline-bound, optionally hedged) and parse the verdict."""
+        messages = prompt.format_messages(post=post)
+        raw_estimate = estimator.estimate_raw_messages(messages)
+        prompt_tokens = int(raw_estimate * estimator.scale + 0.5)
+        self._add_usage({"estimated_input_tokens": prompt_tokens})
+        if Config.MAX_PROMPT_TOKENS and prompt_tokens > Config.MAX_PROMPT_TOKENS:
+            # Judging a trimmed post would be meaningless; the writer has to shorten it
+            return {"passed": False, "feedback": "The post is too long to judge. Shorten it.", "over_budget": True}
+        # Raises TokenBudgetExceeded when the per-post budget is used up
+        check_call(prompt_tokens, limit=0)
+        tracker = self.latency_tracker(llm)
+        hedge_after = tracker.percentile(Config.JUDGE_HEDGE_PERCENTILE) if self.hedging else None
+        # A single slow answer is retried once while the post deadline has time left
+        for attempt in range(2):
+            started = time.perf_counter()
+            try:
+                result, hedged = call_with_deadline(llm, messages, stage_timeout(Config.JUDGE_TIMEOUT), hedge_after)
+                break
+            except DeadlineExceeded as e:
+                with self._stats_lock:
+                    self.hedge_stats["calls"] += 1
+                    self.hedge_stats["timeouts"] += 1
+                if attempt or not isinstance(e, StageTimeout):
+                    return {"passed": False, "feedback": "Judge did not answer before the deadline.", "timed_out": True}
+        tracker.record(time.perf_counter() - started)
+        with self._stats_lock:
+            self.hedge_stats["calls"] += 1
+            self.hedge_stats["hedged"] += int(hedged)
+        self._add_usage(result)
+        record_call(raw_estimate, getattr(result, "usage_metadata", None))
+        verdict = self.parser.parse(result)
+        if not isinstance(verdict, dict):
+            return {"passed": False, "feedback": "Failed to parse judge output."}
+        return verdict
+
+    def _add_usage(self, message) -> None:
+        """Accumulate token usage reported on an AIMessage (or a plain usage dict)."""
+        usage = message if isinstance(message, dict) else getattr(message, "usage_metadata", None) or {}
+        if cached_tokens(usage):
+            usage = {**usage, "cached_input_tokens": cached_tokens(usage)}
+        totals = getattr(self._local, "usage", None)
+        if totals is None:
+            totals = self._local.usage = {"input_tokens": 0, "output_tokens": 0}
+        for key in USAGE_KEYS:
+            if usage.get(key):
+                totals[key] = totals.get(key, 0) + usage[key]
+
+    def _evaluate_cascade(self, post: str) -> Dict[str, Any]:
+        """Ask the cascade model first and escalate to the strong model when needed."""
+        verdict = self._judge(self.cascade_llm, self.cascade_prompt, post)
+        try:
+            confidence = float(verdict.pop("confidence", 0.0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+
+        low_confidence = confidence < Config.JUDGE_CASCADE_MIN_CONFIDENCE
+        high_stakes_pass = self.high_stakes and bool(verdict.get("passed", False))
+        escalate = low_confidence or high_stakes_pass
+
+        with self._stats_lock:
+            self.cascade_stats["calls"] += 1
+            self.cascade_stats["escalations"] += int(escalate)
+            self.cascade_stats["low_confidence"] += int(low_confidence)
+            self.cascade_stats["high_stakes_pass"] += int(high_stakes_pass and not low_confidence)
+
+        if escalate:
+            return self._decide(post)
+        return verdict
+
+    def _decide(self, post: str) -> Dict[str, Any]:
+        """Final verdict from the strong model: one call, or a vote when voting is on."""
+        if self.vote_llm is not None:
+            return self._vote(post)
+        return self._judge(self.llm, self.prompt, post)
+
+    def _vote(self, post: str) -> Dict[str, Any]:
+        """
+        Majority vote over concurrent samples, stopping as soon as it is decided.
+        
+        Only as many samples as could still settle the vote are in flight: with
+        max_votes=3 two samples start together and a third is only requested if
+        they disagree. Timed-out samples do not vote and a tie fails.
+        
+        Returns:
+            Verdict of the first sample on the winning side, plus ``votes`` (samples
+            taken) and ``agreement`` (fraction of votes for the outcome)
+        """
+        majority = self.max_votes // 2 + 1
+        verdicts: List[Dict[str, Any]] = []
+        counts = {True: 0, False: 0}
+        taken = 0
+        
+        with ThreadPoolExecutor(max_workers=majority) as executor:
+            while max(counts.values()) < majority and taken < self.max_votes:
+                wanted = min(majority - max(counts.values()), self.max_votes - taken)
+                futures = [
+                    executor.submit(contextvars.copy_context().run, self._sample, post)
+                    for _ in range(wanted)
+                ]
+                taken += wanted
+                for future in as_completed(futures):
+                    verdict, usage = future.result()
+                    self._add_usage(usage)
+                    verdicts.append(verdict)
+                    if not verdict.get("timed_out"):
+                        counts[bool(verdict.get("passed", False))] += 1
+        
+        votes = counts[True] + counts[False]
+        passed = counts[True] > counts[False]
+        winners = [v for v in verdicts if not v.get("timed_out") and bool(v.get("passed", False)) == passed]
+        result = dict(winners[0] if winners else verdicts[0])
+        result["passed"] = passed
+        result["votes"] = taken
+        result["agreement"] = round(counts[passed] / votes, 3) if votes else 0.0
+        
+        with self._stats_lock:
+            self.vote_stats["evaluations"] += 1
+            self.vote_stats["samples"] += taken
+            self.vote_stats["early_stops"] += int(taken < self.max_votes)
+            self.vote_stats["split"] += int(0 < counts[True] and 0 < counts[False])
+        return result
+
+    def _sample(self, post: str) -> Tuple[Dict[str, Any], Any]:
+        """One voting sample, run in a worker thread; returns the verdict and its token usage."""
+        self._local.usage = {"input_tokens": 0, "output_tokens": 0}
+        verdict = self._judge(self.vote_llm, self.prompt, post)
+        return verdict, self._local.usage
+
 
 class CorporateJargonJudgeEvaluator(LLMJudgeBase):
     """Judge that flags corporate jargon and marketing-speak in a post."""
 
+    category = "jargon"
+
+    # One missed buzzword fails the post, so cheap "passed" verdicts are re-checked
+    high_stakes = True
+
     def _create_prompt(self) -> ChatPromptTemplate:
-        return ChatPromptTemplate.from_template(
+        return get_judge_prompt(
             """
             You are an evaluator that detects corporate jargon and sterile marketing-speak in LinkedIn posts.
 
-            Task: Given the post below, detect phrases that sound like corporate jargon or vague buzzwords
+            Task: Given the post in the next message, detect phrases that sound like corporate jargon or vague buzzwords
             (e.g., "leverage synergies", "maximize alignment", "drive impact at scale", "unlock value", "solutioning",
             "utilize", "robust framework", "best-in-class", "mission-critical", "stakeholder alignment", etc.).
 
@@ -78,9 +439,6 @@ class CorporateJargonJudgeEvaluator(LLMJudgeBase):
             - Extract up to 10 suspicious phrases with a short explanation each.
             - Keep feedback concise and actionable.
 
-            Post:
-            {post}
-
             Return strict JSON with:
             - passed: boolean
             - phrases: array of strings (suspicious phrases found, empty if none)
@@ -92,8 +450,10 @@ class CorporateJargonJudgeEvaluator(LLMJudgeBase):
 class StyleEvaluator(LLMJudgeBase):
     """Specialized evaluator for detecting style complexity and over-explanation issues."""
 
+    category = "style"
+
     def _create_prompt(self) -> ChatPromptTemplate:
-        return ChatPromptTemplate.from_template(
+        return get_judge_prompt(
             """
             You are a LinkedIn post style evaluator focused on detecting complexity and over-explanation.
             
@@ -129,8 +489,7 @@ class StyleEvaluator(LLMJudgeBase):
             - Share a quick personal thought or reflection instead of a long essay
             - Trust the reader to connect the dots (don't spell out every lesson)
 
-            Post to evaluate:
-            {post}
+            The post to evaluate is in the next message.
 
             Return strict JSON with:
             - passed: boolean (true if post is simple and direct, false if too complex)
@@ -145,11 +504,13 @@ class StyleEvaluator(LLMJudgeBase):
 class LLMJudgeEvaluator(LLMJudgeBase):
     """General-purpose judge (broader criteria). Kept for completeness."""
 
+    category = "quality"
+
     def _create_prompt(self) -> ChatPromptTemplate:
-        return ChatPromptTemplate.from_template(
+        return get_judge_prompt(
             """
             You are a LinkedIn post evaluator.
-            Evaluate the following post strictly according to these criteria:
+            Evaluate the post in the next message strictly according to these criteria:
 
             🎭 Tone & Voice
             - Friendly but not forced (human talking to a peer, not a press release)
@@ -179,9 +540,6 @@ class LLMJudgeEvaluator(LLMJudgeBase):
             - Avoid preachy/lecturing tone
             - Avoid forced/over-engineered analogies
 
-            Post:
-            {post}
-
             Return strict JSON with:
             - passed: boolean (true if post meets most criteria, false otherwise)
             - feedback: short explanation of any issues found
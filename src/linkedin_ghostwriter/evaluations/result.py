@@ -0,0 +1,177 @@
+"""Compact, typed evaluation results.
+
+Evaluators return free-form dicts. At batch scale those dicts, with the
+same string keys repeated in every one of them, dominate memory and
+serialization time, so the ghostwriter, the run history store and ``score``
+convert them with ``EvaluationResult.from_dict``. ``EvaluationResult`` stores the common fields
+in slots and everything evaluator-specific in a ``metrics`` dict, while still
+reading like the dict (``result["passed"]``, ``result.get(...)``,
+``dict(result)``). ``encode_result``/``encode_results`` serialize results as
+positional rows instead of repeating the keys.
+"""
+
+import json
+from collections.abc import MutableMapping
+from itertools import starmap
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+# Optional slot fields in dict-view order; None means the key is absent
+_OPTIONAL_FIELDS = ("failures", "phrases", "feedback", "evaluator_type", "judge", "timing")
+_FIELDS = frozenset(("passed",) + _OPTIONAL_FIELDS)
+
+
+class EvaluationResult(MutableMapping):
+    """
+    Result of one evaluation.
+
+    Attributes:
+        passed: Whether the post passed the check
+        failures: Failed categories reported by the evaluator
+        phrases: Offending phrases found in the post
+        feedback: Short explanation for the writer
+        metrics: Evaluator-specific values (dash_count, confidence, votes, ...)
+        evaluator_type: Type of the evaluator that produced the result
+        judge: Name of the evaluator that produced the result
+        timing: Seconds the evaluation took
+    """
+
+    __slots__ = ("passed", "failures", "phrases", "feedback", "metrics", "evaluator_type", "judge", "timing")
+
+    def __init__(
+        self,
+        passed: bool,
+        failures: Optional[List[str]] = None,
+        phrases: Optional[List[str]] = None,
+        feedback: Optional[str] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+        evaluator_type: Optional[str] = None,
+        judge: Optional[str] = None,
+        timing: Optional[float] = None,
+    ):
+        self.passed = passed
+        self.failures = failures
+        self.phrases = phrases
+        self.feedback = feedback
+        self.metrics = metrics
+        self.evaluator_type = evaluator_type
+        self.judge = judge
+        self.timing = timing
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "EvaluationResult":
+        """Build a result from a legacy result dict (unknown keys become metrics)."""
+        if isinstance(data, cls):
+            return data
+        metrics = {key: value for key, value in data.items() if key not in _FIELDS}
+        return cls(
+            bool(data.get("passed", False)),
+            data.get("failures"),
+            data.get("phrases"),
+            data.get("feedback"),
+            metrics or None,
+            data.get("evaluator_type"),
+            data.get("judge"),
+            data.get("timing"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with the same keys as the dict view."""
+        return dict(self.items())
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Serialize as a JSON object (same shape as the legacy dict)."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    # Dict view
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if self.metrics is None:
+            raise KeyError(key)
+        return self.metrics[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELDS:
+            setattr(self, key, value)
+        elif self.metrics is None:
+            self.metrics = {key: value}
+        else:
+            self.metrics[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key == "passed":
+            raise KeyError("'passed' cannot be removed")
+        if key in _FIELDS:
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+        elif self.metrics is None:
+            raise KeyError(key)
+        else:
+            del self.metrics[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield "passed"
+        for key in _OPTIONAL_FIELDS[:3]:
+            if getattr(self, key) is not None:
+                yield key
+        if self.metrics:
+            yield from self.metrics
+        for key in _OPTIONAL_FIELDS[3:]:
+            if getattr(self, key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELDS:
+            return key == "passed" or getattr(self, key) is not None
+        return self.metrics is not None and key in self.metrics
+
+    def __repr__(self) -> str:
+        return f"EvaluationResult({self.to_dict()!r})"
+
+
+_row = attrgetter(*EvaluationResult.__slots__)
+
+
+def encode_result(result: Mapping[str, Any]) -> str:
+    """Serialize one result as a positional JSON row (the field order of ``EvaluationResult.__slots__``)."""
+    return json.dumps(_row(EvaluationResult.from_dict(result)), ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def decode_result(text: str) -> EvaluationResult:
+    """Inverse of encode_result(); also reads results stored as JSON objects."""
+    data = json.loads(text)
+    if isinstance(data, dict):
+        return EvaluationResult.from_dict(data)
+    return EvaluationResult(*data)
+
+
+def encode_results(results: Iterable[Mapping[str, Any]], ids: Optional[Sequence[Any]] = None) -> str:
+    """
+    Serialize many results as one JSON object of positional rows.
+
+    Keys are written once (in a header) instead of once per result, which makes
+    the output about a quarter smaller than a list of dicts. ``ids``, if given,
+    are written alongside the rows (``decode_results`` ignores them).
+    """
+    payload: Dict[str, Any] = {"fields": EvaluationResult.__slots__}
+    if ids is not None:
+        payload["ids"] = list(ids)
+    payload["rows"] = [_row(EvaluationResult.from_dict(result)) for result in results]
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def decode_results(text: str) -> List[EvaluationResult]:
+    """Inverse of encode_results()."""
+    payload = json.loads(text)
+    if tuple(payload.get("fields", ())) != EvaluationResult.__slots__:
+        raise ValueError("Encoded results were written with a different field layout")
+    return list(starmap(EvaluationResult, payload["rows"]))
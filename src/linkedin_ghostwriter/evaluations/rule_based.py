@@ -6,12 +6,86 @@ from .base import BaseEvaluator
 from ..core.config import Config
 
 
+# Dashes used as punctuation: em dashes, and hyphens with spaces on both sides
+_PUNCTUATION_DASH = re.compile(r"[ \t]*(?:—|(?<=[ \t])-(?=[ \t]))[ \t]*")
+
+# Corporate jargon and the plain words that replace it
+JARGON_LEXICON: Dict[str, str] = {
+    "actionable insights": "practical lessons",
+    "at the end of the day": "ultimately",
+    "best-in-class": "excellent",
+    "circle back": "follow up",
+    "deep dive": "close look",
+    "drive impact": "make a difference",
+    "game changer": "big step forward",
+    "game-changer": "big step forward",
+    "going forward": "from now on",
+    "ideate": "brainstorm",
+    "ideation": "brainstorming",
+    "leverage": "use",
+    "leveraged": "used",
+    "leverages": "uses",
+    "leveraging": "using",
+    "low-hanging fruit": "easy wins",
+    "move the needle": "make a real difference",
+    "operationalize": "put into practice",
+    "paradigm shift": "big change",
+    "solutioning": "problem solving",
+    "synergies": "shared strengths",
+    "synergy": "teamwork",
+    "thought leadership": "expertise",
+    "touch base": "check in",
+    "unlock value": "create value",
+    "utilize": "use",
+    "utilized": "used",
+    "utilizes": "uses",
+    "utilizing": "using",
+    "value-add": "benefit",
+}
+
+
+def _indefinite_article(phrase: str) -> str:
+    """"a" or "an" for a plain-words replacement (a leading "u" as in "use" takes "a")."""
+    word = phrase.lower()
+    return "an" if word[:1] in "aeio" or (word[:1] == "u" and not word.startswith("us")) else "a"
+
+
+def _match_case(plain: str, term: str) -> str:
+    """Give the replacement the capitalisation of the matched term: UPPER, Title Case or a leading capital."""
+    if term.isupper() and len(term) > 1:
+        return plain.upper()
+    words = term.split()
+    if len(words) > 1 and all(word[0].isupper() for word in words):
+        return " ".join(word[0].upper() + word[1:] for word in plain.split())
+    return plain[0].upper() + plain[1:] if term[0].isupper() else plain
+
+
+def _replace_dash(match: "re.Match[str]") -> str:
+    """Comma (or period before a capitalised word) for a dash; list bullets and number ranges are kept."""
+    text = match.string
+    start, end = match.span()
+    if not text[text.rfind("\n", 0, start) + 1:start].strip():
+        return match.group()
+    following = text[end:end + 1]
+    if start and text[start - 1].isdigit() and following.isdigit():
+        # "2020 - 2021" is a range, and "2020, 2021" would mean something else
+        return match.group()
+    if not following or following == "\n":
+        return ""
+    if text[start - 1] in ",.;:!?(":
+        return " "
+    return ". " if following.isupper() else ", "
+
+
 class DashCountEvaluator(BaseEvaluator):
     """Evaluator that checks for excessive use of dashes in posts."""
     
+    evaluator_type = "rule_based"
+    category = "dashes"
+    
     def __init__(self, max_allowed: Optional[int] = None):
         """Initialize the evaluator with maximum allowed dashes."""
-        self.max_allowed = max_allowed or Config.MAX_DASHES_ALLOWED
+        self.max_allowed = Config.MAX_DASHES_ALLOWED if max_allowed is None else max_allowed
     
     def evaluate(self, post: str) -> Dict[str, Any]:
         """
@@ -29,9 +103,81 @@ class DashCountEvaluator(BaseEvaluator):
         matches = re.findall(r'(?<!^)\s*[-—]\s*', post)
         dash_count = len(matches)
         
-        return {
-            "passed": dash_count <= self.max_allowed,
+        passed = dash_count <= self.max_allowed
+        result = {
+            "passed": passed,
             "dash_count": dash_count,
             "max_allowed": self.max_allowed,
-            "evaluator_type": "rule_based"
+            "evaluator_type": self.evaluator_type
         }
+        if not passed:
+            result["feedback"] = (
+                f"Found {dash_count} dashes; use at most {self.max_allowed}. "
+                "Use commas or periods instead."
+            )
+        return result
+    
+    def fix(self, post: str) -> Optional[str]:
+        """
+        Replace dashes used as punctuation with commas, or periods before a capitalised word.
+        
+        Hyphenated words and list bullets are left alone, so a post that fails
+        because of those is not fixable here.
+        """
+        fixed = _PUNCTUATION_DASH.sub(_replace_dash, post)
+        return fixed if fixed != post else None
+
+
+class JargonLexiconEvaluator(BaseEvaluator):
+    """Evaluator that flags corporate jargon from a fixed lexicon."""
+    
+    evaluator_type = "rule_based"
+    category = "jargon"
+    
+    def __init__(self, lexicon: Optional[Dict[str, str]] = None):
+        """Initialize with a jargon -> plain words mapping (defaults to JARGON_LEXICON)."""
+        self.lexicon = {term.lower(): plain for term, plain in (lexicon or JARGON_LEXICON).items()}
+        # Longest terms first so that "game-changer" wins over shorter overlapping terms
+        terms = sorted(self.lexicon, key=len, reverse=True)
+        # A preceding "a"/"an" is part of the match so that fix() can keep it in agreement
+        self._pattern = re.compile(
+            r"\b(?:(?P<article>an?)(?P<space>\s+))?(?P<term>"
+            + "|".join(re.escape(term).replace(r"\ ", r"\s+") for term in terms)
+            + r")\b",
+            re.IGNORECASE,
+        )
+    
+    def evaluate(self, post: str) -> Dict[str, Any]:
+        """
+        Find lexicon terms in the post.
+        
+        Args:
+            post: The post text to evaluate
+        
+        Returns:
+            Dictionary with evaluation results and the jargon found as phrases
+        """
+        found = [match.group("term") for match in self._pattern.finditer(post)]
+        result = {"passed": not found, "jargon_count": len(found), "evaluator_type": self.evaluator_type}
+        if found:
+            result["phrases"] = list(dict.fromkeys(found))
+            result["feedback"] = f"Found {len(found)} jargon terms. Use plain words instead."
+        return result
+    
+    def fix(self, post: str) -> Optional[str]:
+        """Swap every lexicon term for its plain alternative, keeping its capitalisation and a/an agreement."""
+        fixed = self._pattern.sub(self._plain, post)
+        return fixed if fixed != post else None
+    
+    def _plain(self, match: "re.Match[str]") -> str:
+        term = match.group("term")
+        plain = _match_case(self.lexicon[" ".join(term.lower().split())], term)
+        article = match.group("article")
+        if article is None:
+            return plain
+        agreed = _indefinite_article(plain)
+        if article.isupper() and term.isupper():
+            agreed = agreed.upper()
+        elif article[0].isupper():
+            agreed = agreed.capitalize()
+        return agreed + match.group("space") + plain
@@ -1,23 +1,115 @@
 """Prompt templates for LinkedIn Ghostwriter."""
 
+from textwrap import dedent
+from typing import List, Optional
 
-def get_base_prompt() -> str:
-    """Get the base prompt for LinkedIn post generation."""
-    return """
-        You are my writing assistant. Write posts that sound like me. 
-        Forget polish, forget “LinkedIn voice.” Write the way I’d talk: plain, direct, anecdotal. 
-        It’s fine if it’s slightly messy, with quick jumps between story, analogy, and reflection. 
-        Don’t force a structure or a moral—let the point come out naturally through the story. 
-        Keep it human, simple, and a bit raw.  
+from langchain.prompts import ChatPromptTemplate
+from langchain_core.messages import SystemMessage
 
-        Here’s an example of my style:
-        "The other day, my 2.5 yo was riding his bike. He was tired already and complained when he found a hill: 'But bike doesn't want to move as fast... I want to go faster.'  
+
+DEFAULT_STYLE_EXAMPLE = """The other day, my 2.5 yo was riding his bike. He was tired already and complained when he found a hill: 'But bike doesn't want to move as fast... I want to go faster.'  
         I tried my best to explain to him what gravity is and why it’s harder to go uphill.  
         He paused for a moment, then looked at me with complete seriousness: 'Can you just take away gravity?'  
         I laughed, but the question stuck with me.  
         We complain about things that are fundamental facts of life—things we can’t change no matter how hard we try. Days don’t have enough hours. Mondays exist. Taxes. You get the point... I’ve seen this also in every project I’ve worked on.  
-        The next time you see someone stuck with a 'gravity problem', maybe you’ll remember this analogy ;)"
+        The next time you see someone stuck with a 'gravity problem', maybe you’ll remember this analogy ;)"""
+
+
+DEFAULT_INSTRUCTIONS = """You are my writing assistant. Write posts that sound like me. 
+        Forget polish, forget “LinkedIn voice.” Write the way I’d talk: plain, direct, anecdotal. 
+        It’s fine if it’s slightly messy, with quick jumps between story, analogy, and reflection. 
+        Don’t force a structure or a moral—let the point come out naturally through the story. 
+        Keep it human, simple, and a bit raw.  """
+
+
+def get_system_prompt(examples: Optional[List[str]] = None, instructions: Optional[str] = None) -> str:
+    """
+    Get the static system message for LinkedIn post generation.
+    
+    It is sent verbatim (not as a template) and never contains per-call text,
+    so every generation for the same writer starts with the same bytes and
+    providers can serve it from their prompt cache.
+    
+    Args:
+        examples: Past posts to show as style examples (defaults to one built-in example)
+        instructions: Voice and style instructions (defaults to the built-in ones)
+    """
+    instructions = instructions.strip() if instructions else DEFAULT_INSTRUCTIONS
+    if examples:
+        quoted = [f'"{example}"' for example in examples]
+        style_block = "Here are some of my past posts, to show my style:\n\n" + "\n\n".join(quoted)
+    else:
+        style_block = f'Here’s an example of my style:\n        "{DEFAULT_STYLE_EXAMPLE}"'
+    return f"{instructions}\n\n{style_block}\n\nYou will get my raw notes in the next message."
+
+
+def get_generation_prompt(system_prompt: str, examples: Optional[List[str]] = None) -> ChatPromptTemplate:
+    """
+    Get the generation prompt: the static system message, then the raw notes.
+    
+    Args:
+        system_prompt: Output of get_system_prompt()
+        examples: Past posts relevant to these notes, shown after the static prefix
+    """
+    notes = "Raw notes:\n{raw_notes}"
+    if examples:
+        # Examples are literal text inside a prompt template
+        quoted = [f'"{example.replace("{", "{{").replace("}", "}}")}"' for example in examples]
+        notes = "Past posts of mine on similar topics:\n\n" + "\n\n".join(quoted) + "\n\n" + notes
+    return ChatPromptTemplate.from_messages([SystemMessage(content=system_prompt), ("human", notes)])
+
+
+# Appended after the notes so that retries share the first attempt's prefix
+FEEDBACK_TEMPLATE = "Feedback from previous attempt:\n{feedback}"
+
+
+def get_judge_prompt(criteria: str) -> ChatPromptTemplate:
+    """
+    Get a judge prompt: the criteria and output format as a static system message, then the post.
+    
+    Cascade and batch instructions are appended after the post, so all of a
+    judge's requests share the same prefix.
+    """
+    return ChatPromptTemplate.from_messages([SystemMessage(content=dedent(criteria).strip()), ("human", "Post:\n{post}")])
+
+
+def get_notes_map_prompt() -> ChatPromptTemplate:
+    """
+    Get the prompt that condenses one chunk of long raw notes.
+    
+    The instructions are a static system message, so every chunk of every
+    notes file shares the same prefix; the chunk and its position come after it.
+    """
+    instructions = """
+        You are helping me prepare material for a short LinkedIn post.
+        In the next message you will get one part of my raw notes (it may be a meeting transcript or a long document).
+
+        Condense it into short bullet points. Keep:
+        - concrete stories, anecdotes and quotes (word for word if short)
+        - numbers, names of tools/projects and surprising details
+        - my own opinions and takeaways
+        Drop small talk, repetition and anything procedural.
+        """
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=dedent(instructions).strip()),
+        ("human", "Notes (part {index} of {total}):\n{chunk}"),
+    ])
+
 
-        Raw notes:
-        {raw_notes}
+def get_notes_reduce_prompt(max_words: int) -> ChatPromptTemplate:
+    """
+    Get the prompt that merges condensed chunks into a single brief.
+    
+    Args:
+        max_words: Word limit of the brief (fixed per preprocessor, so it stays in the static prefix)
+    """
+    instructions = f"""
+        In the next message you will get condensed bullet points from consecutive parts of my raw notes.
+        Merge them into one compact brief for writing a LinkedIn post, in under {max_words} words.
+        Keep the strongest personal story, concrete details and quotes, and my own takeaways.
+        Remove duplicates. Do not write the post itself.
         """
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=dedent(instructions).strip()),
+        ("human", "Condensed notes:\n{summaries}"),
+    ])
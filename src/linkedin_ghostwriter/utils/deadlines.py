@@ -0,0 +1,169 @@
+"""Deadlines and hedged requests for LLM calls.
+
+Calls that need a deadline or hedging run on a single background event loop
+(so async HTTP clients stay bound to one loop), which lets an overdue or
+losing request be cancelled for real instead of being left running.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Iterator, Optional, Tuple
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when an LLM call or a whole post runs out of time."""
+
+
+class StageTimeout(DeadlineExceeded):
+    """Raised when one call runs past its own stage timeout while the post deadline still has time."""
+
+
+_deadline: "contextvars.ContextVar[Optional[float]]" = contextvars.ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Bound every call made inside the block by an overall time budget (None/0 = no limit)."""
+    if not seconds or seconds <= 0:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left() -> Optional[float]:
+    """Seconds left before the enclosing deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def stage_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    Effective timeout for one call: the stage timeout capped by the enclosing deadline.
+
+    Raises:
+        DeadlineExceeded: if the enclosing deadline has already passed
+    """
+    left = time_left()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Deadline reached before the call started")
+    limits = [t for t in (timeout if timeout and timeout > 0 else None, left) if t is not None]
+    return min(limits) if limits else None
+
+
+class LatencyTracker:
+    """Rolling window of call latencies with percentile lookups (thread-safe)."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add an observed latency."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency at percentile p (0-1), or None until min_samples have been seen."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Start (once) and return the event loop that runs deadline-bound calls."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-deadline-loop", daemon=True).start()
+        return _loop
+
+
+def call_with_deadline(
+    runnable: Any,
+    inputs: Any,
+    timeout: Optional[float] = None,
+    hedge_after: Optional[float] = None,
+) -> Tuple[Any, bool]:
+    """
+    Invoke a runnable with an optional timeout and an optional hedged duplicate.
+
+    If the call has not answered after ``hedge_after`` seconds, an identical
+    request is fired; whichever answers first wins and the other is cancelled.
+
+    Args:
+        runnable: LangChain runnable (prompt | llm chain)
+        inputs: Inputs passed to invoke/ainvoke
+        timeout: Seconds before DeadlineExceeded is raised (None = no limit)
+        hedge_after: Seconds before a duplicate request is fired (None = never)
+
+    Returns:
+        Tuple of (result, hedged) where hedged tells whether a duplicate was fired
+
+    Raises:
+        StageTimeout: if only the stage timeout ran out (the enclosing deadline
+            has time left, or there is none)
+        DeadlineExceeded: if the enclosing deadline ran out
+    """
+    if timeout is None and hedge_after is None:
+        return runnable.invoke(inputs), False
+    future = asyncio.run_coroutine_threadsafe(
+        _race(runnable, inputs, timeout, hedge_after), _background_loop()
+    )
+    try:
+        return future.result()
+    except DeadlineExceeded as e:
+        left = time_left()
+        if left is None or left > 0:
+            raise StageTimeout(str(e)) from e
+        raise
+
+
+async def _race(
+    runnable: Any, inputs: Any, timeout: Optional[float], hedge_after: Optional[float]
+) -> Tuple[Any, bool]:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = None if timeout is None else started + timeout
+    hedge_at = None if hedge_after is None else started + hedge_after
+    tasks = {asyncio.ensure_future(runnable.ainvoke(inputs))}
+    hedged = False
+    error: Optional[BaseException] = None
+    try:
+        while tasks:
+            waits = [t - loop.time() for t in (deadline, None if hedged else hedge_at) if t is not None]
+            wait = max(0.0, min(waits)) if waits else None
+            done, tasks = await asyncio.wait(tasks, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), hedged
+                error = task.exception()
+            if deadline is not None and loop.time() >= deadline:
+                raise DeadlineExceeded(f"No answer within {timeout:.1f}s")
+            if tasks and not hedged and hedge_at is not None and loop.time() >= hedge_at:
+                tasks.add(asyncio.ensure_future(runnable.ainvoke(inputs)))
+                hedged = True
+        raise error if error is not None else DeadlineExceeded("Call finished without a result")
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -1,8 +1,11 @@
 """Helper utility functions for LinkedIn Ghostwriter."""
 
+import hashlib
 import re
 from typing import List, Dict, Any
 
+from .tokens import estimator
+
 
 def clean_text(text: str) -> str:
     """Clean and normalize text input."""
@@ -22,6 +25,11 @@ def count_words(text: str) -> int:
     return len(text.split())
 
 
+def estimate_tokens(text: str) -> int:
+    """Offline token estimate for budgeting (see utils.tokens)."""
+    return estimator.estimate(text)
+
+
 def format_post_stats(post: str) -> Dict[str, Any]:
     """Get statistics about a LinkedIn post."""
     return {
@@ -30,3 +38,41 @@ def format_post_stats(post: str) -> Dict[str, Any]:
         "hashtag_count": len(extract_hashtags(post)),
         "line_count": len(post.splitlines())
     }
+
+
+def hash_text(text: str) -> str:
+    """Stable hex digest used to key notes in caches and the run history."""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def split_into_chunks(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most max_chars characters.
+    
+    Paragraph boundaries are preferred, then sentence boundaries; a single
+    sentence longer than max_chars is hard-split.
+    """
+    pieces: List[str] = []
+    for paragraph in re.split(r'\n\s*\n', text.strip()):
+        paragraph = paragraph.strip()
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            while len(sentence) > max_chars:
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            pieces.append(sentence)
+    
+    chunks: List[str] = []
+    current = ""
+    for piece in filter(None, pieces):
+        candidate = f"{current}\n\n{piece}" if current else piece
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
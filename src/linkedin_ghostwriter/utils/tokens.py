@@ -0,0 +1,240 @@
+"""Offline token estimation and token budgets.
+
+Provider tokenizers need a vocabulary download, so sizes are estimated with a
+heuristic that mirrors how BPE tokenizers split text: short words cost one
+token, long words, digits, punctuation and non-ASCII text cost more. The
+estimate is multiplied by a scale that is calibrated against the token counts
+providers report, online after every call and offline from the run history.
+
+Budgets follow the deadline pattern: ``token_budget_scope`` bounds every call
+made inside it by a shared per-post token budget. ``cache_stats`` counts how
+many input tokens providers served from their prompt cache.
+"""
+
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
+
+from ..core.config import Config
+
+
+class TokenBudgetExceeded(ValueError):
+    """Raised when a call does not fit the per-call or per-post token budget."""
+
+
+# Chat formats add a few tokens per message and to prime the reply
+MESSAGE_OVERHEAD = 4
+REPLY_OVERHEAD = 3
+
+_PIECES = re.compile(r"[A-Za-z]+|\d{1,3}|\n+|[^\W\d_]+|[^\w\s]+|\s+")
+
+
+def count_tokens(text: str) -> int:
+    """Uncalibrated token estimate for text."""
+    if not text:
+        return 0
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        first = piece[0]
+        if first.isspace():
+            # Single spaces merge into the next word; line breaks are tokens
+            tokens += first == "\n"
+        elif first.isascii():
+            length = len(piece)
+            if first.isalpha():
+                tokens += 1 if length <= 10 else (length + 7) // 8
+            elif first.isdigit():
+                tokens += 1
+            else:
+                tokens += (length + 2) // 3
+        elif first.isalpha():
+            tokens += (len(piece.encode("utf-8")) + 3) // 4
+        else:
+            tokens += (len(piece.encode("utf-8")) + 2) // 3
+    return max(1, tokens)
+
+
+class TokenEstimator:
+    """Calibrated token estimator (thread-safe)."""
+
+    # Weight of each observed call in the running scale
+    LEARNING_RATE = 0.1
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+        self.observations = 0
+        self._lock = threading.Lock()
+
+    def estimate(self, text: str) -> int:
+        """Estimated tokens in text."""
+        raw = count_tokens(text)
+        return int(raw * self.scale + 0.5) if raw else 0
+
+    def estimate_messages(self, messages: Sequence[Any]) -> int:
+        """Estimated input tokens of a chat request (messages or plain strings)."""
+        return int(self.estimate_raw_messages(messages) * self.scale + 0.5)
+
+    @staticmethod
+    def estimate_raw_messages(messages: Sequence[Any]) -> int:
+        """Uncalibrated input tokens of a chat request."""
+        total = REPLY_OVERHEAD
+        for message in messages:
+            content = getattr(message, "content", message)
+            total += MESSAGE_OVERHEAD + count_tokens(content if isinstance(content, str) else str(content))
+        return total
+
+    def observe(self, raw_estimate: int, actual: int) -> None:
+        """Move the scale towards the ratio seen on a call the provider counted."""
+        if raw_estimate <= 0 or actual <= 0:
+            return
+        ratio = min(4.0, max(0.25, actual / raw_estimate))
+        with self._lock:
+            self.scale += self.LEARNING_RATE * (ratio - self.scale)
+            self.observations += 1
+
+    def trim(self, text: str, max_tokens: int, marker: str = " [...]") -> str:
+        """Cut text at a word boundary so that it fits max_tokens (marker included)."""
+        if self.estimate(text) <= max_tokens:
+            return text
+        if max_tokens <= self.estimate(marker):
+            return ""
+        cut = int(len(text) * max_tokens / self.estimate(text))
+        while cut > 0:
+            head = text[:cut]
+            space = head.rfind(" ")
+            if space > cut // 2:
+                head = head[:space]
+            head = head.rstrip() + marker
+            if self.estimate(head) <= max_tokens:
+                return head
+            cut = int(cut * 0.9)
+        return ""
+
+
+def fit_scale(samples: Iterable[Tuple[str, int]]) -> Tuple[float, float, float]:
+    """
+    Fit the estimator scale to texts with known token counts.
+
+    Returns:
+        Tuple of (scale, mean absolute error before, mean absolute error after),
+        errors as fractions of the actual counts
+    """
+    pairs = [(count_tokens(text), actual) for text, actual in samples if text and actual > 0]
+    if not pairs:
+        return 1.0, 0.0, 0.0
+    scale = sum(actual for _, actual in pairs) / sum(raw for raw, _ in pairs)
+    before = sum(abs(raw - actual) / actual for raw, actual in pairs) / len(pairs)
+    after = sum(abs(raw * scale - actual) / actual for raw, actual in pairs) / len(pairs)
+    return scale, before, after
+
+
+estimator = TokenEstimator(Config.TOKEN_ESTIMATE_SCALE)
+
+
+def cached_tokens(usage: Optional[Mapping[str, Any]]) -> int:
+    """Input tokens a provider read from its prompt cache, from LangChain usage metadata."""
+    details = (usage or {}).get("input_token_details") or {}
+    return int(details.get("cache_read", 0) or 0)
+
+
+class PromptCacheStats:
+    """Running count of input tokens served from provider prompt caches (thread-safe)."""
+
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, usage: Optional[Mapping[str, Any]]) -> None:
+        input_tokens = int((usage or {}).get("input_tokens", 0) or 0)
+        if not input_tokens:
+            return
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.cached_tokens += cached_tokens(usage)
+
+    def report(self) -> Dict[str, Any]:
+        """Calls, input and cached tokens, and the fraction of input tokens that were cached."""
+        with self._lock:
+            calls, input_tokens, cached = self.calls, self.input_tokens, self.cached_tokens
+        return {
+            "calls": calls,
+            "input_tokens": input_tokens,
+            "cached_tokens": cached,
+            "hit_rate": cached / input_tokens if input_tokens else 0.0,
+        }
+
+
+cache_stats = PromptCacheStats()
+
+
+class TokenBudget:
+    """Token allowance shared by every call made for one post (thread-safe)."""
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return self.tokens - self.used
+
+    def check(self, tokens: int) -> None:
+        """Raise if a call needing this many tokens no longer fits."""
+        if tokens > self.remaining:
+            raise TokenBudgetExceeded(
+                f"Call needs ~{tokens} tokens but only {max(0, self.remaining)} of {self.tokens} are left"
+            )
+
+    def charge(self, tokens: int) -> None:
+        with self._lock:
+            self.used += tokens
+
+
+_budget: "ContextVar[Optional[TokenBudget]]" = ContextVar("token_budget", default=None)
+
+
+@contextmanager
+def token_budget_scope(tokens: Optional[int]) -> Iterator[Optional[TokenBudget]]:
+    """Bound every call made inside the block by a shared token budget (None/0 = no limit)."""
+    if not tokens or tokens <= 0:
+        yield None
+        return
+    budget = TokenBudget(tokens)
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def check_call(tokens: int, limit: Optional[int] = None) -> None:
+    """
+    Check an estimated request size against the per-call limit and the enclosing budget.
+
+    Raises:
+        TokenBudgetExceeded: if the request is too large for either
+    """
+    limit = Config.MAX_PROMPT_TOKENS if limit is None else limit
+    if limit and tokens > limit:
+        raise TokenBudgetExceeded(f"Prompt is ~{tokens} tokens, over the per-call limit of {limit}")
+    budget = _budget.get()
+    if budget is not None:
+        budget.check(tokens)
+
+
+def record_call(raw_estimate: int, usage: Optional[dict]) -> None:
+    """Charge a finished call to the enclosing budget, calibrate the estimator and count cache hits."""
+    usage = usage or {}
+    actual_input = int(usage.get("input_tokens", 0) or 0)
+    estimator.observe(raw_estimate, actual_input)
+    cache_stats.record(usage)
+    budget = _budget.get()
+    if budget is not None:
+        spent = actual_input or int(raw_estimate * estimator.scale + 0.5)
+        budget.charge(spent + int(usage.get("output_tokens", 0) or 0))
@@ -26,6 +26,20 @@ def sample_post():
     """
 
 
+@pytest.fixture
+def offline_config(monkeypatch):
+    """Config with a dummy API key so LLM clients can be built without network access."""
+    from linkedin_ghostwriter.core.config import Config
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "test-key")
+    return Config
+
+
+def fake_llm(*responses: str):
+    """Build a chat model that replies with the given responses in order (cycling)."""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    return FakeListChatModel(responses=list(responses))
+
+
 @pytest.fixture
 def sample_raw_notes():
     """Sample raw notes for testing."""
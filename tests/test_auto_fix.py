@@ -0,0 +1,111 @@
+"""Tests for deterministic local fixes of rule-based failures (offline)."""
+
+import threading
+
+import pytest
+from linkedin_ghostwriter import DashCountEvaluator, JargonLexiconEvaluator
+from linkedin_ghostwriter.core.config import Config
+from tests.test_pipelined_generation import ScriptedGhostwriter, StubEvaluator
+
+
+class TestDashFix:
+
+    def test_punctuation_dashes_become_commas_or_periods(self):
+        post = "We shipped it — and it broke - Then we fixed it.\n- a bullet stays\nA well-known fix —"
+        fixed = DashCountEvaluator(max_allowed=1).fix(post)
+
+        assert fixed == "We shipped it, and it broke. Then we fixed it.\n- a bullet stays\nA well-known fix"
+        # The bullet and the hyphenated word still count as dashes
+        assert DashCountEvaluator(max_allowed=1).evaluate(fixed)["dash_count"] == 2
+
+    def test_number_ranges_are_kept(self):
+        assert DashCountEvaluator().fix("From 2020 - 2021, and 9—5 daily.") is None
+        assert DashCountEvaluator().fix("From 2020 - 2021 we grew - a lot.") == "From 2020 - 2021 we grew, a lot."
+
+    def test_nothing_to_fix(self):
+        assert DashCountEvaluator().fix("A well-known, dash-free post.") is None
+
+    def test_zero_dashes_allowed_is_not_the_default(self, offline_config):
+        assert DashCountEvaluator(max_allowed=0).evaluate("One - dash.")["passed"] is False
+        assert DashCountEvaluator().max_allowed == offline_config.MAX_DASHES_ALLOWED
+
+
+class TestJargonLexicon:
+
+    def test_flags_and_replaces_jargon(self):
+        evaluator = JargonLexiconEvaluator()
+        post = "Leveraging synergies will move the\nneedle. Let's circle back."
+        result = evaluator.evaluate(post)
+
+        assert not result["passed"] and result["jargon_count"] == 4
+        assert result["phrases"] == ["Leveraging", "synergies", "move the\nneedle", "circle back"]
+        fixed = evaluator.fix(post)
+        assert fixed == "Using shared strengths will make a real difference. Let's follow up."
+        assert evaluator.evaluate(fixed)["passed"]
+
+    @pytest.mark.parametrize("post, expected", [
+        ("We held an ideation session.", "We held a brainstorming session."),
+        ("An ideation session helped.", "A brainstorming session helped."),
+        ("They built a best-in-class team.", "They built an excellent team."),
+        ("AN IDEATION SESSION", "A BRAINSTORMING SESSION"),
+    ])
+    def test_indefinite_article_agrees_with_the_replacement(self, post, expected):
+        assert JargonLexiconEvaluator().fix(post) == expected
+
+    @pytest.mark.parametrize("post, expected", [
+        ("Our Deep Dive on churn.", "Our Close Look on churn."),
+        ("DEEP DIVE: churn", "CLOSE LOOK: churn"),
+        ("Deep dive into churn.", "Close look into churn."),
+    ])
+    def test_capitalisation_of_every_word_is_kept(self, post, expected):
+        assert JargonLexiconEvaluator().fix(post) == expected
+
+    def test_custom_lexicon(self):
+        evaluator = JargonLexiconEvaluator({"North Star": "main goal"})
+        assert evaluator.fix("Our north star is growth.") == "Our main goal is growth."
+        assert evaluator.evaluate("Plain words only.")["passed"]
+
+
+class TestFixLoop:
+
+    def test_fixable_failure_does_not_regenerate(self, offline_config, caplog):
+        judge = StubEvaluator("JARGON")
+        ghostwriter = ScriptedGhostwriter([DashCountEvaluator(max_allowed=1), judge], ["One — two — three — four."])
+
+        with caplog.at_level("INFO", logger="linkedin_ghostwriter.core.ghostwriter"):
+            assert ghostwriter.generate_with_evaluation("notes", 3) == ("One, two, three, four.", 1, True)
+        assert "Fixed locally: DashCountEvaluator" in caplog.text
+        assert ghostwriter.calls == [""]
+        assert ghostwriter.fix_stats == {"attempts": 1, "resolved": 1}
+
+    @pytest.mark.parametrize("pipelined", [False, True])
+    def test_only_unfixable_failures_reach_the_feedback(self, offline_config, pipelined):
+        evaluators = [DashCountEvaluator(max_allowed=1), JargonLexiconEvaluator(), StubEvaluator("CLICHE")]
+        drafts = ["CLICHE: we leverage data — a lot — daily.", "A clean post."]
+        ghostwriter = ScriptedGhostwriter(evaluators, drafts)
+
+        assert ghostwriter.generate_with_evaluation("notes", 3, pipelined=pipelined) == ("A clean post.", 2, True)
+        assert ghostwriter.calls[1:] == [ghostwriter.calls[-1]] and "Found CLICHE." in ghostwriter.calls[-1]
+        assert not any("dash" in feedback or "jargon" in feedback for feedback in ghostwriter.calls)
+
+    def test_disabled(self, offline_config, monkeypatch):
+        monkeypatch.setattr(Config, "AUTO_FIX_ENABLED", False)
+        ghostwriter = ScriptedGhostwriter([DashCountEvaluator(max_allowed=1)], ["One — two — three.", "One."])
+
+        assert ghostwriter.generate_with_evaluation("notes", 3) == ("One.", 2, True)
+        assert ghostwriter.fix_stats["attempts"] == 0
+
+    def test_stats_are_exact_when_a_writer_is_shared(self, offline_config, capsys):
+        evaluator = DashCountEvaluator(max_allowed=1)
+        ghostwriter = ScriptedGhostwriter([evaluator], [])
+
+        def fix_many():
+            for _ in range(200):
+                ghostwriter._fix_draft("One — two — three.", [evaluator])
+
+        threads = [threading.Thread(target=fix_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert ghostwriter.fix_stats == {"attempts": 1600, "resolved": 1600}
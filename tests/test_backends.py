@@ -0,0 +1,83 @@
+"""Tests for the pluggable LLM backend layer (offline)."""
+
+import json
+
+import pytest
+from linkedin_ghostwriter import CorporateJargonJudgeEvaluator, LinkedInGhostwriter
+from linkedin_ghostwriter.backends import OpenAIBackend, StubBackend, get_backend
+from linkedin_ghostwriter.core.config import Config
+
+
+@pytest.fixture
+def stub_config(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_BACKEND", "stub")
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", None)
+    monkeypatch.setattr(Config, "HISTORY_DB_PATH", "")
+    return Config
+
+
+class TestBackendSelection:
+
+    def test_backend_follows_config(self, stub_config):
+        assert isinstance(get_backend("gpt-4o"), StubBackend)
+        assert Config.validate()
+
+    def test_explicit_name_overrides_config(self, offline_config):
+        backend = get_backend("gpt-4o-mini", name="openai")
+        assert isinstance(backend, OpenAIBackend)
+        assert backend.model_name == "gpt-4o-mini"
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown LLM backend"):
+            get_backend(name="carrier-pigeon")
+
+
+class TestStubBackend:
+
+    def test_answers_are_deterministic(self):
+        first, second = StubBackend(), StubBackend()
+        assert first.invoke("Write a post").content == second.invoke("Write a post").content
+        assert first.invoke("Write a post").content != first.invoke("Write another").content
+        assert first.invoke("hi").usage_metadata["total_tokens"] > 0
+
+    def test_stream_yields_the_answer(self):
+        backend = StubBackend(responses=["one answer"])
+        assert [chunk.content for chunk in backend.stream("hi")] == ["one answer"]
+
+    def test_judges_get_passing_verdicts(self, stub_config):
+        judge = CorporateJargonJudgeEvaluator()
+        assert judge.evaluate("a plain post")["passed"] is True
+        results = judge.evaluate_batch(["first post", "second post", "third post"])
+        assert [r["passed"] for r in results] == [True, True, True]
+        assert judge.batch_stats["fallbacks"] == 0
+
+    def test_full_loop_runs_without_api_key(self, stub_config):
+        post, iterations, passed = LinkedInGhostwriter().generate_with_evaluation("some notes")
+        assert post.startswith("Stub response") and iterations == 1 and passed
+
+
+class TestBulkJobs:
+
+    def test_local_bulk_job_round_trip(self):
+        backend = StubBackend(responses=["a", "b"])
+        job_id = backend.submit_batch(["first", "second"])
+        assert [m.content for m in backend.poll_batch(job_id)] == ["a", "b"]
+        with pytest.raises(KeyError):
+            backend.poll_batch(job_id)
+
+    def test_judge_bulk_scoring(self, stub_config):
+        verdicts = [{"id": "p1", "passed": False, "feedback": "jargon"}, {"id": "p2", "passed": True}]
+        judge = CorporateJargonJudgeEvaluator()
+        judge.llm = StubBackend(responses=[json.dumps(verdicts)])
+
+        handle = judge.submit_bulk(["we must align", "a quiet story"])
+        assert json.loads(json.dumps(handle)) == handle
+
+        results = judge.poll_bulk(handle, ["we must align", "a quiet story"])
+        assert [r["passed"] for r in results] == [False, True]
+        assert judge.batch_stats["requests"] == 1
+
+    def test_pending_bulk_job_returns_none(self, stub_config):
+        judge = CorporateJargonJudgeEvaluator()
+        judge.llm.poll_batch = lambda job_id: None
+        assert judge.poll_bulk({"job_id": "pending", "groups": [[0]]}, ["post"]) is None
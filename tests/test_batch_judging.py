@@ -0,0 +1,104 @@
+"""Tests for multi-post batch judging (offline, fake LLMs)."""
+
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from linkedin_ghostwriter import CorporateJargonJudgeEvaluator
+from linkedin_ghostwriter.utils.tokens import token_budget_scope
+
+from tests.conftest import fake_llm, load_synthetic_dataset
+
+
+class EchoBatchJudge(FakeListChatModel):
+    """Fake judge that fails every post containing 'align', answering as a JSON array."""
+
+    responses: list = [""]
+    skip: set = set()
+    crash_on: str = ""
+    requests: int = 0
+
+    def _call(self, messages, *args, **kwargs):
+        import re
+        self.requests += 1
+        # The criteria are the system message; posts and batch instructions follow it
+        text = "\n".join(m.content for m in messages if m.type == "human")
+        if self.crash_on and self.crash_on in text and "<post id=" in text:
+            raise RuntimeError("batch request failed")
+        verdicts = []
+        for post_id, body in re.findall(r'<post id="(p\d+)">\n(.*?)\n</post>', text, re.S):
+            if post_id in self.skip:
+                continue
+            verdicts.append({"id": post_id, "passed": "align" not in body, "phrases": [], "feedback": "ok"})
+        if "<post id=" not in text:
+            return json.dumps({"passed": "align" not in text, "phrases": [], "feedback": "single"})
+        return "```json\n" + json.dumps(verdicts) + "\n```"
+
+
+@pytest.fixture
+def judge(offline_config):
+    judge = CorporateJargonJudgeEvaluator()
+    judge.llm = EchoBatchJudge()
+    return judge
+
+
+@pytest.fixture
+def jargon_posts():
+    return [case["post"] for case in load_synthetic_dataset("jargon_fail")]
+
+
+class TestBatchJudging:
+
+    def test_verdicts_map_back_to_posts(self, judge):
+        posts = ["we need to align", "a quiet story", "more alignment talk"]
+        results = judge.evaluate_batch(posts)
+
+        assert [r["passed"] for r in results] == [False, True, False]
+        assert all(r["judge"] == "CorporateJargonJudgeEvaluator" and "id" not in r for r in results)
+        assert judge.batch_stats == {"requests": 1, "posts": 3, "fallbacks": 0}
+
+    def test_batch_size_adapts_to_token_budget(self, judge, jargon_posts):
+        overhead_only = judge._pack_batches(jargon_posts, token_budget=1, max_posts=None)
+        assert all(len(group) == 1 for group in overhead_only)
+
+        groups = judge._pack_batches(jargon_posts, token_budget=2000, max_posts=None)
+        assert 1 < len(groups) < len(jargon_posts)
+        assert sorted(i for group in groups for i in group) == list(range(len(jargon_posts)))
+
+        assert all(len(group) <= 3 for group in judge._pack_batches(jargon_posts, 10**6, max_posts=3))
+
+    def test_skipped_posts_fall_back_to_single_evaluation(self, judge):
+        judge.llm.skip = {"p2"}
+        results = judge.evaluate_batch(["align", "skipped post", "story"])
+
+        # The fallback single evaluation goes through the same fake model
+        assert [r["feedback"] for r in results] == ["ok", "single", "ok"]
+        assert judge.batch_stats["fallbacks"] == 1
+        assert judge.llm.requests == 2
+
+    def test_failed_request_falls_back_without_aborting_the_batch(self, judge):
+        judge.llm.crash_on = "crash"
+        posts = ["align", "a story", "crash me", "more align"]
+        results = judge.evaluate_batch(posts, max_posts=2)
+
+        assert [r["passed"] for r in results] == [False, True, True, False]
+        assert [r["feedback"] for r in results] == ["ok", "ok", "single", "single"]
+        assert judge.batch_stats == {"requests": 2, "posts": 4, "fallbacks": 2}
+
+    def test_batch_requests_are_charged_to_the_post_budget(self, judge):
+        with token_budget_scope(100_000) as budget:
+            judge.evaluate_batch(["we need to align", "a quiet story"])
+        assert budget.remaining < 100_000 and judge.llm.requests == 1
+
+    def test_unparseable_batch_falls_back_for_every_post(self, offline_config):
+        judge = CorporateJargonJudgeEvaluator()
+        judge.llm = fake_llm("not json at all")
+        results = judge.evaluate_batch(["one", "two"])
+
+        assert [r["passed"] for r in results] == [False, False]
+        assert judge.batch_stats["fallbacks"] == 2
+
+    def test_synthetic_dataset_in_few_requests(self, judge, jargon_posts):
+        results = judge.evaluate_batch(jargon_posts, token_budget=4000)
+        assert len(results) == len(jargon_posts)
+        assert judge.llm.requests < len(jargon_posts)
@@ -0,0 +1,39 @@
+"""Tests for the benchmark runner's baseline and compare modes."""
+
+import json
+
+from benchmarks.run import compare, discover, main
+
+
+class TestBenchmarkRunner:
+
+    def test_discovers_parametrized_benchmarks(self):
+        names = [name for name, _, _ in discover("TextHelpers.time_clean_text")]
+        assert names == [f"bench_helpers.TimeTextHelpers.time_clean_text(chars={n})" for n in (1000, 100000, 1000000, 10000000)]
+
+    def test_compare_flags_regressions_over_threshold(self):
+        rows = compare({"fast": 1.2, "slow": 1.3, "new": 1.0}, {"fast": 1.0, "slow": 1.0}, threshold=0.25)
+        assert [(name, regressed) for name, _, _, _, regressed in rows] == [("fast", False), ("slow", True), ("new", False)]
+        assert rows[2][1] is None and rows[2][3] is None
+
+    def test_save_then_compare(self, tmp_path, capsys):
+        baseline = tmp_path / "baseline.json"
+        assert main(["--filter", "TimeJSONParser", "--repeat", "1", "--save", str(baseline)]) == 0
+        saved = json.loads(baseline.read_text())
+        assert len(saved["results"]) == 3 and "machine" in saved
+
+        # A baseline far faster than anything achievable makes every benchmark a regression
+        saved["results"] = {name: 1e-12 for name in saved["results"]}
+        baseline.write_text(json.dumps(saved))
+        assert main(["--filter", "TimeJSONParser.time_parse_clean", "--repeat", "1", "--compare", str(baseline)]) == 1
+        assert "1 benchmark(s) regressed" in capsys.readouterr().out
+
+    def test_teardown_restores_global_config(self, monkeypatch):
+        from linkedin_ghostwriter.core.config import Config
+        monkeypatch.setattr(Config, "OPENAI_API_KEY", "")
+        monkeypatch.setattr(Config, "GENERATION_TIMEOUT", 60.0)
+
+        for _, call, _ in discover("TimePromptAssembly"):
+            assert Config.GENERATION_TIMEOUT == 0 and Config.OPENAI_API_KEY
+            call()
+        assert (Config.OPENAI_API_KEY, Config.GENERATION_TIMEOUT) == ("", 60.0)
@@ -0,0 +1,164 @@
+"""Tests for per-call deadlines, hedged judge requests and post deadlines (offline)."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from linkedin_ghostwriter import LinkedInGhostwriter, LLMJudgeEvaluator
+from linkedin_ghostwriter.evaluations.base import BaseEvaluator
+from linkedin_ghostwriter.utils.deadlines import (
+    DeadlineExceeded,
+    LatencyTracker,
+    StageTimeout,
+    call_with_deadline,
+    deadline_scope,
+    stage_timeout,
+)
+
+from tests.test_pipelined_generation import ScriptedGhostwriter
+
+
+class DelayedChatModel(FakeListChatModel):
+    """Fake async chat model; the n-th call waits delays[n] seconds before answering."""
+
+    delays: list = []
+    calls: int = 0
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        n = self.calls
+        self.calls += 1
+        await asyncio.sleep(self.delays[min(n, len(self.delays) - 1)])
+        message = AIMessage(content=self.responses[min(n, len(self.responses) - 1)])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class AlwaysFails(BaseEvaluator):
+    def evaluate(self, post):
+        return {"passed": False, "feedback": "nope"}
+
+
+class TestDeadlineHelpers:
+
+    def test_latency_percentile_needs_min_samples(self):
+        tracker = LatencyTracker(min_samples=10)
+        for i in range(9):
+            tracker.record(i / 10)
+        assert tracker.percentile(0.9) is None
+        tracker.record(0.9)
+        assert tracker.percentile(0.9) == pytest.approx(0.9)
+        assert tracker.percentile(0.5) == pytest.approx(0.5)
+
+    def test_stage_timeout_is_capped_by_enclosing_deadline(self):
+        assert stage_timeout(0) is None
+        assert stage_timeout(30) == 30
+        with deadline_scope(5):
+            assert stage_timeout(30) <= 5
+            assert stage_timeout(0) <= 5
+        with deadline_scope(0.001):
+            time.sleep(0.01)
+            with pytest.raises(DeadlineExceeded):
+                stage_timeout(30)
+
+    def test_slow_call_raises_after_timeout(self):
+        model = DelayedChatModel(responses=["late"], delays=[1.0])
+        started = time.perf_counter()
+        with pytest.raises(DeadlineExceeded):
+            call_with_deadline(model, "hi", timeout=0.1)
+        assert time.perf_counter() - started < 0.5
+
+    def test_stage_timeout_is_told_apart_from_the_post_deadline(self):
+        with pytest.raises(StageTimeout):
+            call_with_deadline(DelayedChatModel(responses=["late"], delays=[1.0]), "hi", timeout=0.05)
+        with deadline_scope(0.05), pytest.raises(DeadlineExceeded) as info:
+            call_with_deadline(DelayedChatModel(responses=["late"], delays=[1.0]), "hi", timeout=stage_timeout(30))
+        assert not isinstance(info.value, StageTimeout)
+
+    def test_hedged_duplicate_wins_over_stuck_call(self):
+        model = DelayedChatModel(responses=["stuck", "hedge"], delays=[1.0, 0.01])
+        result, hedged = call_with_deadline(model, "hi", timeout=2.0, hedge_after=0.05)
+        assert (result.content, hedged) == ("hedge", True)
+
+    def test_fast_call_is_not_hedged(self):
+        model = DelayedChatModel(responses=["fast"], delays=[0.0])
+        result, hedged = call_with_deadline(model, "hi", timeout=2.0, hedge_after=0.5)
+        assert (result.content, hedged, model.calls) == ("fast", False, 1)
+
+
+class TestJudgeDeadlines:
+
+    def test_judge_timeout_is_retried_once_then_a_timed_out_verdict(self, offline_config, monkeypatch):
+        monkeypatch.setattr(offline_config, "JUDGE_TIMEOUT", 0.05)
+        judge = LLMJudgeEvaluator()
+        judge.llm = DelayedChatModel(responses=['{"passed": true}'], delays=[1.0])
+
+        result = judge.evaluate("post")
+        assert result["passed"] is False and result["timed_out"] is True
+        assert judge.hedge_stats["timeouts"] == 2
+
+        judge.llm = DelayedChatModel(responses=["late", '{"passed": true}'], delays=[1.0, 0.01])
+        assert judge.evaluate("post")["passed"] is True
+
+    @pytest.mark.parametrize("pipelined", [False, True])
+    def test_timed_out_judge_abstains_instead_of_forcing_a_redraft(self, offline_config, monkeypatch, pipelined):
+        monkeypatch.setattr(offline_config, "JUDGE_TIMEOUT", 0.05)
+        judge = LLMJudgeEvaluator()
+        judge.llm = DelayedChatModel(responses=['{"passed": true}'], delays=[1.0])
+        ghostwriter = ScriptedGhostwriter([judge], ["draft", "blind redraft"])
+
+        assert ghostwriter.generate_with_evaluation("notes", 3, pipelined=pipelined, deadline=0) == ("draft", 1, True)
+        assert ghostwriter.calls == [""]
+
+    def test_judge_hedges_after_tracked_percentile(self, offline_config, monkeypatch):
+        monkeypatch.setattr(offline_config, "JUDGE_HEDGE_MIN_SAMPLES", 3)
+        judge = LLMJudgeEvaluator(hedging=True)
+        verdict = json.dumps({"passed": True, "feedback": "ok"})
+        judge.llm = DelayedChatModel(responses=[verdict], delays=[0.01, 0.01, 0.01, 1.0, 0.01])
+
+        for _ in range(4):
+            assert judge.evaluate("post")["passed"] is True
+        assert judge.hedge_stats == {"calls": 4, "hedged": 1, "timeouts": 0}
+
+
+class TestPostDeadline:
+
+    def test_returns_best_draft_when_time_runs_out(self, offline_config):
+        ghostwriter = LinkedInGhostwriter([AlwaysFails()])
+        ghostwriter.llm = DelayedChatModel(responses=["draft 1", "draft 2", "draft 3"], delays=[0.1])
+
+        started = time.perf_counter()
+        post, iterations, passed = ghostwriter.generate_with_evaluation("notes", 10, deadline=0.25)
+        assert time.perf_counter() - started < 0.5
+        assert passed is False
+        assert post == f"draft {iterations}"
+
+    def test_raises_when_no_draft_was_produced(self, offline_config):
+        ghostwriter = LinkedInGhostwriter([AlwaysFails()])
+        ghostwriter.llm = DelayedChatModel(responses=["late"], delays=[1.0])
+        with pytest.raises(DeadlineExceeded):
+            ghostwriter.generate_with_evaluation("notes", 3, deadline=0.05)
+
+    def test_pipelined_mode_honours_the_deadline(self, offline_config):
+        ghostwriter = LinkedInGhostwriter([AlwaysFails()])
+        ghostwriter.llm = DelayedChatModel(responses=["draft"], delays=[0.1])
+        post, iterations, passed = ghostwriter.generate_with_evaluation("notes", 10, pipelined=True, deadline=0.25)
+        assert (post, passed) == ("draft", False)
+        assert 1 <= iterations < 10
+
+    def test_slow_generation_is_retried_without_a_post_deadline(self, offline_config, monkeypatch):
+        monkeypatch.setattr(offline_config, "GENERATION_TIMEOUT", 0.1)
+        ghostwriter = LinkedInGhostwriter()
+        ghostwriter.llm = DelayedChatModel(responses=["late", "draft"], delays=[1.0, 0.01])
+        assert ghostwriter.generate_with_evaluation("notes", 3, deadline=0) == ("draft", 1, True)
+
+    def test_repeated_generation_timeout_is_reported_as_such(self, offline_config, monkeypatch, capsys):
+        monkeypatch.setattr(offline_config, "GENERATION_TIMEOUT", 0.1)
+        ghostwriter = LinkedInGhostwriter([AlwaysFails()])
+        ghostwriter.llm = DelayedChatModel(responses=["draft 1", "late"], delays=[0.01, 1.0])
+
+        assert ghostwriter.generate_with_evaluation("notes", 3, deadline=0) == ("draft 1", 1, False)
+        output = capsys.readouterr().out
+        assert "Generation timed out twice" in output and "Post deadline reached" not in output
@@ -0,0 +1,127 @@
+"""Tests for the token-budgeted feedback compiler, including prompt-size reduction on the synthetic datasets."""
+
+import re
+
+import pytest
+from linkedin_ghostwriter import (
+    CorporateJargonJudgeEvaluator,
+    DashCountEvaluator,
+    LLMJudgeEvaluator,
+    StyleEvaluator,
+)
+from linkedin_ghostwriter.evaluations.feedback import FeedbackCompiler
+from linkedin_ghostwriter.utils.helpers import estimate_tokens
+
+from tests.conftest import get_available_datasets, load_synthetic_dataset
+
+
+def legacy_feedback(failed):
+    """Feedback as run_evaluations rendered it before the compiler (every key joined)."""
+    return "\n".join(
+        f"{evaluator.__class__.__name__} failed: "
+        + ", ".join(f"{k}={v}" for k, v in result.items() if k != "passed")
+        for evaluator, result in failed
+    )
+
+
+def judge_results(post, expected_failures, judges):
+    """Judge results shaped like real verdicts, with phrases overlapping across judges."""
+    sentences = [s for s in re.split(r"(?<=[.!?])\s+", post) if s]
+    phrases = [" ".join(s.split()[:6]) for s in sentences[:4]]
+    general, jargon, style = judges
+    return [
+        (general, {
+            "passed": False,
+            "feedback": "The post leans on generic phrasing. It needs a more personal voice.",
+            "failures": list(expected_failures) + ["authenticity"],
+            "phrases": phrases,
+            "suggestions": [f"Rephrase '{p}' in your own words to sound less generic" for p in phrases],
+            "evaluator_type": "llm_based",
+            "judge": "LLMJudgeEvaluator",
+        }),
+        (jargon, {
+            "passed": False,
+            "phrases": [p.upper() for p in phrases[:2]] + ["driving impactful outcomes"],
+            "feedback": "The post leans on generic phrasing. Corporate buzzwords weaken it.",
+            "evaluator_type": "llm_based",
+            "judge": "CorporateJargonJudgeEvaluator",
+        }),
+        (style, {
+            "passed": False,
+            "feedback": "Too much buildup before the point. It needs a more personal voice.",
+            "failures": ["style"],
+            "phrases": phrases[1:3],
+            "suggestions": ["Cut the introduction", "Start with the anecdote", "Drop the closing moral"],
+            "evaluator_type": "llm_based",
+            "judge": "StyleEvaluator",
+        }),
+    ]
+
+
+@pytest.fixture
+def judges(offline_config):
+    return LLMJudgeEvaluator(), CorporateJargonJudgeEvaluator(), StyleEvaluator()
+
+
+class TestFeedbackCompiler:
+
+    def test_drops_metadata_and_merges_duplicates(self, judges):
+        failed = judge_results("We drive impact. We align. Then we ship.", ["jargon"], judges)
+        feedback = FeedbackCompiler(token_budget=1000).compile(failed)
+
+        for noise in ("evaluator_type", "llm_based", "judge=", "suggestions", "Rephrase"):
+            assert noise not in feedback
+        assert feedback.count("The post leans on generic phrasing.") == 1
+        assert feedback.count("It needs a more personal voice.") == 1
+        assert feedback.lower().count('"we drive impact."') == 1
+
+    def test_ranks_issues_by_severity(self, judges):
+        dash = DashCountEvaluator(max_allowed=1)
+        failed = [(dash, dash.evaluate("a - b - c - d"))] + judge_results("Post.", ["tone"], judges)
+        lines = FeedbackCompiler(token_budget=1000).compile(failed).splitlines()
+
+        categories = [line.split("[", 1)[1].split("]", 1)[0] for line in lines[1:]]
+        assert categories == ["jargon", "dashes", "style", "tone", "authenticity"]
+        assert lines[2].startswith("2. [dashes] Found 3 dashes; use at most 1.")
+
+    def test_respects_token_budget(self, judges):
+        failed = judge_results(load_synthetic_dataset("style_fail")[0]["post"], ["style"], judges)
+        for budget in (40, 80, 160):
+            feedback = FeedbackCompiler(token_budget=budget).compile(failed)
+            assert estimate_tokens(feedback) <= budget + 15  # omitted-issues note
+            assert feedback.splitlines()[1].startswith("1. [")
+
+    def test_timed_out_judges_add_nothing(self, judges):
+        timed_out = {"passed": False, "feedback": "Judge did not answer before the deadline.", "timed_out": True}
+        assert FeedbackCompiler().compile([(judges[0], timed_out)]) == ""
+
+    def test_metrics_fallback_for_results_without_feedback(self, judges):
+        feedback = FeedbackCompiler().compile([(DashCountEvaluator(), {"passed": False, "dash_count": 9, "evaluator_type": "rule_based"})])
+        assert "[dashes] dash_count=9" in feedback
+
+
+@pytest.mark.parametrize("dataset", sorted(get_available_datasets()))
+def test_prompt_size_reduction_on_synthetic_datasets(dataset, judges):
+    """Compiled feedback is much smaller than the legacy key=value dump on every dataset."""
+    dash = DashCountEvaluator(max_allowed=0)
+    compiler = FeedbackCompiler()
+    legacy_bytes = compiled_bytes = legacy_tokens = compiled_tokens = 0
+
+    for case in load_synthetic_dataset(dataset):
+        failed = [(dash, dash.evaluate(case["post"]))] + judge_results(case["post"], case["expected_failures"], judges)
+        legacy = legacy_feedback(failed)
+        compiled = compiler.compile(failed)
+
+        assert estimate_tokens(compiled) <= compiler.token_budget + 15
+        legacy_bytes += len(legacy.encode("utf-8"))
+        compiled_bytes += len(compiled.encode("utf-8"))
+        legacy_tokens += estimate_tokens(legacy)
+        compiled_tokens += estimate_tokens(compiled)
+
+    print(
+        f"\n{dataset}: {legacy_bytes} -> {compiled_bytes} bytes "
+        f"({1 - compiled_bytes / legacy_bytes:.0%} smaller), "
+        f"~{legacy_tokens} -> ~{compiled_tokens} tokens"
+    )
+    assert compiled_bytes < 0.6 * legacy_bytes
+    assert compiled_tokens < 0.6 * legacy_tokens
@@ -0,0 +1,74 @@
+"""Tests for the cheap-model-first judge cascade (offline, fake LLMs)."""
+
+import json
+
+import pytest
+from linkedin_ghostwriter import CorporateJargonJudgeEvaluator, LLMJudgeEvaluator, LinkedInGhostwriter
+
+from tests.conftest import fake_llm
+
+
+def verdict(passed, confidence=None, **extra):
+    payload = {"passed": passed, "feedback": "ok" if passed else "issues found", **extra}
+    if confidence is not None:
+        payload["confidence"] = confidence
+    return json.dumps(payload)
+
+
+@pytest.fixture
+def cascade_judge(offline_config):
+    judge = LLMJudgeEvaluator(cascade=True)
+    judge.llm = fake_llm(verdict(False))
+    return judge
+
+
+class TestJudgeCascade:
+    """The cascade model answers alone unless confidence is low or stakes are high."""
+
+    def test_cascade_disabled_by_default(self, offline_config):
+        judge = LLMJudgeEvaluator()
+        assert judge.cascade is False
+        assert judge.cascade_llm is None
+
+    def test_confident_verdict_is_not_escalated(self, cascade_judge):
+        cascade_judge.cascade_llm = fake_llm(verdict(True, confidence=0.95))
+        result = cascade_judge.evaluate("A short post.")
+
+        assert result["passed"] is True
+        assert "confidence" not in result
+        assert result["judge"] == "LLMJudgeEvaluator"
+        assert cascade_judge.cascade_stats["escalations"] == 0
+        assert cascade_judge.escalation_rate == 0.0
+
+    def test_low_confidence_escalates_to_strong_model(self, cascade_judge):
+        cascade_judge.cascade_llm = fake_llm(verdict(True, confidence=0.4))
+        result = cascade_judge.evaluate("A short post.")
+
+        assert result["passed"] is False
+        assert cascade_judge.cascade_stats["low_confidence"] == 1
+        assert cascade_judge.escalation_rate == 1.0
+
+    def test_missing_confidence_counts_as_low(self, cascade_judge):
+        cascade_judge.cascade_llm = fake_llm(verdict(True))
+        cascade_judge.evaluate("A short post.")
+        assert cascade_judge.cascade_stats["escalations"] == 1
+
+    def test_high_stakes_pass_is_escalated(self, offline_config):
+        judge = CorporateJargonJudgeEvaluator(cascade=True)
+        judge.cascade_llm = fake_llm(verdict(True, confidence=0.99), verdict(False, confidence=0.99))
+        judge.llm = fake_llm(verdict(False, phrases=["drive impact"]))
+
+        assert judge.evaluate("We drive impact.")["passed"] is False
+        assert judge.evaluate("We drive impact.")["passed"] is False
+        assert judge.cascade_stats == {"calls": 2, "escalations": 1, "low_confidence": 0, "high_stakes_pass": 1}
+        assert judge.escalation_rate == 0.5
+
+    def test_ghostwriter_reports_escalation_rates(self, offline_config, cascade_judge):
+        cascade_judge.cascade_llm = fake_llm(verdict(False, confidence=0.9), verdict(True, confidence=0.2))
+        ghostwriter = LinkedInGhostwriter([cascade_judge])
+        ghostwriter.run_evaluations("first")
+        ghostwriter.run_evaluations("second")
+
+        report = ghostwriter.cascade_report()
+        assert report["LLMJudgeEvaluator"]["calls"] == 2
+        assert report["LLMJudgeEvaluator"]["escalation_rate"] == 0.5
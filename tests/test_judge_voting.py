@@ -0,0 +1,91 @@
+"""Tests for adaptive self-consistency voting on LLM judges (offline, scripted samples)."""
+
+import json
+import threading
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from linkedin_ghostwriter import LLMJudgeEvaluator
+
+from tests.conftest import fake_llm
+
+
+class ScriptedSamples(FakeListChatModel):
+    """Thread-safe fake that hands out one scripted verdict per call."""
+
+    lock: object = None
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        with self.lock:
+            response = self.responses[self.calls % len(self.responses)]
+            self.calls += 1
+        return response
+
+
+def samples(*passed):
+    verdicts = [json.dumps({"passed": p, "feedback": "ok" if p else "too vague"}) for p in passed]
+    return ScriptedSamples(responses=verdicts, lock=threading.Lock())
+
+
+@pytest.fixture
+def voting_judge(offline_config):
+    return LLMJudgeEvaluator(voting=True, max_votes=3)
+
+
+class TestJudgeVoting:
+
+    def test_voting_disabled_by_default(self, offline_config):
+        judge = LLMJudgeEvaluator()
+        assert judge.voting is False
+        assert judge.vote_llm is None
+        judge.llm = fake_llm(json.dumps({"passed": True}))
+        assert "agreement" not in judge.evaluate("A post.")
+
+    def test_agreeing_samples_stop_early(self, voting_judge):
+        voting_judge.vote_llm = samples(True, True, False)
+        result = voting_judge.evaluate("A post.")
+
+        assert result["passed"] is True
+        assert result["votes"] == 2 and result["agreement"] == 1.0
+        assert voting_judge.vote_llm.calls == 2
+        assert voting_judge.vote_stats == {"evaluations": 1, "samples": 2, "early_stops": 1, "split": 0}
+
+    def test_split_samples_take_a_tiebreak(self, voting_judge):
+        voting_judge.vote_llm = samples(True, False, False)
+        result = voting_judge.evaluate("A borderline post.")
+
+        assert result["passed"] is False
+        assert result["feedback"] == "too vague"
+        assert result["votes"] == 3 and result["agreement"] == pytest.approx(0.667)
+        assert voting_judge.vote_stats["split"] == 1
+        assert voting_judge.mean_votes == 3.0
+
+    def test_usage_of_all_samples_is_counted(self, voting_judge):
+        voting_judge.vote_llm = samples(True, False, True)
+        voting_judge._judge = lambda llm, prompt, post: (
+            voting_judge._add_usage({"input_tokens": 10, "output_tokens": 2}),
+            json.loads(llm.invoke(post).content),
+        )[1]
+        voting_judge.evaluate("A post.")
+        assert voting_judge.last_usage == {"input_tokens": 30, "output_tokens": 6}
+
+    def test_timed_out_samples_do_not_vote(self, voting_judge):
+        answers = iter([{"passed": False, "timed_out": True}, {"passed": True}, {"passed": True}])
+        lock = threading.Lock()
+
+        def judge(llm, prompt, post):
+            with lock:
+                return dict(next(answers))
+
+        voting_judge._judge = judge
+        result = voting_judge.evaluate("A post.")
+        assert result["passed"] is True
+        assert result["votes"] == 3 and result["agreement"] == 1.0
+
+    def test_cascade_escalation_votes(self, offline_config):
+        judge = LLMJudgeEvaluator(cascade=True, voting=True)
+        judge.cascade_llm = fake_llm(json.dumps({"passed": True, "confidence": 0.2}))
+        judge.vote_llm = samples(False, False)
+        result = judge.evaluate("A post.")
+        assert result["passed"] is False and result["votes"] == 2
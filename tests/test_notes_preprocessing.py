@@ -0,0 +1,119 @@
+"""Tests for map-reduce preprocessing of long raw notes (offline, fake LLMs)."""
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from linkedin_ghostwriter import RunHistoryStore
+from linkedin_ghostwriter.core.preprocess import NotesPreprocessor
+from linkedin_ghostwriter.utils.deadlines import DeadlineExceeded, deadline_scope
+from linkedin_ghostwriter.utils.helpers import hash_text, split_into_chunks
+from linkedin_ghostwriter.utils.tokens import TokenBudgetExceeded, token_budget_scope
+
+from tests.test_deadlines import DelayedChatModel
+from tests.test_pipelined_generation import ScriptedGhostwriter
+
+
+class RecordingChatModel(FakeListChatModel):
+    """Fake chat model that remembers every prompt it received."""
+
+    prompts: list = []
+
+    def _call(self, messages, *args, **kwargs):
+        self.prompts.append(messages[-1].content)
+        return super()._call(messages, *args, **kwargs)
+
+
+@pytest.fixture
+def llm():
+    return RecordingChatModel(responses=["- condensed"], prompts=[])
+
+
+@pytest.fixture
+def long_notes():
+    paragraphs = [f"Paragraph {i}: " + "we talked about the rollout plan. " * 20 for i in range(12)]
+    return "\n\n".join(paragraphs)
+
+
+class TestSplitIntoChunks:
+
+    def test_respects_max_chars_and_keeps_text(self, long_notes):
+        chunks = split_into_chunks(long_notes, 1500)
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 1500 for chunk in chunks)
+        assert "".join(chunks).replace("\n", "").replace(" ", "") == long_notes.replace("\n", "").replace(" ", "")
+
+    def test_hard_splits_oversized_sentences(self):
+        chunks = split_into_chunks("x" * 250, 100)
+        assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+
+
+class TestNotesPreprocessor:
+
+    def test_short_notes_pass_through(self, llm):
+        preprocessor = NotesPreprocessor(llm=llm, threshold=1000)
+        assert preprocessor.prepare("short notes") == "short notes"
+        assert llm.prompts == []
+
+    def test_zero_threshold_disables(self, llm, long_notes):
+        assert NotesPreprocessor(llm=llm, threshold=0).prepare(long_notes) == long_notes
+
+    def test_long_notes_are_mapped_then_reduced(self, llm, long_notes):
+        preprocessor = NotesPreprocessor(llm=llm, threshold=1000, chunk_size=1500)
+        chunks = split_into_chunks(long_notes, 1500)
+
+        assert preprocessor.prepare(long_notes) == "- condensed"
+        assert len(llm.prompts) == len(chunks) + 1
+        assert f"part 1 of {len(chunks)}" in llm.prompts[0]
+        assert "Condensed notes:" in llm.prompts[-1]
+
+    def test_prompts_start_with_a_static_system_message(self, offline_config, llm):
+        preprocessor = NotesPreprocessor(llm=llm)
+        first = preprocessor.map_prompt.format_messages(chunk="alpha", index=1, total=2)
+        second = preprocessor.map_prompt.format_messages(chunk="beta", index=2, total=2)
+        assert first[0].type == "system" and first[0].content == second[0].content
+        assert "alpha" not in first[0].content and "part 1 of 2" in first[1].content
+
+        reduce = preprocessor.reduce_prompt.format_messages(summaries="- a")
+        assert reduce[0].type == "system" and str(offline_config.NOTES_BRIEF_MAX_WORDS) in reduce[0].content
+        assert "- a" not in reduce[0].content
+
+    def test_brief_is_cached_by_notes_hash(self, llm, long_notes):
+        preprocessor = NotesPreprocessor(llm=llm, threshold=1000, chunk_size=1500)
+        preprocessor.prepare(long_notes)
+        calls = len(llm.prompts)
+        preprocessor.prepare(long_notes)
+        assert len(llm.prompts) == calls
+
+    def test_history_warms_the_cache(self, llm, long_notes, tmp_path):
+        with RunHistoryStore(str(tmp_path / "history.db")) as store:
+            NotesPreprocessor(llm=llm, threshold=1000, history=store).prepare(long_notes)
+            store.flush()
+            assert store.get_cached(NotesPreprocessor.CACHE_KIND, hash_text(long_notes)) == "- condensed"
+
+            fresh = RecordingChatModel(responses=["unused"], prompts=[])
+            assert NotesPreprocessor(llm=fresh, threshold=1000, history=store).prepare(long_notes) == "- condensed"
+            assert fresh.prompts == []
+
+    def test_condensing_honours_the_post_deadline(self, long_notes):
+        slow = DelayedChatModel(responses=["- condensed"], delays=[5.0], calls=0)
+        preprocessor = NotesPreprocessor(llm=slow, threshold=1000, chunk_size=1500)
+        with deadline_scope(0.2), pytest.raises(DeadlineExceeded):
+            preprocessor.prepare(long_notes)
+
+    def test_condensing_counts_against_token_limits(self, llm, long_notes, monkeypatch):
+        preprocessor = NotesPreprocessor(llm=llm, threshold=1000, chunk_size=1500)
+        with token_budget_scope(100_000) as budget:
+            preprocessor.condense(long_notes)
+        assert budget.remaining < 100_000 - len(split_into_chunks(long_notes, 1500)) * 300
+
+        monkeypatch.setattr("linkedin_ghostwriter.core.config.Config.MAX_PROMPT_TOKENS", 50)
+        with pytest.raises(TokenBudgetExceeded):
+            preprocessor.condense(long_notes)
+
+    def test_ghostwriter_generates_from_the_brief(self, offline_config, llm, long_notes):
+        ghostwriter = ScriptedGhostwriter([], ["post"])
+        ghostwriter.preprocessor = NotesPreprocessor(llm=llm, threshold=1000)
+        seen = []
+        ghostwriter.generate_post = lambda notes, feedback="": seen.append(notes) or "post"
+
+        assert ghostwriter.generate_with_evaluation(long_notes, 2) == ("post", 1, True)
+        assert seen == ["- condensed"]
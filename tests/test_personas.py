@@ -0,0 +1,136 @@
+"""Tests for the persona registry and the bounded ghostwriter pool (offline)."""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+from linkedin_ghostwriter import GhostwriterPool, PersonaRegistry
+from linkedin_ghostwriter.evaluations.llm_based import CorporateJargonJudgeEvaluator
+from linkedin_ghostwriter.evaluations.rule_based import DashCountEvaluator
+
+
+def write_persona(directory, name, **definition):
+    (directory / name).mkdir(exist_ok=True)
+    path = directory / name / "persona.json"
+    path.write_text(json.dumps(definition), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def persona_dir(tmp_path):
+    write_persona(
+        tmp_path, "alice",
+        template="Write like Alice: dry humour, {no} exclamation marks.",
+        examples=["Alice's first post."],
+        evaluators=[{"type": "dash", "max_allowed": 1}, {"type": "jargon", "cascade": False}],
+    )
+    write_persona(tmp_path, "bob", template_file="voice.txt", examples="posts.json")
+    (tmp_path / "bob" / "voice.txt").write_text("Write like Bob.", encoding="utf-8")
+    (tmp_path / "bob" / "posts.json").write_text(json.dumps([{"post": "Bob's post."}]), encoding="utf-8")
+    write_persona(tmp_path, "carol")
+    return tmp_path
+
+
+class TestPersonaRegistry:
+
+    def test_loads_definitions_from_disk(self, offline_config, persona_dir):
+        registry = PersonaRegistry(str(persona_dir))
+        assert registry.names() == ["alice", "bob", "carol"]
+
+        bob = registry.get("bob")
+        assert bob.template == "Write like Bob." and bob.examples == ["Bob's post."]
+        [dash, jargon] = registry.get("alice").build_evaluators()
+        assert isinstance(dash, DashCountEvaluator) and dash.max_allowed == 1
+        assert isinstance(jargon, CorporateJargonJudgeEvaluator) and jargon.cascade is False
+
+    def test_unknown_persona_or_evaluator(self, persona_dir):
+        registry = PersonaRegistry(str(persona_dir))
+        with pytest.raises(KeyError):
+            registry.get("mallory")
+        write_persona(persona_dir, "broken", evaluators=[{"type": "vibes"}])
+        with pytest.raises(ValueError, match="vibes"):
+            registry.get("broken")
+
+    def test_cache_is_bounded(self, offline_config, persona_dir):
+        registry = PersonaRegistry(str(persona_dir), max_size=2)
+        for name in ["alice", "bob", "alice", "carol"]:
+            registry.get(name)
+        assert len(registry) == 2 and list(registry._personas) == ["alice", "carol"]
+
+    def test_pool_keeps_a_ghostwriter_whose_persona_was_dropped_from_the_registry(self, offline_config, persona_dir):
+        pool = GhostwriterPool(PersonaRegistry(str(persona_dir), max_size=1))
+        alice = pool.get("alice")
+        pool.get("bob")
+        assert pool.get("alice") is alice and pool.stats["reloads"] == 0
+
+
+class TestGhostwriterPool:
+
+    def test_persona_prompt_uses_its_template_and_examples(self, offline_config, persona_dir):
+        ghostwriter = GhostwriterPool(PersonaRegistry(str(persona_dir))).get("alice")
+        assert "Write like Alice: dry humour, {no} exclamation marks." in ghostwriter.system_prompt
+        assert "Alice's first post." in ghostwriter.system_prompt
+        assert ghostwriter.base_prompt.input_variables == ["raw_notes"]
+        assert len(ghostwriter.evaluators) == 2
+
+    def test_lru_eviction_and_hit_rate(self, offline_config, persona_dir):
+        pool = GhostwriterPool(PersonaRegistry(str(persona_dir)), max_size=2)
+        alice = pool.get("alice")
+        pool.get("bob")
+        assert pool.get("alice") is alice
+        pool.get("carol")
+
+        assert "bob" not in pool and "alice" in pool and len(pool) == 2
+        report = pool.report()
+        assert (report["hits"], report["misses"], report["evictions"]) == (1, 3, 1)
+        assert report["hit_rate"] == 0.25 and report["avg_build_seconds"] > 0
+
+    def test_changed_persona_file_is_rebuilt(self, offline_config, persona_dir):
+        pool = GhostwriterPool(PersonaRegistry(str(persona_dir)))
+        old = pool.get("carol")
+        path = write_persona(persona_dir, "carol", template="Write like the new Carol.")
+        os.utime(path, (time.time() + 5, time.time() + 5))
+
+        new = pool.get("carol")
+        assert new is not old and "new Carol" in new.system_prompt
+        assert pool.report()["reloads"] == 1
+
+    def test_concurrent_requests_build_once(self, offline_config, persona_dir, monkeypatch):
+        pool = GhostwriterPool(PersonaRegistry(str(persona_dir)))
+        build = pool._build
+        builds = []
+
+        def slow_build(persona):
+            builds.append(persona.name)
+            time.sleep(0.1)
+            return build(persona)
+
+        monkeypatch.setattr(pool, "_build", slow_build)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.get("alice"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert builds == ["alice"]
+        assert len({id(ghostwriter) for ghostwriter in results}) == 1
+        assert pool.report()["hits"] == 7
+
+    def test_personas_keep_their_own_style_archives(self, offline_config, persona_dir, tmp_path_factory, monkeypatch):
+        shared = tmp_path_factory.mktemp("shared")
+        (shared / "default.json").write_text(json.dumps(["Default author's post."]), encoding="utf-8")
+        monkeypatch.setattr("linkedin_ghostwriter.core.config.Config.STYLE_ARCHIVE_PATH", str(shared / "default.json"))
+        monkeypatch.setattr("linkedin_ghostwriter.core.config.Config.STYLE_INDEX_PATH", str(shared / "shared.index.json"))
+        for name in ("alice", "bob"):
+            write_persona(persona_dir, name, style_archive="archive.json")
+            (persona_dir / name / "archive.json").write_text(json.dumps([f"{name} archived post."]), encoding="utf-8")
+
+        pool = GhostwriterPool(PersonaRegistry(str(persona_dir)))
+        assert pool.get("alice").style_examples.posts == ["alice archived post."]
+        assert pool.get("bob").style_examples.posts == ["bob archived post."]
+        assert (persona_dir / "bob" / "archive.json.index.json").exists()
+        assert not (shared / "shared.index.json").exists()
+        assert pool.get("carol").style_examples is None
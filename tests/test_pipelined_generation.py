@@ -0,0 +1,93 @@
+"""Tests for speculative pipelining of generation and evaluation (offline)."""
+
+import threading
+import time
+
+import pytest
+from linkedin_ghostwriter import DashCountEvaluator, LinkedInGhostwriter
+from linkedin_ghostwriter.evaluations.base import BaseEvaluator
+
+
+class StubEvaluator(BaseEvaluator):
+    """Evaluator that fails posts containing a marker, optionally after a delay."""
+
+    def __init__(self, marker, delay=0.0, evaluator_type="llm_based"):
+        self.marker = marker
+        self.delay = delay
+        self.evaluator_type = evaluator_type
+
+    def evaluate(self, post):
+        time.sleep(self.delay)
+        passed = self.marker not in post
+        return {"passed": passed, "feedback": "" if passed else f"Found {self.marker}.", "evaluator_type": self.evaluator_type}
+
+
+class ScriptedGhostwriter(LinkedInGhostwriter):
+    """Ghostwriter whose drafts come from a script instead of an LLM."""
+
+    def __init__(self, evaluators, drafts):
+        super().__init__(evaluators)
+        self.drafts = list(drafts)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def generate_post(self, raw_notes, feedback=""):
+        with self._lock:
+            self.calls.append(feedback)
+            return self.drafts[min(len(self.calls), len(self.drafts)) - 1]
+
+
+@pytest.fixture
+def evaluators():
+    return [
+        StubEvaluator("DASH", evaluator_type="rule_based"),
+        StubEvaluator("JARGON", delay=0.05),
+        StubEvaluator("CLICHE", delay=0.2),
+    ]
+
+
+class TestPipelinedGeneration:
+
+    def test_same_outcome_as_sequential(self, offline_config, evaluators):
+        drafts = ["DASH JARGON", "CLICHE", "clean post"]
+        sequential = ScriptedGhostwriter(evaluators, drafts)
+        pipelined = ScriptedGhostwriter(evaluators, drafts)
+
+        assert sequential.generate_with_evaluation("notes", 5) == ("clean post", 3, True)
+        assert pipelined.generate_with_evaluation("notes", 5, pipelined=True) == ("clean post", 3, True)
+
+    def test_next_draft_starts_before_slow_judges_finish(self, offline_config, evaluators):
+        ghostwriter = ScriptedGhostwriter(evaluators, ["DASH CLICHE", "clean post"])
+        ghostwriter.generate_with_evaluation("notes", 3, pipelined=True)
+
+        # The speculative draft only saw the rule-based feedback
+        assert "Found DASH." in ghostwriter.calls[1]
+        assert "Found CLICHE." not in ghostwriter.calls[1]
+
+    def test_speculation_starts_on_first_judge_failure(self, offline_config):
+        judges = [StubEvaluator("JARGON", delay=0.01), StubEvaluator("CLICHE", delay=0.2)]
+        ghostwriter = ScriptedGhostwriter(judges, ["JARGON", "clean post"])
+
+        assert ghostwriter.generate_with_evaluation("notes", 3, pipelined=True) == ("clean post", 2, True)
+        assert "Found JARGON." in ghostwriter.calls[1]
+
+    def test_passing_draft_discards_speculation(self, offline_config, evaluators):
+        ghostwriter = ScriptedGhostwriter(evaluators, ["clean post", "never used"])
+        assert ghostwriter.generate_with_evaluation("notes", 3, pipelined=True) == ("clean post", 1, True)
+
+    def test_max_iterations_returns_last_draft(self, offline_config, evaluators):
+        ghostwriter = ScriptedGhostwriter(evaluators, ["JARGON 1", "JARGON 2"])
+        post, iterations, passed = ghostwriter.generate_with_evaluation("notes", 2, pipelined=True)
+        assert (post, iterations, passed) == ("JARGON 2", 2, False)
+        assert len(ghostwriter.calls) == 2 and "Found JARGON." in ghostwriter.calls[1]
+
+    @pytest.mark.parametrize("drafts, calls", [(["X post", "clean post"], 2), (["clean post"], 1)])
+    def test_no_blind_draft_when_rule_based_checks_pass(self, offline_config, drafts, calls):
+        evaluators = [DashCountEvaluator(), StubEvaluator("X", delay=0.1)]
+        sequential = ScriptedGhostwriter(evaluators, drafts)
+        pipelined = ScriptedGhostwriter(evaluators, drafts)
+
+        assert sequential.generate_with_evaluation("notes", 3) == ("clean post", calls, True)
+        assert pipelined.generate_with_evaluation("notes", 3, pipelined=True) == ("clean post", calls, True)
+        assert len(pipelined.calls) == len(sequential.calls) == calls
+        assert all(feedback for feedback in pipelined.calls[1:])
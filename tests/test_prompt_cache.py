@@ -0,0 +1,90 @@
+"""Tests for the cache-friendly prompt layout and cached-token reporting (offline)."""
+
+import pytest
+from langchain_core.messages import AIMessage
+from linkedin_ghostwriter import (
+    CorporateJargonJudgeEvaluator,
+    LinkedInGhostwriter,
+    LLMJudgeEvaluator,
+    StyleEvaluator,
+)
+from linkedin_ghostwriter.backends import StubBackend
+from linkedin_ghostwriter.backends.base import to_messages
+from linkedin_ghostwriter.utils.tokens import cache_stats
+
+from tests.test_pipelined_generation import StubEvaluator
+
+JUDGES = [CorporateJargonJudgeEvaluator, StyleEvaluator, LLMJudgeEvaluator]
+
+
+class RecordingBackend(StubBackend):
+    """Stub backend that keeps every request and reports part of each prompt as cached."""
+
+    def __init__(self, cached=0, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = []
+        self.cached = cached
+
+    def invoke(self, input, config=None, **kwargs):
+        self.requests.append(to_messages(input))
+        message = super().invoke(input, config, **kwargs)
+        usage = {**message.usage_metadata, "input_token_details": {"cache_read": self.cached}}
+        return AIMessage(content=message.content, usage_metadata=usage)
+
+
+def prefix(messages):
+    assert messages[0].type == "system"
+    return messages[0].content.encode("utf-8")
+
+
+class TestStablePrefixes:
+
+    def test_generation_prefix_is_identical_across_iterations(self, offline_config):
+        ghostwriter = LinkedInGhostwriter([StubEvaluator("Stub")])
+        ghostwriter.llm = RecordingBackend()
+        ghostwriter.generate_with_evaluation("my notes", max_iterations=3)
+
+        first, *retries = ghostwriter.llm.requests
+        assert len(retries) == 2
+        assert all(prefix(request) == prefix(first) for request in retries)
+        # Feedback goes after the notes, so the notes message is shared too
+        assert all(request[1] == first[1] and "Found Stub." in request[-1].content for request in retries)
+        assert "my notes" not in first[0].content
+
+    @pytest.mark.parametrize("judge_class", JUDGES)
+    def test_judge_prefix_is_identical_across_posts_and_variants(self, offline_config, judge_class):
+        judge = judge_class()
+        judge.llm = RecordingBackend()
+        judge.evaluate("First post about my garden.")
+        judge.evaluate("Second post, about a bug I fixed.")
+        judge.evaluate_batch(["Post one.", "Post two."])
+
+        cascade = judge_class(cascade=True)
+        variants = [
+            cascade.cascade_prompt.format_messages(post="Third post."),
+            judge_class().prompt.format_messages(post="Fourth post."),
+        ]
+        expected = prefix(judge.llm.requests[0])
+        assert all(prefix(request) == expected for request in judge.llm.requests + variants)
+        assert b"post" in expected and b"garden" not in expected
+
+
+class TestCachedTokens:
+
+    def test_judge_usage_and_global_stats_report_cached_tokens(self, offline_config):
+        before = cache_stats.report()
+        judge = CorporateJargonJudgeEvaluator()
+        judge.llm = RecordingBackend(cached=128)
+        judge.evaluate("A post.")
+
+        assert judge.last_usage["cached_input_tokens"] == 128
+        after = cache_stats.report()
+        assert after["calls"] == before["calls"] + 1
+        assert after["cached_tokens"] == before["cached_tokens"] + 128
+        assert 0 < after["hit_rate"] <= 1
+
+    def test_uncached_calls_have_no_cached_key(self, offline_config):
+        judge = CorporateJargonJudgeEvaluator()
+        judge.llm = RecordingBackend()
+        judge.evaluate("A post.")
+        assert "cached_input_tokens" not in judge.last_usage
@@ -0,0 +1,165 @@
+"""Tests for the append-only run history store (offline)."""
+
+import sqlite3
+import time
+
+import pytest
+from linkedin_ghostwriter import DashCountEvaluator, LinkedInGhostwriter, RunHistoryStore
+from linkedin_ghostwriter.utils.helpers import hash_text
+
+from tests.test_pipelined_generation import ScriptedGhostwriter, StubEvaluator
+
+
+@pytest.fixture
+def store(tmp_path):
+    with RunHistoryStore(str(tmp_path / "history.db"), flush_interval=0.01) as store:
+        yield store
+
+
+class TestRunHistoryStore:
+
+    def test_requires_a_path(self, monkeypatch):
+        from linkedin_ghostwriter.core.config import Config
+        monkeypatch.setattr(Config, "HISTORY_DB_PATH", "")
+        with pytest.raises(ValueError):
+            RunHistoryStore()
+
+    def test_records_run_drafts_and_verdicts(self, store):
+        run_id = store.start_run("my notes", model="gpt-4o")
+        store.record_draft(run_id, 0, "draft one", "", seconds=1.5, usage={"input_tokens": 300, "output_tokens": 80})
+        store.record_verdict(run_id, 0, "DashCountEvaluator", {"passed": False, "dash_count": 5}, seconds=0.001)
+        store.record_draft(run_id, 1, "draft two", "DashCountEvaluator failed")
+        store.record_verdict(run_id, 1, "DashCountEvaluator", {"passed": True, "feedback": "fine"})
+        store.finish_run(run_id, "draft two", 2, True, seconds=3.0)
+        store.flush()
+
+        [run] = store.query_runs(notes_hash=hash_text("my notes"))
+        assert run["run_id"] == run_id
+        assert (run["iterations"], run["passed"], run["final_post"]) == (2, 1, "draft two")
+
+        drafts = store.query_drafts(run_id)
+        assert [d["post"] for d in drafts] == ["draft one", "draft two"]
+        assert drafts[0]["input_tokens"] == 300
+
+        verdicts = store.query_verdicts(judge="DashCountEvaluator")
+        assert [v["passed"] for v in verdicts] == [1, 0]
+        assert verdicts[0]["feedback"] == "fine"
+        assert [dict(r) for r in store.verdict_results(run_id)] == [
+            {"passed": False, "dash_count": 5},
+            {"passed": True, "feedback": "fine"},
+        ]
+
+    def test_hash_prefix_and_date_filters(self, store):
+        first = store.start_run("notes A")
+        store.start_run("notes B")
+        store.flush()
+
+        assert [r["run_id"] for r in store.query_runs(notes_hash=hash_text("notes A")[:8])] == [first]
+        assert store.query_runs(since=time.time() + 60) == []
+        assert len(store.query_runs(until=time.time() + 60)) == 2
+
+    def test_judge_costs_counts_forced_iterations(self, store):
+        run_id = store.start_run("notes")
+        for iteration, passed in enumerate([False, False, True]):
+            store.record_draft(run_id, iteration, f"draft {iteration}")
+            store.record_verdict(run_id, iteration, "StyleEvaluator", {"passed": passed})
+            store.record_verdict(run_id, iteration, "DashCountEvaluator", {"passed": True})
+        store.flush()
+
+        costs = {row["judge"]: row for row in store.judge_costs()}
+        assert costs["StyleEvaluator"]["forced_iterations"] == 2
+        assert costs["DashCountEvaluator"]["forced_iterations"] == 0
+
+    def test_judge_costs_filters(self, store):
+        first = store.start_run("notes A")
+        second = store.start_run("notes B")
+        for run_id in (first, second):
+            store.record_draft(run_id, 0, "draft")
+            store.record_verdict(run_id, 0, "StyleEvaluator", {"passed": False})
+            store.record_verdict(run_id, 0, "DashCountEvaluator", {"passed": True})
+        store.flush()
+
+        [row] = store.judge_costs(judge="StyleEvaluator", notes_hash=hash_text("notes A")[:8])
+        assert (row["judge"], row["verdicts"], row["failures"]) == ("StyleEvaluator", 1, 1)
+        assert store.judge_costs(until=time.time() - 60) == []
+        assert len(store.judge_costs(since=time.time() - 60)) == 2
+
+    def test_read_only_store_queries_without_a_writer(self, store, tmp_path):
+        store.start_run("notes")
+        store.flush()
+
+        with RunHistoryStore(store.path, read_only=True) as reader:
+            assert reader._writer is None
+            assert len(reader.query_runs()) == 1
+            with pytest.raises(RuntimeError, match="read-only"):
+                reader.start_run("notes")
+        with pytest.raises(sqlite3.OperationalError):
+            RunHistoryStore(str(tmp_path / "missing.db"), read_only=True).query_runs()
+
+    def test_closed_store_rejects_writes(self, tmp_path):
+        store = RunHistoryStore(str(tmp_path / "history.db"))
+        store.close()
+        with pytest.raises(RuntimeError):
+            store.start_run("notes")
+
+    def test_failing_write_is_logged_and_others_commit(self, store, caplog):
+        good = store.start_run("before")
+        store._enqueue("INSERT INTO missing_table VALUES (?)", (1,))
+        later = store.start_run("after")
+        store.flush()
+
+        assert {run["run_id"] for run in store.query_runs()} == {good, later}
+        assert "Dropped a run history write" in caplog.text
+
+    def test_dead_writer_raises_instead_of_hanging(self, store):
+        # Stop the writer behind the store's back, as an unexpected crash would
+        store._queue.put(None)
+        store._writer.join()
+        store._queue.put(("SELECT 1", ()))
+
+        with pytest.raises(RuntimeError, match="writer thread has stopped"):
+            store.flush()
+        with pytest.raises(RuntimeError, match="writer thread has stopped"):
+            store.start_run("notes")
+
+
+class TestGhostwriterHistory:
+
+    @pytest.mark.parametrize("pipelined", [False, True])
+    def test_generate_with_evaluation_records_every_draft(self, offline_config, store, pipelined):
+        ghostwriter = ScriptedGhostwriter([StubEvaluator("JARGON")], ["JARGON", "clean post"])
+        ghostwriter.history = store
+
+        assert ghostwriter.generate_with_evaluation("notes", 3, pipelined=pipelined) == ("clean post", 2, True)
+        store.flush()
+
+        [run] = store.query_runs()
+        assert run["passed"] == 1
+        drafts = store.query_drafts(run["run_id"])
+        assert [d["post"] for d in drafts] == ["JARGON", "clean post"]
+        assert "Found JARGON." in drafts[1]["feedback"]
+        assert len(store.query_verdicts(judge="StubEvaluator")) == 2
+
+    @pytest.mark.parametrize("pipelined", [False, True])
+    def test_local_fixes_record_the_fixed_draft_and_no_forced_iteration(self, offline_config, store, pipelined):
+        ghostwriter = ScriptedGhostwriter(
+            [DashCountEvaluator(max_allowed=1), StubEvaluator("JARGON")], ["a - b - c JARGON", "clean post"]
+        )
+        ghostwriter.history = store
+
+        assert ghostwriter.generate_with_evaluation("notes", 3, pipelined=pipelined) == ("clean post", 2, True)
+        store.flush()
+
+        [run] = store.query_runs()
+        assert [d["post"] for d in store.query_drafts(run["run_id"])] == ["a, b, c JARGON", "clean post"]
+        dash = store.query_verdicts(judge="DashCountEvaluator")
+        assert len(dash) == 2 and all(v["passed"] for v in dash)
+        first = next(r for r in store.verdict_results(run["run_id"]) if "dash_count" in r)
+        assert first["fixed"] is True and first["passed"] is True
+        costs = {row["judge"]: row for row in store.judge_costs()}
+        assert costs["DashCountEvaluator"]["forced_iterations"] == 0
+        assert costs["StubEvaluator"]["forced_iterations"] == 1
+
+    def test_history_is_disabled_without_path(self, offline_config, monkeypatch):
+        monkeypatch.setattr(offline_config, "HISTORY_DB_PATH", "")
+        assert LinkedInGhostwriter().history is None
@@ -0,0 +1,102 @@
+"""Tests for indexed retrieval of few-shot style examples (offline)."""
+
+import json
+
+import pytest
+from linkedin_ghostwriter import StyleExampleStore
+from linkedin_ghostwriter.core.style_examples import tokenize
+from linkedin_ghostwriter.prompts.templates import get_generation_prompt, get_system_prompt
+from linkedin_ghostwriter.utils.helpers import estimate_tokens
+
+from benchmarks.data import synthetic_archive
+from tests.test_pipelined_generation import ScriptedGhostwriter
+
+ARCHIVE = [
+    "My daughter asked why the sky is blue. I had no good answer, so we looked it up together.",
+    "Our deploy failed on Friday. The rollback script had never been tested. Lesson learned.",
+    "I tried pair programming with a junior engineer and learned more than they did.",
+    "Gravity, hills and bikes: my son wants me to switch off physics.",
+    "A long post about testing. " + "Tests catch bugs before users do. " * 60,
+]
+
+
+@pytest.fixture
+def store():
+    return StyleExampleStore(ARCHIVE)
+
+
+class TestStyleExampleStore:
+
+    def test_ranks_relevant_posts_first(self, store):
+        [(best, _), *_] = store.search("notes about a failed deploy and rollback")
+        assert best == 1
+        assert store.search("quantum chromodynamics") == []
+
+    def test_retrieval_respects_k_and_token_budget(self, store):
+        examples = store.retrieve("testing bugs deploy engineer", k=2, token_budget=60)
+        assert len(examples) == 2
+        assert ARCHIVE[4] not in examples
+        assert sum(estimate_tokens(e) for e in examples) <= 60
+
+    def test_accented_text_is_tokenized_whole(self):
+        assert tokenize("Ação rápida em produção: l'été, naïve café!") == [
+            "ação", "rápida", "em", "produção", "l'été", "naïve", "café",
+        ]
+        store = StyleExampleStore(["Migração do banco em produção.", "Um café com a equipe."])
+        [(best, _)] = store.search("produção")
+        assert best == 0
+
+    def test_index_round_trips_through_disk(self, store, tmp_path):
+        path = str(tmp_path / "style.index.json")
+        store.save(path)
+        loaded = StyleExampleStore.load(path)
+        assert loaded.search("rollback script") == store.search("rollback script")
+
+    def test_open_builds_once_and_reuses_index(self, tmp_path, monkeypatch):
+        archive = tmp_path / "posts.json"
+        archive.write_text(json.dumps([{"post": p} for p in ARCHIVE]), encoding="utf-8")
+        assert len(StyleExampleStore.open(str(archive))) == len(ARCHIVE)
+
+        def no_rebuild(*args):
+            raise AssertionError("index was rebuilt")
+
+        monkeypatch.setattr(StyleExampleStore, "from_archive", classmethod(no_rebuild))
+        assert len(StyleExampleStore.open(str(archive))) == len(ARCHIVE)
+
+    def test_open_rebuilds_an_index_from_an_older_version(self, tmp_path):
+        archive = tmp_path / "posts.json"
+        archive.write_text(json.dumps(ARCHIVE), encoding="utf-8")
+        index = tmp_path / "posts.json.index.json"
+        index.write_text(json.dumps({"version": 1, "posts": [], "doc_lengths": [], "postings": {}}), encoding="utf-8")
+        assert len(StyleExampleStore.open(str(archive))) == len(ARCHIVE)
+
+
+class TestPromptInjection:
+
+    def test_examples_are_escaped_for_the_template(self):
+        prompt = get_generation_prompt(get_system_prompt(['A {"static"} post.']), ['I wrote {"json"} by hand.'])
+        system, notes = prompt.format_messages(raw_notes="my notes")
+        assert 'A {"static"} post.' in system.content
+        assert 'I wrote {"json"} by hand.' in notes.content and notes.content.endswith("my notes")
+
+    def test_ghostwriter_uses_retrieved_examples(self, offline_config, store):
+        ghostwriter = ScriptedGhostwriter([], ["post"])
+        assert ghostwriter.prompt_for("anything") is ghostwriter.base_prompt
+
+        ghostwriter.style_examples = store
+        prompt = ghostwriter.prompt_for("my son and his bike on a hill")
+        system, notes = prompt.format_messages(raw_notes="notes")
+        assert system.content == ghostwriter.system_prompt and ARCHIVE[3] in notes.content
+        assert ghostwriter.prompt_for("my son and his bike on a hill") is prompt
+
+
+def test_saved_index_finds_each_post_from_its_opening(tmp_path):
+    # Timings at 10k posts: python -m benchmarks.run --filter StyleExamples
+    posts = synthetic_archive(500)
+    path = str(tmp_path / "archive.index.json")
+    StyleExampleStore(posts).save(path)
+    store = StyleExampleStore.load(path)
+
+    queries = [" ".join(post.split()[:40]) for post in posts[:50]]
+    results = [store.retrieve(query, k=3, token_budget=10_000) for query in queries]
+    assert all(found[0] == post for found, post in zip(results, posts))
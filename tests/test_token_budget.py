@@ -0,0 +1,124 @@
+"""Tests for offline token estimation and token budgets (offline)."""
+
+import json
+
+import pytest
+from linkedin_ghostwriter import LinkedInGhostwriter, LLMJudgeEvaluator
+from linkedin_ghostwriter.backends import StubBackend
+from linkedin_ghostwriter.core.config import Config
+from linkedin_ghostwriter.utils.tokens import (
+    TokenBudgetExceeded,
+    TokenEstimator,
+    check_call,
+    count_tokens,
+    fit_scale,
+    token_budget_scope,
+)
+
+from tests.test_pipelined_generation import StubEvaluator
+
+
+class TestTokenEstimator:
+
+    @pytest.mark.parametrize("text, tokens", [
+        ("Hello, world!", 4),
+        ("The quick brown fox jumps over the lazy dog.", 10),
+        ("", 0),
+    ])
+    def test_matches_known_bpe_counts(self, text, tokens):
+        assert count_tokens(text) == tokens
+
+    def test_long_words_digits_and_unicode_cost_more(self):
+        assert count_tokens("internationalization") > count_tokens("nation")
+        assert count_tokens("1234567") == 3
+        assert count_tokens("こんにちは世界") > count_tokens("hello world")
+
+    def test_observed_usage_moves_the_scale(self):
+        estimator = TokenEstimator()
+        for _ in range(50):
+            estimator.observe(100, 130)
+        assert estimator.scale == pytest.approx(1.3, abs=0.01)
+        assert estimator.estimate("The quick brown fox jumps over the lazy dog.") == 13
+
+    def test_fit_scale_reduces_error(self):
+        samples = [("word " * n, int(n * 1.2)) for n in (50, 120, 300)]
+        scale, before, after = fit_scale(samples)
+        assert scale == pytest.approx(1.2, abs=0.01)
+        assert after < before
+
+    def test_trim_fits_the_budget_at_a_word_boundary(self):
+        estimator = TokenEstimator()
+        text = "story " * 500
+        trimmed = estimator.trim(text, 50)
+        assert estimator.estimate(trimmed) <= 50
+        assert trimmed.endswith("story [...]")
+        assert estimator.trim("short", 50) == "short"
+
+
+class TestBudgets:
+
+    def test_per_call_limit(self, monkeypatch):
+        monkeypatch.setattr(Config, "MAX_PROMPT_TOKENS", 100)
+        check_call(100)
+        with pytest.raises(TokenBudgetExceeded):
+            check_call(101)
+
+    def test_per_post_budget_is_shared(self):
+        with token_budget_scope(100) as budget:
+            budget.charge(80)
+            check_call(20, limit=0)
+            with pytest.raises(TokenBudgetExceeded):
+                check_call(21, limit=0)
+
+    def test_prompt_is_trimmed_feedback_first(self, offline_config, monkeypatch):
+        ghostwriter = LinkedInGhostwriter()
+        monkeypatch.setattr(Config, "MAX_PROMPT_TOKENS", 1000)
+        notes, feedback = "notes " * 300, "fix " * 600
+
+        fitted_notes, fitted_feedback = ghostwriter.fit_prompt(ghostwriter.base_prompt, notes, feedback)
+        assert fitted_notes == notes
+        assert fitted_feedback.endswith("[...]") and len(fitted_feedback) < len(feedback)
+
+        fitted_notes, fitted_feedback = ghostwriter.fit_prompt(ghostwriter.base_prompt, notes * 4, feedback)
+        assert fitted_feedback == "" and fitted_notes.endswith("[...]")
+
+    def test_post_budget_returns_best_draft(self, offline_config, monkeypatch, capsys, caplog):
+        monkeypatch.setattr(Config, "POST_TOKEN_BUDGET", 1000)
+        ghostwriter = LinkedInGhostwriter([StubEvaluator("Stub")])
+        ghostwriter.llm = StubBackend()
+
+        with caplog.at_level("DEBUG", logger="linkedin_ghostwriter.core.ghostwriter"):
+            post, iterations, passed = ghostwriter.generate_with_evaluation("notes", max_iterations=10)
+        assert post.startswith("Stub response") and not passed
+        assert 1 <= iterations < 10
+        assert "Draft prompt: ~" in caplog.text
+        output = capsys.readouterr().out
+        assert "📏" not in output and "Token budget reached" in output
+
+    def test_oversized_post_fails_without_a_judge_call(self, offline_config, monkeypatch):
+        monkeypatch.setattr(Config, "MAX_PROMPT_TOKENS", 500)
+        judge = LLMJudgeEvaluator()
+        judge.llm = StubBackend(responses=[json.dumps({"passed": True})])
+
+        result = judge.evaluate("word " * 1000)
+        assert result["passed"] is False and result["over_budget"] is True
+        assert judge.llm.calls == 0
+        assert judge.last_usage["estimated_input_tokens"] > 500
+
+        judge.evaluate("a short post")
+        assert judge.llm.calls == 1 and judge.last_usage["input_tokens"] > 0
+
+
+def test_history_supplies_calibration_samples(tmp_path):
+    from linkedin_ghostwriter import RunHistoryStore
+
+    with RunHistoryStore(str(tmp_path / "history.db"), flush_interval=0.01) as store:
+        run_id = store.start_run("notes", model="gpt-4o")
+        store.record_draft(run_id, 0, "word " * 100, "", usage={"input_tokens": 500, "output_tokens": 110})
+        store.record_draft(run_id, 1, "no usage recorded", "")
+        store.flush()
+        samples = store.token_samples()
+
+    assert samples == [("word " * 100, 110)]
+    scale, _, after = fit_scale(samples)
+    assert scale == pytest.approx(1.1) and after == pytest.approx(0.0)